@@ -0,0 +1,270 @@
+"""
+AI Batch Queue - Background worker pool for batch AI quotations
+
+POST /ai/batch stores every raw input (tbl_raw_input) plus one
+tbl_ai_batch_item row per input in a single transaction, then puts the
+item IDs on an in-process asyncio.Queue. AI_BATCH_WORKERS workers (default 4)
+take items off the queue and run them through
+ClsAIQuotationService.fnProcessQuotation, so Groq sees at most that many
+concurrent batch calls no matter how many inputs were submitted.
+Outbound calls also share ClsHttpClient's concurrency limit with
+interactive /ai requests.
+
+Each item is claimed with UPDATE ... WHERE vchr_status = 'queued', so an item
+is processed once even if several app workers recover the same backlog.
+Every item that is claimed ends in one of three ways:
+- finished: 'done' / 'failed', and the job's counters are updated (an
+  exception inside the AI call counts as 'failed')
+- cancelled (shutdown): put back to 'queued' for the next run
+- worker died (crash / killed process): left 'processing'. A sweep runs at
+  startup and then every AI_BATCH_SWEEP_SECONDS. It puts items that have
+  been 'processing' for more than INT_STALE_PROCESSING_MINUTES back to
+  'queued' and enqueues every queued item.
+The outcome is written only while the item still holds the same claim
+(status 'processing' + claim timestamp), so an item that was swept and
+re-run is never counted twice in the job.
+
+Usage:
+    from app.api.ai.batchQueue import ClsAIBatchQueue
+
+    await ClsAIBatchQueue().fnStart()                # main.lifespan
+    ClsAIBatchQueue().fnEnqueue(lstBatchItemIds)     # after the insert commits
+    await ClsAIBatchQueue().fnStop()                 # main.lifespan shutdown
+"""
+
+import os
+import asyncio
+from typing import List, Optional, Set
+
+from app.core.database import ClsDatabasepool
+from app.core.baseSchema import ResponseStatus
+from app.core.logger import getLogger, getUserLogger
+
+logger = getLogger()
+
+BATCH_STATUS_QUEUED = "queued"
+BATCH_STATUS_RUNNING = "running"
+BATCH_STATUS_COMPLETED = "completed"
+ITEM_STATUS_QUEUED = "queued"
+ITEM_STATUS_PROCESSING = "processing"
+ITEM_STATUS_DONE = "done"
+ITEM_STATUS_FAILED = "failed"
+
+INT_STALE_PROCESSING_MINUTES = 10
+FLT_RECOVER_POLL_SECONDS = 2.0
+FLT_SWEEP_SECONDS = float(os.getenv("AI_BATCH_SWEEP_SECONDS", "60"))
+
+
+class ClsAIBatchQueue:
+    """Singleton batch queue - Only ONE worker pool per process"""
+
+    _instance: Optional['ClsAIBatchQueue'] = None
+    _queue: Optional[asyncio.Queue] = None
+    _lstWorkers: List[asyncio.Task] = []
+    _intWorkers: int = 0
+    _setPending: Set[int] = set()   # IDs on the local queue - the sweep does not add them twice
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def fnStart(self) -> None:
+        """Start the worker pool and recover unfinished items (called from main.lifespan)"""
+        if ClsAIBatchQueue._queue is not None:
+            return
+
+        ClsAIBatchQueue._intWorkers = int(os.getenv("AI_BATCH_WORKERS", "4"))
+        ClsAIBatchQueue._queue = asyncio.Queue()
+        ClsAIBatchQueue._setPending = set()
+        ClsAIBatchQueue._lstWorkers = [
+            asyncio.create_task(self.fnWorker(intWorker)) for intWorker in range(ClsAIBatchQueue._intWorkers)
+        ]
+        ClsAIBatchQueue._lstWorkers.append(asyncio.create_task(self.fnSweepLoop()))
+        logger.info(f"AI batch queue started with {ClsAIBatchQueue._intWorkers} workers")
+
+    async def fnStop(self) -> None:
+        """Cancel workers. Items being processed are put back to 'queued' and recovered on next start."""
+        for taskWorker in ClsAIBatchQueue._lstWorkers:
+            taskWorker.cancel()
+        await asyncio.gather(*ClsAIBatchQueue._lstWorkers, return_exceptions=True)
+        ClsAIBatchQueue._lstWorkers = []
+        ClsAIBatchQueue._queue = None
+        ClsAIBatchQueue._setPending = set()
+        logger.info("AI batch queue stopped")
+
+    def fnEnqueue(self, lstBatchItemIds: List[int]) -> None:
+        if ClsAIBatchQueue._queue is None:
+            logger.warning("AI batch queue not started - items stay queued until next start")
+            return
+        for intBatchItemId in lstBatchItemIds:
+            if intBatchItemId in ClsAIBatchQueue._setPending:
+                continue
+            ClsAIBatchQueue._setPending.add(intBatchItemId)
+            ClsAIBatchQueue._queue.put_nowait(intBatchItemId)
+
+    def fnGetStats(self) -> dict:
+        return {
+            "workers": ClsAIBatchQueue._intWorkers,
+            "queued": ClsAIBatchQueue._queue.qsize() if ClsAIBatchQueue._queue else 0
+        }
+
+    async def fnSweepLoop(self) -> None:
+        """Recover items at startup, then keep sweeping for stuck ones"""
+        # Wait for main.lifespan's background connect instead of racing it with a second pool
+        insDb = ClsDatabasepool()
+        while (await insDb.fnGetPoolStats()).get("status") == "not_initialized":
+            await asyncio.sleep(FLT_RECOVER_POLL_SECONDS)
+
+        while True:
+            await self.fnRecover()
+            await asyncio.sleep(FLT_SWEEP_SECONDS)
+
+    async def fnRecover(self) -> None:
+        """Requeue stale 'processing' items and enqueue every queued item"""
+        try:
+            pool = await ClsDatabasepool().fnGetPool()
+            async with pool.acquire() as conn:
+                await conn.execute(f"""
+                    UPDATE tbl_ai_batch_item
+                    SET vchr_status = '{ITEM_STATUS_QUEUED}', tim_started_at = NULL
+                    WHERE vchr_status = '{ITEM_STATUS_PROCESSING}'
+                    AND tim_started_at < CURRENT_TIMESTAMP - INTERVAL '{INT_STALE_PROCESSING_MINUTES} minutes'
+                """)
+                lstRows = await conn.fetch(f"""
+                    SELECT pk_bint_batch_item_id
+                    FROM tbl_ai_batch_item
+                    WHERE vchr_status = '{ITEM_STATUS_QUEUED}'
+                    ORDER BY pk_bint_batch_item_id
+                """)
+            lstNew = [row['pk_bint_batch_item_id'] for row in lstRows if row['pk_bint_batch_item_id'] not in ClsAIBatchQueue._setPending]
+            if lstNew:
+                logger.info(f"Recovering {len(lstNew)} queued AI batch items")
+                self.fnEnqueue(lstNew)
+        except Exception as e:
+            logger.error(f"AI batch recovery failed: {str(e)}", exc_info=True)
+
+    async def fnWorker(self, intWorker: int) -> None:
+        while True:
+            intBatchItemId = await ClsAIBatchQueue._queue.get()
+            ClsAIBatchQueue._setPending.discard(intBatchItemId)
+            try:
+                await self.fnProcessItem(intBatchItemId)
+            except Exception as e:
+                logger.error(f"AI batch worker {intWorker} failed on item {intBatchItemId}: {str(e)}", exc_info=True)
+            finally:
+                ClsAIBatchQueue._queue.task_done()
+
+    async def fnProcessItem(self, intBatchItemId: int) -> None:
+        """Claim one item, run it through the AI service, record the outcome"""
+        # Imported here: service.py imports this module
+        from app.api.ai.service import ClsAIQuotationService
+
+        pool = await ClsDatabasepool().fnGetPool()
+        async with pool.acquire() as conn:
+            rowItem = await conn.fetchrow(f"""
+                UPDATE tbl_ai_batch_item i
+                SET vchr_status = '{ITEM_STATUS_PROCESSING}', tim_started_at = CURRENT_TIMESTAMP
+                FROM tbl_raw_input r
+                WHERE i.pk_bint_batch_item_id = $1
+                AND i.vchr_status = '{ITEM_STATUS_QUEUED}'
+                AND r.pk_bint_raw_input_id = i.fk_bint_raw_input_id
+                RETURNING i.fk_bint_batch_job_id, i.fk_bint_user_id, i.fk_bint_raw_input_id,
+                          i.tim_started_at, r.txt_site_notes
+            """, intBatchItemId)
+            if not rowItem:
+                return  # Already claimed / finished elsewhere
+
+            await conn.execute(f"""
+                UPDATE tbl_ai_batch_job SET vchr_status = '{BATCH_STATUS_RUNNING}'
+                WHERE pk_bint_batch_job_id = $1 AND vchr_status = '{BATCH_STATUS_QUEUED}'
+            """, rowItem['fk_bint_batch_job_id'])
+
+        intUserId = rowItem['fk_bint_user_id']
+        try:
+            insService = ClsAIQuotationService(pool, intUserId)
+            mdlResult = await insService.fnProcessQuotation(
+                rowItem['txt_site_notes'],
+                intRawInputId=rowItem['fk_bint_raw_input_id']
+            )
+        except asyncio.CancelledError:
+            await self.fnReleaseItem(pool, intBatchItemId, rowItem)
+            raise
+        except Exception as e:
+            logger.error(f"AI batch item {intBatchItemId} raised: {str(e)}", exc_info=True)
+            await self.fnFinishItem(pool, intBatchItemId, rowItem, False, None, f"Processing error: {str(e)}")
+            return
+
+        blnSuccess = mdlResult.intStatus == ResponseStatus.SUCCESS
+        await self.fnFinishItem(
+            pool,
+            intBatchItemId,
+            rowItem,
+            blnSuccess,
+            mdlResult.intAiResponseId if blnSuccess else None,
+            None if blnSuccess else mdlResult.strMessage
+        )
+        if not blnSuccess:
+            getUserLogger(intUserId).warning(f"AI batch item {intBatchItemId} failed: {mdlResult.strMessage}")
+
+    async def fnReleaseItem(self, pool, intBatchItemId: int, rowItem) -> None:
+        """Give a claimed item back (worker cancelled) so the next start / sweep re-runs it"""
+        try:
+            async with pool.acquire() as conn:
+                await conn.execute(f"""
+                    UPDATE tbl_ai_batch_item
+                    SET vchr_status = '{ITEM_STATUS_QUEUED}', tim_started_at = NULL
+                    WHERE pk_bint_batch_item_id = $1
+                    AND vchr_status = '{ITEM_STATUS_PROCESSING}'
+                    AND tim_started_at = $2
+                """, intBatchItemId, rowItem['tim_started_at'])
+        except Exception as e:
+            logger.error(f"AI batch item {intBatchItemId} could not be released: {str(e)}")
+
+    async def fnFinishItem(
+        self,
+        pool,
+        intBatchItemId: int,
+        rowItem,
+        blnSuccess: bool,
+        intAiResponseId: Optional[int],
+        strError: Optional[str]
+    ) -> None:
+        """Record the outcome and count it in the job - only if this run still holds the claim"""
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                strResult = await conn.execute(f"""
+                    UPDATE tbl_ai_batch_item
+                    SET vchr_status = $2,
+                        fk_bint_ai_response_id = $3,
+                        txt_error = $4,
+                        tim_finished_at = CURRENT_TIMESTAMP
+                    WHERE pk_bint_batch_item_id = $1
+                    AND vchr_status = '{ITEM_STATUS_PROCESSING}'
+                    AND tim_started_at = $5
+                """,
+                    intBatchItemId,
+                    ITEM_STATUS_DONE if blnSuccess else ITEM_STATUS_FAILED,
+                    intAiResponseId,
+                    strError,
+                    rowItem['tim_started_at']
+                )
+                if strResult != "UPDATE 1":
+                    logger.warning(f"AI batch item {intBatchItemId} was re-claimed while running - outcome not counted")
+                    return
+
+                await conn.execute(f"""
+                    UPDATE tbl_ai_batch_job
+                    SET int_completed = int_completed + $2,
+                        int_failed = int_failed + $3,
+                        vchr_status = CASE
+                            WHEN int_completed + int_failed + 1 >= int_total THEN '{BATCH_STATUS_COMPLETED}'
+                            ELSE vchr_status
+                        END,
+                        tim_finished_at = CASE
+                            WHEN int_completed + int_failed + 1 >= int_total THEN CURRENT_TIMESTAMP
+                            ELSE tim_finished_at
+                        END
+                    WHERE pk_bint_batch_job_id = $1
+                """, rowItem['fk_bint_batch_job_id'], int(blnSuccess), int(not blnSuccess))
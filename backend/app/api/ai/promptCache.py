@@ -0,0 +1,107 @@
+"""
+AI Prompt Cache - Precomputed prompt parts reused across /ai requests
+
+System prompt:
+    Read once (at startup via fnLoadSystemPrompt) and kept in memory.
+    Each request does a cheap os.stat; if system_prompt.txt's mtime changed
+    the file is re-read, so prompt edits apply without a restart.
+
+Inventory block ("AVAILABLE INVENTORY" text):
+    Rendered once per tenant catalog version with a single join and reused
+    until the catalog changes. Every write or reload in
+    app/api/inventory/cache.py produces a new catalog tuple, so the tuple
+    itself serves as the version.
+
+Usage:
+    from app.api.ai.promptCache import fnGetSystemPrompt, fnGetInventoryPromptBlock
+
+    strSystemPrompt = fnGetSystemPrompt()
+    strInventoryList = await fnGetInventoryPromptBlock(pool, intUserId)
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from app.api.inventory.cache import fnGetInventoryCatalog
+from app.core.cache import ClsTTLCache
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+PATH_SYSTEM_PROMPT = Path(__file__).parent / "system_prompt.txt"
+STR_FALLBACK_SYSTEM_PROMPT = "You are a helpful assistant for creating CCTV quotations."
+STR_NO_INVENTORY = "No inventory items available."
+STR_INVENTORY_HEADER = "AVAILABLE INVENTORY:\n"
+
+# key user -> (catalog tuple it was rendered from, text)
+insInventoryBlockCache = ClsTTLCache(intMaxSize=1024)
+
+_lockSystemPrompt = threading.Lock()
+_dctSystemPrompt: Dict[str, Any] = {"mtime": None, "text": None}
+
+
+# =============================================================================
+# System prompt
+# =============================================================================
+
+def fnLoadSystemPrompt() -> str:
+    """(Re)read system_prompt.txt into memory. Called at startup."""
+    with _lockSystemPrompt:
+        try:
+            fltMtime = os.stat(PATH_SYSTEM_PROMPT).st_mtime
+            with open(PATH_SYSTEM_PROMPT, "r", encoding="utf-8") as f:
+                strText = f.read()
+            _dctSystemPrompt["mtime"] = fltMtime
+            _dctSystemPrompt["text"] = strText
+            logger.info(f"System prompt loaded ({len(strText)} chars)")
+        except Exception as e:
+            logger.error(f"Error loading system prompt: {e}")
+            if _dctSystemPrompt["text"] is None:
+                _dctSystemPrompt["text"] = STR_FALLBACK_SYSTEM_PROMPT
+        return _dctSystemPrompt["text"]
+
+
+def fnGetSystemPrompt() -> str:
+    """In-memory system prompt, reloaded only when the file's mtime changes"""
+    try:
+        fltMtime: Optional[float] = os.stat(PATH_SYSTEM_PROMPT).st_mtime
+    except OSError:
+        fltMtime = None
+
+    if _dctSystemPrompt["text"] is None or (fltMtime is not None and fltMtime != _dctSystemPrompt["mtime"]):
+        return fnLoadSystemPrompt()
+    return _dctSystemPrompt["text"]
+
+
+# =============================================================================
+# Inventory block
+# =============================================================================
+
+def fnRenderInventoryLine(dctRow: Dict[str, Any]) -> str:
+    return (
+        f"- ID:{dctRow['pk_bint_inventory_id']} | Code:{dctRow['vchr_item_code'] or 'N/A'} | "
+        f"{dctRow['vchr_item_name']} | Unit:{dctRow['vchr_unit']} | Price:{dctRow['dbl_unit_price']}\n"
+    )
+
+
+def fnRenderInventoryBlock(lstRows: Iterable[Dict[str, Any]]) -> str:
+    """Rows -> "AVAILABLE INVENTORY" text (single join, no repeated +=)"""
+    strLines = "".join(fnRenderInventoryLine(dctRow) for dctRow in lstRows)
+    if not strLines:
+        return STR_NO_INVENTORY
+    return STR_INVENTORY_HEADER + strLines
+
+
+async def fnGetInventoryPromptBlock(pool, intUserId: int) -> str:
+    """Tenant's rendered inventory block, re-rendered only when the catalog changes"""
+    tupCatalog = await fnGetInventoryCatalog(pool, intUserId)
+
+    tupEntry = insInventoryBlockCache.fnGet(intUserId)
+    if tupEntry is not None and tupEntry[0] is tupCatalog:
+        return tupEntry[1]
+
+    strBlock = fnRenderInventoryBlock(tupCatalog)
+    insInventoryBlockCache.fnSet(intUserId, (tupCatalog, strBlock))
+    return strBlock
@@ -0,0 +1,283 @@
+"""
+Groq Provider Guard - Rate limiting, retries and circuit breaker for LLM calls
+
+Every Groq call (interactive, streamed and batch) goes through ClsGroqProvider:
+1. Circuit breaker  - fail fast (ClsCircuitOpenError) while Groq is down
+2. Token buckets    - requests/min and tokens/min sized to the provider quota;
+                      callers queue here instead of tripping 429s for everyone
+3. Retry            - 429 / 5xx / network errors retried with jittered backoff;
+                      Retry-After is honored and pauses the request bucket.
+                      Attempts that return no completion get their TPM
+                      estimate refunded, so retries do not drain the budget
+4. Metrics          - queueing delay vs provider latency, retries, 429s, breaker
+
+Config (.env, all optional):
+    GROQ_RPM                 (default 30 requests / minute)
+    GROQ_TPM                 (default 12000 tokens / minute)
+    GROQ_MAX_RETRIES         (default 3)
+    GROQ_BREAKER_THRESHOLD   (default 5 consecutive failures)
+    GROQ_BREAKER_COOLDOWN    (default 30 seconds)
+
+Usage:
+    from app.api.ai.provider import ClsGroqProvider
+
+    insResponse = await ClsGroqProvider().fnPostChat(strUrl, dctHeaders, dctPayload)
+
+    async with ClsGroqProvider().fnStreamChat(strUrl, dctHeaders, dctPayload) as insResponse:
+        ...
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import httpx
+
+from app.api.ai.retrieval import fnEstimateTokens
+from app.core.httpClient import ClsHttpClient
+from app.core.logger import getLogger
+from app.core.resilience import ClsTokenBucket, ClsCircuitBreaker, fnRetryDelay, fnParseRetryAfter
+
+logger = getLogger()
+
+SET_RETRY_STATUS = {429, 500, 502, 503, 504}
+INT_METRIC_SAMPLES = 500
+
+
+def fnPercentile(lstValues, fltPct: float) -> float:
+    if not lstValues:
+        return 0.0
+    lstSorted = sorted(lstValues)
+    return round(lstSorted[min(len(lstSorted) - 1, int(fltPct / 100 * len(lstSorted)))], 2)
+
+
+class ClsGroqProvider:
+    """Singleton guard around the Groq chat completions endpoint"""
+
+    _instance: Optional['ClsGroqProvider'] = None
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.fnInit()
+        return cls._instance
+
+    def fnInit(self) -> None:
+        self.insRequestBucket = ClsTokenBucket(int(os.getenv("GROQ_RPM", "30")))
+        self.insTokenBucket = ClsTokenBucket(int(os.getenv("GROQ_TPM", "12000")))
+        self.insBreaker = ClsCircuitBreaker(
+            intFailureThreshold=int(os.getenv("GROQ_BREAKER_THRESHOLD", "5")),
+            fltCooldownSeconds=float(os.getenv("GROQ_BREAKER_COOLDOWN", "30"))
+        )
+        self.intMaxRetries = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+
+        self.dqQueueMs: Deque[float] = deque(maxlen=INT_METRIC_SAMPLES)
+        self.dqProviderMs: Deque[float] = deque(maxlen=INT_METRIC_SAMPLES)
+        self.dctCounters: Dict[str, int] = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "status_429": 0,
+            "status_5xx": 0,
+            "network_errors": 0,
+            "failed": 0
+        }
+
+    # =========================================================================
+    # Accounting helpers
+    # =========================================================================
+
+    def fnEstimateRequestTokens(self, dctPayload: Dict[str, Any]) -> int:
+        """Prompt estimate + max completion, charged to the TPM bucket up front"""
+        intPrompt = sum(fnEstimateTokens(dctMessage.get("content") or "") for dctMessage in dctPayload.get("messages", []))
+        return intPrompt + int(dctPayload.get("max_tokens") or 0)
+
+    def fnSettleTokens(self, intEstimated: int, dctUsage: Optional[Dict[str, Any]]) -> None:
+        """Refund / charge the difference once the real usage is known"""
+        if dctUsage and dctUsage.get("total_tokens"):
+            self.insTokenBucket.fnAdjust(intEstimated - int(dctUsage["total_tokens"]))
+
+    async def fnWaitForCapacity(self, intEstimatedTokens: int) -> bool:
+        """Breaker check + both buckets; records queueing delay. Returns True for the breaker's trial call."""
+        blnTrial = self.insBreaker.fnCheck()
+        fltStart = time.monotonic()
+        try:
+            await self.insRequestBucket.fnAcquire(1)
+            await self.insTokenBucket.fnAcquire(intEstimatedTokens)
+        except BaseException:
+            if blnTrial:
+                self.insBreaker.fnReleaseTrial()   # cancelled while queued
+            raise
+        self.dqQueueMs.append((time.monotonic() - fltStart) * 1000)
+        return blnTrial
+
+    def fnRefundTokens(self, intEstimated: int) -> None:
+        """Attempt returned no completion (429 / 5xx / 4xx / network error) - give the TPM estimate back"""
+        self.insTokenBucket.fnAdjust(intEstimated)
+
+    def fnAbandonAttempt(self, intEstimated: int, blnTrial: bool) -> None:
+        """Attempt ended without an outcome (cancelled, unexpected error)"""
+        self.fnRefundTokens(intEstimated)
+        if blnTrial:
+            self.insBreaker.fnReleaseTrial()
+
+    def fnIsRetryable(self, intStatusCode: int) -> bool:
+        if intStatusCode == 429:
+            self.dctCounters["status_429"] += 1
+        elif intStatusCode >= 500:
+            self.dctCounters["status_5xx"] += 1
+        return intStatusCode in SET_RETRY_STATUS
+
+    async def fnBackoff(self, intAttempt: int, strRetryAfter: Optional[str], intStatusCode: Optional[int]) -> None:
+        fltDelay = fnRetryDelay(intAttempt, strRetryAfter)
+        if intStatusCode == 429:
+            # Provider says we are over quota - hold every caller, not just this one
+            self.insRequestBucket.fnPause(fnParseRetryAfter(strRetryAfter) or fltDelay)
+        self.dctCounters["retries"] += 1
+        logger.warning(f"Groq retry {intAttempt}/{self.intMaxRetries} in {fltDelay:.2f}s (status={intStatusCode})")
+        await asyncio.sleep(fltDelay)
+
+    def fnRecordOutcome(self, intStatusCode: Optional[int]) -> None:
+        """5xx / network errors count against the breaker; 429 and 4xx do not (provider is up)"""
+        if intStatusCode is None or intStatusCode >= 500:
+            self.insBreaker.fnRecordFailure()
+        else:
+            self.insBreaker.fnRecordSuccess()
+
+    # =========================================================================
+    # Calls
+    # =========================================================================
+
+    async def fnPostChat(self, strUrl: str, dctHeaders: Dict[str, str], dctPayload: Dict[str, Any]) -> httpx.Response:
+        """Non-streamed chat completion with rate limiting, retries and breaker"""
+        self.dctCounters["calls"] += 1
+        intEstimated = self.fnEstimateRequestTokens(dctPayload)
+
+        for intAttempt in range(self.intMaxRetries + 1):
+            blnTrial = await self.fnWaitForCapacity(intEstimated)
+            self.dctCounters["attempts"] += 1
+
+            fltStart = time.monotonic()
+            try:
+                insResponse = await ClsHttpClient().fnPost(strUrl, headers=dctHeaders, json=dctPayload)
+            except httpx.TransportError:
+                self.dqProviderMs.append((time.monotonic() - fltStart) * 1000)
+                self.dctCounters["network_errors"] += 1
+                self.fnRecordOutcome(None)
+                self.fnRefundTokens(intEstimated)
+                if intAttempt >= self.intMaxRetries:
+                    self.dctCounters["failed"] += 1
+                    raise
+                await self.fnBackoff(intAttempt + 1, None, None)
+                continue
+            except BaseException:
+                self.fnAbandonAttempt(intEstimated, blnTrial)   # e.g. client disconnected mid-call
+                raise
+
+            self.dqProviderMs.append((time.monotonic() - fltStart) * 1000)
+            self.fnRecordOutcome(insResponse.status_code)
+
+            if insResponse.status_code == 200:
+                try:
+                    self.fnSettleTokens(intEstimated, insResponse.json().get("usage"))
+                except ValueError:
+                    pass
+                return insResponse
+
+            self.fnRefundTokens(intEstimated)
+            if not self.fnIsRetryable(insResponse.status_code) or intAttempt >= self.intMaxRetries:
+                self.dctCounters["failed"] += 1
+                return insResponse
+
+            await self.fnBackoff(intAttempt + 1, insResponse.headers.get("retry-after"), insResponse.status_code)
+
+        return insResponse
+
+    @asynccontextmanager
+    async def fnStreamChat(
+        self,
+        strUrl: str,
+        dctHeaders: Dict[str, str],
+        dctPayload: Dict[str, Any]
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Streamed chat completion. Retries only happen before the body starts
+        (on the initial status); once chunks flow the response is yielded as-is.
+        """
+        self.dctCounters["calls"] += 1
+        intEstimated = self.fnEstimateRequestTokens(dctPayload)
+
+        intAttempt = 0
+        blnYielded = False
+        while True:
+            blnTrial = await self.fnWaitForCapacity(intEstimated)
+            self.dctCounters["attempts"] += 1
+            blnRecorded = False
+
+            fltStart = time.monotonic()
+            try:
+                async with ClsHttpClient().fnStream("POST", strUrl, headers=dctHeaders, json=dctPayload) as insResponse:
+                    self.dqProviderMs.append((time.monotonic() - fltStart) * 1000)   # time to first byte
+                    self.fnRecordOutcome(insResponse.status_code)
+                    blnRecorded = True
+                    if insResponse.status_code != 200:
+                        self.fnRefundTokens(intEstimated)
+
+                    blnRetry = (
+                        insResponse.status_code != 200
+                        and self.fnIsRetryable(insResponse.status_code)
+                        and intAttempt < self.intMaxRetries
+                    )
+                    if not blnRetry:
+                        if insResponse.status_code != 200:
+                            self.dctCounters["failed"] += 1
+                        blnYielded = True
+                        yield insResponse
+                        return
+
+                    strRetryAfter = insResponse.headers.get("retry-after")
+                    intStatusCode = insResponse.status_code
+            except httpx.TransportError:
+                if blnYielded:
+                    raise  # failed mid-body - the caller already consumed part of it
+                self.dqProviderMs.append((time.monotonic() - fltStart) * 1000)
+                self.dctCounters["network_errors"] += 1
+                if not blnRecorded:
+                    self.fnRecordOutcome(None)
+                    self.fnRefundTokens(intEstimated)
+                if intAttempt >= self.intMaxRetries:
+                    self.dctCounters["failed"] += 1
+                    raise
+                strRetryAfter = None
+                intStatusCode = None
+            except BaseException:
+                if not blnRecorded:
+                    self.fnAbandonAttempt(intEstimated, blnTrial)   # e.g. client disconnected before headers
+                raise
+
+            intAttempt += 1
+            await self.fnBackoff(intAttempt, strRetryAfter, intStatusCode)
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        """Metrics: queueing delay vs provider latency, counters, buckets, breaker"""
+        return {
+            "queue_delay_ms": {
+                "p50": fnPercentile(self.dqQueueMs, 50),
+                "p95": fnPercentile(self.dqQueueMs, 95),
+                "max": round(max(self.dqQueueMs), 2) if self.dqQueueMs else 0.0
+            },
+            "provider_latency_ms": {
+                "p50": fnPercentile(self.dqProviderMs, 50),
+                "p95": fnPercentile(self.dqProviderMs, 95),
+                "max": round(max(self.dqProviderMs), 2) if self.dqProviderMs else 0.0
+            },
+            "counters": dict(self.dctCounters),
+            "request_bucket": self.insRequestBucket.fnGetStats(),
+            "token_bucket": self.insTokenBucket.fnGetStats(),
+            "circuit_breaker": self.insBreaker.fnGetStats(),
+            "http_client": ClsHttpClient().fnGetStats()
+        }
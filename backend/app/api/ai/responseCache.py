@@ -0,0 +1,252 @@
+"""
+AI Response Cache - Reuse earlier Groq answers for repeated requests
+
+Key: tenant + request fingerprint + context version + model
+    fingerprint      sha1 of the normalized tokens of the raw text in their
+                     original order, repeats kept, so case, punctuation,
+                     filler words and simple plurals do not matter:
+                     "4 cameras with DVR for a shop" == "4 camera, DVR - shop"
+                     Order is kept because a quantity belongs to the word
+                     after it: "4 cameras with 8 channel NVR" !=
+                     "8 cameras with 4 channel NVR". Prefixed with the key
+                     scheme version, so rows written under an older scheme
+                     are never matched (they age out after INT_MAX_AGE_DAYS).
+    context version  sha1 of the full inventory block + system prompt, so
+                     any price / item / prompt change misses the cache.
+
+Lookups go to an in-process LRU first, then tbl_ai_response_cache (shared
+by all workers), so an LRU hit needs no database connection at all.
+Hits are counted in memory by ClsCacheHitRecorder. Every
+AI_CACHE_HIT_FLUSH_SECONDS, and at shutdown, the counts are added to
+int_hit_count / int_tokens_saved on the cache rows in a single UPDATE, so
+savings stay measurable. tim_last_hit_at is the time of the flush.
+
+Usage:
+    from app.api.ai.responseCache import fnFingerprint, fnContextVersion, fnLookupResponse, fnStoreResponse
+
+    dctCached = await fnLookupResponse(pool, intUserId, strFingerprint, strContextVersion, strModel)
+
+    await ClsCacheHitRecorder().fnStart()   # main.lifespan
+    await ClsCacheHitRecorder().fnStop()    # main.lifespan shutdown (final flush)
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache import ClsTTLCache
+from app.core.database import ClsDatabasepool
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+
+INT_MAX_AGE_DAYS = 30
+STR_FINGERPRINT_VERSION = "v2"   # bump whenever fnFingerprint changes
+
+SET_STOPWORDS = {
+    "a", "an", "and", "the", "for", "with", "of", "to", "in", "on", "at", "by",
+    "is", "are", "be", "need", "needs", "needed", "want", "wants", "please",
+    "pls", "plz", "required", "require", "quote", "quotation", "me", "i", "we", "our", "my"
+}
+
+RE_TOKEN = re.compile(r"[a-z0-9]+")
+
+# key (user, fingerprint, context version, model) -> cached response dict
+insResponseCache = ClsTTLCache(intMaxSize=2048, fltTtlSeconds=3600)
+
+FLT_HIT_FLUSH_SECONDS = float(os.getenv("AI_CACHE_HIT_FLUSH_SECONDS", "30"))
+
+
+def fnNormalizeToken(strToken: str) -> str:
+    """Fold simple plurals ("cameras" -> "camera", "boxes" -> "box")"""
+    if len(strToken) > 4 and strToken.endswith("es") and strToken[-3] in "sxz":
+        return strToken[:-2]
+    if len(strToken) > 3 and strToken.endswith("s") and not strToken.endswith("ss"):
+        return strToken[:-1]
+    return strToken
+
+
+def fnFingerprint(strRawText: str) -> str:
+    """Versioned fingerprint of the normalized request tokens (order and repeats kept)"""
+    lstTokens = [
+        fnNormalizeToken(strToken)
+        for strToken in RE_TOKEN.findall((strRawText or "").lower())
+        if strToken not in SET_STOPWORDS
+    ]
+    return f"{STR_FINGERPRINT_VERSION}:" + hashlib.sha1(" ".join(lstTokens).encode("utf-8")).hexdigest()
+
+
+def fnContextVersion(strInventoryBlock: str, strSystemPrompt: str) -> str:
+    """Hash of everything besides the request that shapes the model's answer"""
+    insHash = hashlib.sha1(strSystemPrompt.encode("utf-8"))
+    insHash.update(b"\x00")
+    insHash.update(strInventoryBlock.encode("utf-8"))
+    return insHash.hexdigest()
+
+
+async def fnLookupResponse(
+    pool,
+    intUserId: int,
+    strFingerprint: str,
+    strContextVersion: str,
+    strModelName: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Cached response for this key, or None.
+
+    Returns {"intAiResponseId", "dctJsonResponse", "intTokensInput", "intTokensOutput"}
+    and records the hit (in memory - see ClsCacheHitRecorder).
+    """
+    tupKey = (intUserId, strFingerprint, strContextVersion, strModelName)
+    dctCached = insResponseCache.fnGet(tupKey)
+
+    if dctCached is None:
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(f"""
+                SELECT
+                    c.fk_bint_ai_response_id,
+                    r.json_ai_response,
+                    r.int_tokens_input,
+                    r.int_tokens_output
+                FROM tbl_ai_response_cache c
+                JOIN tbl_ai_response r ON r.pk_bint_ai_response_id = c.fk_bint_ai_response_id
+                WHERE c.fk_bint_user_id = $1
+                AND c.vchr_fingerprint = $2
+                AND c.vchr_context_version = $3
+                AND c.vchr_model_used = $4
+                AND c.tim_created_at > CURRENT_TIMESTAMP - INTERVAL '{INT_MAX_AGE_DAYS} days'
+            """, intUserId, strFingerprint, strContextVersion, strModelName)
+
+        if not row:
+            return None
+
+        dctCached = {
+            "intAiResponseId": row['fk_bint_ai_response_id'],
+            "dctJsonResponse": json.loads(row['json_ai_response']),
+            "intTokensInput": row['int_tokens_input'] or 0,
+            "intTokensOutput": row['int_tokens_output'] or 0
+        }
+        insResponseCache.fnSet(tupKey, dctCached)
+
+    ClsCacheHitRecorder().fnRecord(tupKey, dctCached["intTokensInput"] + dctCached["intTokensOutput"])
+    return dctCached
+
+
+async def fnStoreResponse(
+    pool,
+    intUserId: int,
+    strFingerprint: str,
+    strContextVersion: str,
+    strModelName: str,
+    intAiResponseId: int,
+    dctJsonResponse: Dict[str, Any],
+    intTokensInput: int,
+    intTokensOutput: int
+) -> None:
+    """Remember a fresh Groq answer (newest answer wins for the same key)"""
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO tbl_ai_response_cache (
+                fk_bint_user_id,
+                vchr_fingerprint,
+                vchr_context_version,
+                vchr_model_used,
+                fk_bint_ai_response_id
+            ) VALUES ($1, $2, $3, $4, $5)
+            ON CONFLICT (fk_bint_user_id, vchr_fingerprint, vchr_context_version, vchr_model_used)
+            DO UPDATE SET
+                fk_bint_ai_response_id = EXCLUDED.fk_bint_ai_response_id,
+                tim_created_at = CURRENT_TIMESTAMP
+        """, intUserId, strFingerprint, strContextVersion, strModelName, intAiResponseId)
+
+    insResponseCache.fnSet(
+        (intUserId, strFingerprint, strContextVersion, strModelName),
+        {
+            "intAiResponseId": intAiResponseId,
+            "dctJsonResponse": dctJsonResponse,
+            "intTokensInput": intTokensInput,
+            "intTokensOutput": intTokensOutput
+        }
+    )
+
+
+class ClsCacheHitRecorder:
+    """Singleton in-memory hit counters, flushed to tbl_ai_response_cache in batches"""
+
+    _instance: Optional['ClsCacheHitRecorder'] = None
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.fnInit()
+        return cls._instance
+
+    def fnInit(self) -> None:
+        # cache key -> [hits, tokens saved] not yet written to the database
+        self.dctPending: Dict[Tuple[int, str, str, str], List[int]] = {}
+        self.taskFlush: Optional[asyncio.Task] = None
+
+    def fnRecord(self, tupKey: Tuple[int, str, str, str], intTokensSaved: int) -> None:
+        lstCounts = self.dctPending.setdefault(tupKey, [0, 0])
+        lstCounts[0] += 1
+        lstCounts[1] += intTokensSaved
+
+    async def fnStart(self) -> None:
+        """Start the periodic flush (called from main.lifespan)"""
+        if self.taskFlush is None:
+            self.taskFlush = asyncio.create_task(self.fnFlushLoop())
+
+    async def fnStop(self) -> None:
+        """Stop the periodic flush and write out what is left (before the DB pool closes)"""
+        if self.taskFlush is not None:
+            self.taskFlush.cancel()
+            await asyncio.gather(self.taskFlush, return_exceptions=True)
+            self.taskFlush = None
+        await self.fnFlush()
+
+    async def fnFlushLoop(self) -> None:
+        while True:
+            await asyncio.sleep(FLT_HIT_FLUSH_SECONDS)
+            await self.fnFlush()
+
+    async def fnFlush(self) -> None:
+        """Add the pending counts to their cache rows in one UPDATE; kept for the next flush on failure"""
+        if not self.dctPending:
+            return
+        dctFlush, self.dctPending = self.dctPending, {}
+
+        lstKeys = list(dctFlush)
+        try:
+            # A hit implies a lookup, so the pool is already up
+            pool = await ClsDatabasepool().fnGetPool()
+            async with pool.acquire() as conn:
+                await conn.execute("""
+                    UPDATE tbl_ai_response_cache c
+                    SET int_hit_count = c.int_hit_count + h.int_hits,
+                        int_tokens_saved = c.int_tokens_saved + h.int_tokens_saved,
+                        tim_last_hit_at = CURRENT_TIMESTAMP
+                    FROM unnest($1::bigint[], $2::text[], $3::text[], $4::text[], $5::int[], $6::bigint[])
+                        AS h(fk_bint_user_id, vchr_fingerprint, vchr_context_version, vchr_model_used, int_hits, int_tokens_saved)
+                    WHERE c.fk_bint_user_id = h.fk_bint_user_id
+                    AND c.vchr_fingerprint = h.vchr_fingerprint
+                    AND c.vchr_context_version = h.vchr_context_version
+                    AND c.vchr_model_used = h.vchr_model_used
+                """,
+                    [tupKey[0] for tupKey in lstKeys],
+                    [tupKey[1] for tupKey in lstKeys],
+                    [tupKey[2] for tupKey in lstKeys],
+                    [tupKey[3] for tupKey in lstKeys],
+                    [dctFlush[tupKey][0] for tupKey in lstKeys],
+                    [dctFlush[tupKey][1] for tupKey in lstKeys]
+                )
+        except Exception as e:
+            logger.error(f"AI cache hit flush failed: {str(e)}")
+            for tupKey, lstCounts in dctFlush.items():
+                lstPending = self.dctPending.setdefault(tupKey, [0, 0])
+                lstPending[0] += lstCounts[0]
+                lstPending[1] += lstCounts[1]
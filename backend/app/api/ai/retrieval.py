@@ -0,0 +1,148 @@
+"""
+Inventory Retrieval - Pick the SKUs relevant to a customer request
+
+Large catalogs no longer go into the Groq prompt whole. A per-tenant BM25
+index over item name, code and category picks the top-K items, and only
+those are rendered into the AVAILABLE INVENTORY block.
+
+Terms are lowercase words plus character trigrams of each word, so
+"cameras" still matches "Camera", and "cat6" matches "CAT 6 Cable".
+
+The index is built from the cached catalog (app/api/inventory/cache.py) and
+rebuilt only when that catalog tuple changes (write or TTL reload).
+
+Small catalogs (<= INT_FULL_CATALOG_LIMIT) are sent whole, as before.
+
+Usage:
+    from app.api.ai.retrieval import fnGetRelevantInventory
+
+    tupRows, intTotal = await fnGetRelevantInventory(pool, intUserId, strRawText)
+"""
+
+import re
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.api.inventory.cache import fnGetInventoryCatalog
+from app.core.cache import ClsTTLCache
+
+
+INT_TOP_K = 60
+INT_FULL_CATALOG_LIMIT = 150
+INT_NGRAM = 3
+FLT_MIN_RELATIVE_SCORE = 0.2   # drop weak n-gram-only matches (< 20% of the best score)
+INT_CHARS_PER_TOKEN = 4   # rough estimate for English / item codes, used for savings reporting
+
+# BM25 parameters (standard values)
+FLT_K1 = 1.2
+FLT_B = 0.75
+
+# Items system_prompt.txt adds to every IP camera job even when the customer
+# does not mention them - always part of the query so they are retrieved.
+LST_STANDING_TERMS = [
+    "nvr", "poe switch", "hdd", "hdmi cable", "surge protector", "wireless mouse",
+    "electrical materials", "configuration", "installation", "co box",
+    "jack boots", "patch cord", "cable", "monitor", "rack"
+]
+
+RE_WORD = re.compile(r"[a-z0-9]+")
+
+# key user -> (catalog tuple it was built from, ClsInventoryIndex)
+insInventoryIndexCache = ClsTTLCache(intMaxSize=1024)
+
+
+def fnTokenize(strText: str) -> List[str]:
+    """Words plus boundary-marked character n-grams of each word"""
+    lstTerms = []
+    for strWord in RE_WORD.findall((strText or "").lower()):
+        lstTerms.append(strWord)
+        strPadded = f"#{strWord}#"
+        if len(strPadded) > INT_NGRAM:
+            lstTerms.extend(strPadded[i:i + INT_NGRAM] for i in range(len(strPadded) - INT_NGRAM + 1))
+    return lstTerms
+
+
+def fnDocumentText(dctRow: Dict[str, Any]) -> str:
+    return f"{dctRow['vchr_item_name'] or ''} {dctRow['vchr_item_code'] or ''} {dctRow['vchr_category'] or ''}"
+
+
+class ClsInventoryIndex:
+    """BM25 inverted index over one tenant's catalog"""
+
+    def __init__(self, tupCatalog: Sequence[Dict[str, Any]]) -> None:
+        self.tupCatalog = tupCatalog
+        self.dctPostings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)   # term -> [(doc, tf)]
+        self.lstDocLength: List[int] = []
+
+        for intDoc, dctRow in enumerate(tupCatalog):
+            lstTerms = fnTokenize(fnDocumentText(dctRow))
+            self.lstDocLength.append(len(lstTerms))
+            for strTerm, intTf in Counter(lstTerms).items():
+                self.dctPostings[strTerm].append((intDoc, intTf))
+
+        intDocs = len(tupCatalog)
+        self.fltAvgLength = (sum(self.lstDocLength) / intDocs) if intDocs else 0.0
+        self.dctIdf = {
+            strTerm: math.log(1 + (intDocs - len(lstPost) + 0.5) / (len(lstPost) + 0.5))
+            for strTerm, lstPost in self.dctPostings.items()
+        }
+
+    def fnSearch(self, strQuery: str, intTopK: int = INT_TOP_K) -> Tuple[Dict[str, Any], ...]:
+        """Top-K rows by BM25 score (only rows that match at least one term)"""
+        dctScores: Dict[int, float] = defaultdict(float)
+
+        for strTerm in set(fnTokenize(strQuery)):
+            lstPost = self.dctPostings.get(strTerm)
+            if not lstPost:
+                continue
+            fltIdf = self.dctIdf[strTerm]
+            for intDoc, intTf in lstPost:
+                fltNorm = FLT_K1 * (1 - FLT_B + FLT_B * self.lstDocLength[intDoc] / self.fltAvgLength)
+                dctScores[intDoc] += fltIdf * intTf * (FLT_K1 + 1) / (intTf + fltNorm)
+
+        if not dctScores:
+            return ()
+
+        fltMinScore = max(dctScores.values()) * FLT_MIN_RELATIVE_SCORE
+        lstTop = sorted(
+            (tupItem for tupItem in dctScores.items() if tupItem[1] >= fltMinScore),
+            key=lambda tupItem: (-tupItem[1], tupItem[0])
+        )[:intTopK]
+        # Keep catalog order (by item name) in the prompt
+        return tuple(self.tupCatalog[intDoc] for intDoc in sorted(intDoc for intDoc, _ in lstTop))
+
+
+def fnGetInventoryIndex(intUserId: int, tupCatalog: Sequence[Dict[str, Any]]) -> ClsInventoryIndex:
+    tupEntry = insInventoryIndexCache.fnGet(intUserId)
+    if tupEntry is not None and tupEntry[0] is tupCatalog:
+        return tupEntry[1]
+
+    insIndex = ClsInventoryIndex(tupCatalog)
+    insInventoryIndexCache.fnSet(intUserId, (tupCatalog, insIndex))
+    return insIndex
+
+
+async def fnGetRelevantInventory(
+    pool,
+    intUserId: int,
+    strRawText: str,
+    intTopK: int = INT_TOP_K
+) -> Tuple[Tuple[Dict[str, Any], ...], int]:
+    """
+    Catalog rows to put in the prompt for this request.
+
+    Returns (rows, total catalog size). Rows is the whole catalog when it is
+    small enough, otherwise the top-K matches for the request.
+    """
+    tupCatalog = await fnGetInventoryCatalog(pool, intUserId)
+    if len(tupCatalog) <= INT_FULL_CATALOG_LIMIT:
+        return tupCatalog, len(tupCatalog)
+
+    insIndex = fnGetInventoryIndex(intUserId, tupCatalog)
+    strQuery = f"{strRawText} {' '.join(LST_STANDING_TERMS)}"
+    return insIndex.fnSearch(strQuery, intTopK), len(tupCatalog)
+
+
+def fnEstimateTokens(strText: str) -> int:
+    return len(strText) // INT_CHARS_PER_TOKEN
@@ -1,14 +1,24 @@
+from typing import Annotated
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from asyncpg import Pool
 
 from app.core.database import ClsDatabasepool
-from app.core.security import fnGetCurrentUser
+from app.core.security import fnGetCurrentUser, fnGetAdminUser
 from app.core.logger import getUserLogger
 from app.core.baseSchema import ResponseStatus
 from app.api.ai.service import ClsAIQuotationService
+from app.api.ai.provider import ClsGroqProvider
+from app.api.ai.batchQueue import ClsAIBatchQueue
 from app.api.ai.schema import (
     MdlProcessQuotationRequest,
-    MdlProcessQuotationResponse
+    MdlProcessQuotationResponse,
+    MdlBatchQuotationRequest,
+    MdlBatchJobResponse,
+    MdlBatchStatusRequest,
+    MdlBatchStatusResponse,
+    MdlProviderMetricsResponse
 )
 
 router = APIRouter(prefix="/ai", tags=["AI Quotation"])
@@ -49,3 +59,101 @@ async def fnProcessQuotation(
             strMessage=f"AI processing error: {str(e)}",
             lstItems=[]
         )
+
+
+@router.post("/process-stream")
+async def fnProcessQuotationStream(
+    mdlRequest: MdlProcessQuotationRequest,
+    insPool: Pool = Depends(fnGetPool),
+    intUserId: int = Depends(fnGetCurrentUser)
+):
+    """
+    Streaming version of /ai/process (Server-Sent Events).
+
+    Events:
+        item   - one MdlAIQuotationItem, as soon as the model has written it
+        done   - final MdlProcessQuotationResponse (saved, with intAiResponseId)
+        error  - MdlProcessQuotationResponse with the error message
+    """
+    logger = getUserLogger(intUserId)
+    logger.info(f"AI streamed quotation request received")
+    insService = ClsAIQuotationService(insPool, intUserId)
+    return StreamingResponse(
+        insService.fnStreamQuotation(mdlRequest.strRawText),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/batch", response_model=MdlBatchJobResponse)
+async def fnCreateBatch(
+    mdlRequest: MdlBatchQuotationRequest,
+    insPool: Pool = Depends(fnGetPool),
+    intUserId: int = Depends(fnGetCurrentUser)
+):
+    """
+    Queue many raw inputs for background AI processing.
+
+    Example request:
+    {
+        "lstRawTexts": ["4 cameras with DVR for a shop", "8 cameras, 300m cable, monitor needed"]
+    }
+
+    Poll /ai/batch/status with the returned intJobId.
+    """
+    logger = getUserLogger(intUserId)
+    try:
+        insService = ClsAIQuotationService(insPool, intUserId)
+        return await insService.fnCreateBatchJob(mdlRequest.lstRawTexts)
+    except Exception as e:
+        logger.error(f"Error creating AI batch: {str(e)}", exc_info=True)
+        return MdlBatchJobResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"AI batch error: {str(e)}"
+        )
+
+
+@router.post("/batch/status", response_model=MdlBatchStatusResponse)
+async def fnGetBatchStatus(
+    mdlRequest: MdlBatchStatusRequest,
+    insPool: Pool = Depends(fnGetPool),
+    intUserId: int = Depends(fnGetCurrentUser)
+):
+    """Progress of a batch job with the generated items of finished inputs"""
+    logger = getUserLogger(intUserId)
+    try:
+        insService = ClsAIQuotationService(insPool, intUserId)
+        return await insService.fnGetBatchJobStatus(mdlRequest.intJobId)
+    except Exception as e:
+        logger.error(f"Error in AI batch status: {str(e)}", exc_info=True)
+        return MdlBatchStatusResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"AI batch status error: {str(e)}"
+        )
+
+
+@router.post("/metrics", response_model=MdlProviderMetricsResponse)
+async def fnGetProviderMetrics(intUserId: Annotated[int, Depends(fnGetAdminUser)]):
+    """Queueing delay vs provider latency, retries, 429s and breaker state (admin)"""
+    logger = getUserLogger(intUserId)
+    try:
+        return MdlProviderMetricsResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage="AI provider metrics (this worker)",
+            dctMetrics=ClsGroqProvider().fnGetStats(),
+            dctBatchQueue=ClsAIBatchQueue().fnGetStats()
+        )
+    except Exception as e:
+        logger.error(f"Error in AI provider metrics: {str(e)}", exc_info=True)
+        return MdlProviderMetricsResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Unexpected error: {str(e)}"
+        )
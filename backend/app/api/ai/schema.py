@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 from app.core.baseSchema import MdlBaseRequest, MdlBaseResponse
 
@@ -28,3 +28,48 @@ class MdlProcessQuotationResponse(MdlBaseResponse):
     strNotes: Optional[str] = None
     intTokensInput: Optional[int] = None
     intTokensOutput: Optional[int] = None
+    intInventoryItemsSent: Optional[int] = None   # Catalog items put in the prompt after retrieval
+    intTokensSaved: Optional[int] = None          # Estimated tokens saved (retrieval, or the whole call on a cache hit)
+    blnCacheHit: bool = False                     # Answer reused from tbl_ai_response_cache
+
+
+class MdlBatchQuotationRequest(MdlBaseRequest):
+    """Many raw inputs (e.g. pasted WhatsApp enquiries) processed in the background"""
+    lstRawTexts: List[str]
+
+
+class MdlBatchJobResponse(MdlBaseResponse):
+    """Batch accepted - poll /ai/batch/status with intJobId"""
+    intJobId: Optional[int] = None
+    strJobStatus: Optional[str] = None
+    intTotal: int = 0
+
+
+class MdlBatchStatusRequest(MdlBaseRequest):
+    intJobId: int
+
+
+class MdlBatchItemResult(BaseModel):
+    """One input of a batch"""
+    intPosition: int
+    intRawInputId: int
+    strStatus: str                              # queued / processing / done / failed
+    intAiResponseId: Optional[int] = None
+    strError: Optional[str] = None
+    lstItems: List[MdlAIQuotationItem] = []
+
+
+class MdlBatchStatusResponse(MdlBaseResponse):
+    """Batch progress and per-input results"""
+    intJobId: Optional[int] = None
+    strJobStatus: Optional[str] = None          # queued / running / completed
+    intTotal: int = 0
+    intCompleted: int = 0
+    intFailed: int = 0
+    lstResults: List[MdlBatchItemResult] = []
+
+
+class MdlProviderMetricsResponse(MdlBaseResponse):
+    """Groq rate limiter / retry / circuit breaker metrics (this worker)"""
+    dctMetrics: Dict[str, Any] = {}
+    dctBatchQueue: Dict[str, Any] = {}
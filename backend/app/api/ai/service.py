@@ -1,17 +1,27 @@
 import os
 import json
-import httpx
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from asyncpg import Pool
-from pathlib import Path
 
 from app.api.ai.schema import (
     MdlProcessQuotationResponse,
-    MdlAIQuotationItem
+    MdlAIQuotationItem,
+    MdlBatchJobResponse,
+    MdlBatchItemResult,
+    MdlBatchStatusResponse
 )
+from app.api.ai.batchQueue import ClsAIBatchQueue, BATCH_STATUS_QUEUED
+from app.api.ai.promptCache import fnGetSystemPrompt, fnGetInventoryPromptBlock, fnRenderInventoryBlock
+from app.api.ai.retrieval import fnGetRelevantInventory, fnEstimateTokens
+from app.api.ai.responseCache import fnFingerprint, fnContextVersion, fnLookupResponse, fnStoreResponse
+from app.api.ai.streaming import ClsItemStreamParser, fnIterGroqContent, fnSseEvent
 from app.core.baseSchema import ResponseStatus
+from app.api.ai.provider import ClsGroqProvider
+from app.core.resilience import ClsCircuitOpenError
 from app.core.logger import getUserLogger
 
+INT_MAX_BATCH_SIZE = 200
+
 
 class ClsAIQuotationService:
     def __init__(self, insPool: Pool, intUserId: int):
@@ -19,44 +29,32 @@ class ClsAIQuotationService:
         self.intUserId = intUserId
         self.logger = getUserLogger(intUserId)  # User-specific logger
         self.strGroqApiKey = os.getenv("GROQ_API_KEY", "")
-        self.strGroqUrl = "https://api.groq.com/openai/v1/chat/completions"
+        self.strGroqUrl = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1").rstrip("/") + "/chat/completions"
         self.strModelName = "llama-3.3-70b-versatile"
         self.strPromptVersion = "v1.0"
 
     def fnLoadSystemPrompt(self) -> str:
-        """Load system prompt from file"""
-        strPromptPath = Path(__file__).parent / "system_prompt.txt"
-        try:
-            with open(strPromptPath, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception as e:
-            print(f"Error loading system prompt: {e}")
-            return "You are a helpful assistant for creating CCTV quotations."
+        """System prompt (kept in memory, reloaded when the file changes)"""
+        return fnGetSystemPrompt()
 
     async def fnGetInventoryList(self) -> str:
-        """Fetch inventory items for AI context"""
-        async with self.insPool.acquire() as conn:
-            strQuery = """
-                SELECT
-                    pk_bint_inventory_id,
-                    vchr_item_code,
-                    vchr_item_name,
-                    vchr_unit,
-                    dbl_unit_price
-                FROM tbl_inventory
-                WHERE fk_bint_user_id = $1
-                ORDER BY vchr_item_name
-            """
-            lstRows = await conn.fetch(strQuery, self.intUserId)
+        """Inventory block for AI context (cached per catalog version)"""
+        return await fnGetInventoryPromptBlock(self.insPool, self.intUserId)
 
-            if not lstRows:
-                return "No inventory items available."
+    async def fnGetInventoryContext(self, strRawText: str) -> Tuple[str, int, int, int]:
+        """
+        Inventory block limited to items relevant to the request
 
-            strInventoryText = "AVAILABLE INVENTORY:\n"
-            for dctRow in lstRows:
-                strInventoryText += f"- ID:{dctRow['pk_bint_inventory_id']} | Code:{dctRow['vchr_item_code'] or 'N/A'} | {dctRow['vchr_item_name']} | Unit:{dctRow['vchr_unit']} | Price:{dctRow['dbl_unit_price']}\n"
+        Returns (text, catalog size, items sent, estimated prompt tokens saved)
+        """
+        tupRows, intTotal = await fnGetRelevantInventory(self.insPool, self.intUserId, strRawText)
+        strFullBlock = await fnGetInventoryPromptBlock(self.insPool, self.intUserId)
+        if len(tupRows) == intTotal:
+            return strFullBlock, intTotal, intTotal, 0
 
-            return strInventoryText
+        strBlock = fnRenderInventoryBlock(tupRows)
+        intTokensSaved = max(0, fnEstimateTokens(strFullBlock) - fnEstimateTokens(strBlock))
+        return strBlock, intTotal, len(tupRows), intTokensSaved
 
     async def fnSaveRawInput(self, strRawText: str, strCustomerName: Optional[str] = None, strCustomerPhone: Optional[str] = None) -> int:
         """Save raw input to tbl_raw_input and return the ID"""
@@ -84,7 +82,10 @@ class ClsAIQuotationService:
         intRawInputId: int,
         dctJsonResponse: dict,
         intTokensInput: int = 0,
-        intTokensOutput: int = 0
+        intTokensOutput: int = 0,
+        intInventoryItemsTotal: int = 0,
+        intInventoryItemsSent: int = 0,
+        intTokensSaved: int = 0
     ) -> int:
         """Save AI response to tbl_ai_response and return the ID"""
         async with self.insPool.acquire() as conn:
@@ -97,8 +98,11 @@ class ClsAIQuotationService:
                     vchr_model_used,
                     int_tokens_input,
                     int_tokens_output,
-                    dbl_cost_inr
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                    dbl_cost_inr,
+                    int_inventory_items_total,
+                    int_inventory_items_sent,
+                    int_tokens_saved
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
                 RETURNING pk_bint_ai_response_id
             """
             # Calculate cost (Groq is free, but track for future)
@@ -116,12 +120,161 @@ class ClsAIQuotationService:
                 self.strModelName,
                 intTokensInput,
                 intTokensOutput,
-                dblCostInr
+                dblCostInr,
+                intInventoryItemsTotal,
+                intInventoryItemsSent,
+                intTokensSaved
             )
             return dctResult['pk_bint_ai_response_id']
 
-    async def fnProcessQuotation(self, strRawText: str) -> MdlProcessQuotationResponse:
-        """Process raw text using Groq AI to generate quotation items"""
+    def fnItemFromDict(self, dctItem: dict) -> MdlAIQuotationItem:
+        """One parsed AI item -> item model"""
+        return MdlAIQuotationItem(
+            strItemName=dctItem.get("item_name", "Unknown Item"),
+            strItemCode=dctItem.get("item_code"),
+            intInventoryId=dctItem.get("inventory_id"),
+            dblQuantity=float(dctItem.get("quantity", 1)),
+            dblUnitPrice=float(dctItem.get("unit_price", 0)),
+            strUnit=dctItem.get("unit", "piece")
+        )
+
+    def fnBuildResponse(
+        self,
+        dctParsed: dict,
+        intAiResponseId: int,
+        intTokensInput: int = 0,
+        intTokensOutput: int = 0,
+        intInventoryItemsSent: Optional[int] = None,
+        intTokensSaved: Optional[int] = None,
+        blnCacheHit: bool = False
+    ) -> MdlProcessQuotationResponse:
+        """Parsed AI JSON -> response model"""
+        lstItems = [self.fnItemFromDict(dctItem) for dctItem in dctParsed.get("items", [])]
+
+        return MdlProcessQuotationResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage="Quotation generated successfully" if not blnCacheHit else "Quotation returned from cache",
+            intAiResponseId=intAiResponseId,
+            lstItems=lstItems,
+            strCustomerName=dctParsed.get("customer_name"),
+            strCustomerPhone=dctParsed.get("customer_phone"),
+            strNotes=dctParsed.get("notes"),
+            intTokensInput=intTokensInput,
+            intTokensOutput=intTokensOutput,
+            intInventoryItemsSent=intInventoryItemsSent,
+            intTokensSaved=intTokensSaved,
+            blnCacheHit=blnCacheHit
+        )
+
+    def fnBuildUserMessage(self, strInventoryList: str, strRawText: str) -> str:
+        return f"""
+{strInventoryList}
+
+CUSTOMER REQUEST:
+{strRawText}
+
+Generate quotation items based on the above request. Match inventory items where possible.
+Return ONLY valid JSON, no markdown formatting.
+"""
+
+    def fnBuildGroqRequest(self, strSystemPrompt: str, strUserMessage: str, blnStream: bool = False) -> Tuple[dict, dict]:
+        """Headers and payload for the Groq chat completion call"""
+        dctHeaders = {
+            "Authorization": f"Bearer {self.strGroqApiKey}",
+            "Content-Type": "application/json"
+        }
+
+        dctPayload = {
+            "model": self.strModelName,
+            "messages": [
+                {"role": "system", "content": strSystemPrompt},
+                {"role": "user", "content": strUserMessage}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 2000
+        }
+        if blnStream:
+            dctPayload["stream"] = True
+        return dctHeaders, dctPayload
+
+    def fnParseAiContent(self, strAiResponse: str) -> dict:
+        """Model output -> dict (strips markdown fences). Raises json.JSONDecodeError."""
+        strAiResponseClean = strAiResponse.strip()
+        if strAiResponseClean.startswith("```json"):
+            strAiResponseClean = strAiResponseClean[7:]
+        if strAiResponseClean.startswith("```"):
+            strAiResponseClean = strAiResponseClean[3:]
+        if strAiResponseClean.endswith("```"):
+            strAiResponseClean = strAiResponseClean[:-3]
+        strAiResponseClean = strAiResponseClean.strip()
+
+        return json.loads(strAiResponseClean)
+
+    async def fnLookupCachedResponse(self, strRawText: str) -> Tuple[str, str, str, Optional[dict]]:
+        """(system prompt, fingerprint, context version, cached response or None)"""
+        strSystemPrompt = self.fnLoadSystemPrompt()
+        strFingerprint = fnFingerprint(strRawText)
+        strContextVersion = fnContextVersion(await self.fnGetInventoryList(), strSystemPrompt)
+
+        dctCached = await fnLookupResponse(
+            self.insPool, self.intUserId, strFingerprint, strContextVersion, self.strModelName
+        )
+        if dctCached:
+            self.logger.info(
+                f"AI quotation cache hit | Response ID: {dctCached['intAiResponseId']} "
+                f"| ~{dctCached['intTokensInput'] + dctCached['intTokensOutput']} tokens saved"
+            )
+        return strSystemPrompt, strFingerprint, strContextVersion, dctCached
+
+    def fnBuildCachedResponse(self, dctCached: dict) -> MdlProcessQuotationResponse:
+        return self.fnBuildResponse(
+            dctCached["dctJsonResponse"],
+            intAiResponseId=dctCached["intAiResponseId"],
+            intTokensSaved=dctCached["intTokensInput"] + dctCached["intTokensOutput"],
+            blnCacheHit=True
+        )
+
+    async def fnPersistResult(
+        self,
+        intRawInputId: int,
+        dctParsed: dict,
+        intTokensInput: int,
+        intTokensOutput: int,
+        intItemsTotal: int,
+        intItemsSent: int,
+        intTokensSaved: int,
+        strFingerprint: str,
+        strContextVersion: str
+    ) -> int:
+        """Save the AI response and remember it in the response cache. Returns response ID."""
+        intAiResponseId = await self.fnSaveAiResponse(
+            intRawInputId=intRawInputId,
+            dctJsonResponse=dctParsed,
+            intTokensInput=intTokensInput,
+            intTokensOutput=intTokensOutput,
+            intInventoryItemsTotal=intItemsTotal,
+            intInventoryItemsSent=intItemsSent,
+            intTokensSaved=intTokensSaved
+        )
+
+        await fnStoreResponse(
+            self.insPool, self.intUserId, strFingerprint, strContextVersion, self.strModelName,
+            intAiResponseId, dctParsed, intTokensInput, intTokensOutput
+        )
+        self.logger.info(
+            f"AI quotation generated successfully | Items: {len(dctParsed.get('items', []))} "
+            f"| Tokens: {intTokensInput}/{intTokensOutput} | Inventory: {intItemsSent}/{intItemsTotal} (~{intTokensSaved} tokens saved)"
+        )
+        return intAiResponseId
+
+    async def fnProcessQuotation(self, strRawText: str, intRawInputId: Optional[int] = None) -> MdlProcessQuotationResponse:
+        """
+        Process raw text using Groq AI to generate quotation items
+
+        intRawInputId: already-saved tbl_raw_input row (batch jobs); saved here when None
+        """
         self.logger.info(f"Processing AI quotation request: {strRawText[:100]}...")
 
         if not self.strGroqApiKey:
@@ -134,114 +287,66 @@ class ClsAIQuotationService:
             )
 
         try:
-            # Step 1: Save raw input to database
-            intRawInputId = await self.fnSaveRawInput(strRawText)
+            # Step 1: Save raw input to database (cache hits included - every request is recorded)
+            if intRawInputId is None:
+                intRawInputId = await self.fnSaveRawInput(strRawText)
 
-            # Load system prompt and inventory
-            strSystemPrompt = self.fnLoadSystemPrompt()
-            strInventoryList = await self.fnGetInventoryList()
+            # Step 2: Same request against the same catalog / prompt / model answered before?
+            strSystemPrompt, strFingerprint, strContextVersion, dctCached = await self.fnLookupCachedResponse(strRawText)
+            if dctCached:
+                return self.fnBuildCachedResponse(dctCached)
 
-            # Build user message
-            strUserMessage = f"""
-{strInventoryList}
-
-CUSTOMER REQUEST:
-{strRawText}
-
-Generate quotation items based on the above request. Match inventory items where possible.
-Return ONLY valid JSON, no markdown formatting.
-"""
+            # Load inventory relevant to the request
+            strInventoryList, intItemsTotal, intItemsSent, intTokensSaved = await self.fnGetInventoryContext(strRawText)
 
             # Call Groq API
-            dctHeaders = {
-                "Authorization": f"Bearer {self.strGroqApiKey}",
-                "Content-Type": "application/json"
-            }
-
-            dctPayload = {
-                "model": self.strModelName,
-                "messages": [
-                    {"role": "system", "content": strSystemPrompt},
-                    {"role": "user", "content": strUserMessage}
-                ],
-                "temperature": 0.3,
-                "max_tokens": 2000
-            }
-
-            async with httpx.AsyncClient(timeout=30.0) as insClient:
-                insResponse = await insClient.post(
-                    self.strGroqUrl,
-                    headers=dctHeaders,
-                    json=dctPayload
+            dctHeaders, dctPayload = self.fnBuildGroqRequest(
+                strSystemPrompt, self.fnBuildUserMessage(strInventoryList, strRawText)
+            )
+            insResponse = await ClsGroqProvider().fnPostChat(self.strGroqUrl, dctHeaders, dctPayload)
+
+            if insResponse.status_code != 200:
+                return MdlProcessQuotationResponse(
+                    intStatus=ResponseStatus.ERROR,
+                    strStatus=ResponseStatus.ERROR_STR,
+                    intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+                    strMessage=f"Groq API error: {insResponse.status_code}",
+                    lstItems=[]
                 )
 
-                if insResponse.status_code != 200:
-                    return MdlProcessQuotationResponse(
-                        intStatus=ResponseStatus.ERROR,
-                        strStatus=ResponseStatus.ERROR_STR,
-                        intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
-                        strMessage=f"Groq API error: {insResponse.status_code}",
-                        lstItems=[]
-                    )
+            dctResult = insResponse.json()
 
-                dctResult = insResponse.json()
-
-                # Extract token usage
-                dctUsage = dctResult.get("usage", {})
-                intTokensInput = dctUsage.get("prompt_tokens", 0)
-                intTokensOutput = dctUsage.get("completion_tokens", 0)
-
-                strAiResponse = dctResult["choices"][0]["message"]["content"]
-
-                # Parse JSON from AI response
-                # Clean up response (remove markdown if present)
-                strAiResponseClean = strAiResponse.strip()
-                if strAiResponseClean.startswith("```json"):
-                    strAiResponseClean = strAiResponseClean[7:]
-                if strAiResponseClean.startswith("```"):
-                    strAiResponseClean = strAiResponseClean[3:]
-                if strAiResponseClean.endswith("```"):
-                    strAiResponseClean = strAiResponseClean[:-3]
-                strAiResponseClean = strAiResponseClean.strip()
-
-                dctParsed = json.loads(strAiResponseClean)
-
-                # Step 2: Save AI response to database and get ID
-                intAiResponseId = await self.fnSaveAiResponse(
-                    intRawInputId=intRawInputId,
-                    dctJsonResponse=dctParsed,
-                    intTokensInput=intTokensInput,
-                    intTokensOutput=intTokensOutput
-                )
+            # Extract token usage
+            dctUsage = dctResult.get("usage", {})
+            intTokensInput = dctUsage.get("prompt_tokens", 0)
+            intTokensOutput = dctUsage.get("completion_tokens", 0)
 
-                # Convert to response model
-                lstItems = []
-                for dctItem in dctParsed.get("items", []):
-                    lstItems.append(MdlAIQuotationItem(
-                        strItemName=dctItem.get("item_name", "Unknown Item"),
-                        strItemCode=dctItem.get("item_code"),
-                        intInventoryId=dctItem.get("inventory_id"),
-                        dblQuantity=float(dctItem.get("quantity", 1)),
-                        dblUnitPrice=float(dctItem.get("unit_price", 0)),
-                        strUnit=dctItem.get("unit", "piece")
-                    ))
+            dctParsed = self.fnParseAiContent(dctResult["choices"][0]["message"]["content"])
 
-                self.logger.info(f"AI quotation generated successfully | Items: {len(lstItems)} | Tokens: {intTokensInput}/{intTokensOutput}")
+            # Step 3: Save AI response to database and get ID
+            intAiResponseId = await self.fnPersistResult(
+                intRawInputId, dctParsed, intTokensInput, intTokensOutput,
+                intItemsTotal, intItemsSent, intTokensSaved, strFingerprint, strContextVersion
+            )
 
-                return MdlProcessQuotationResponse(
-                    intStatus=ResponseStatus.SUCCESS,
-                    strStatus=ResponseStatus.SUCCESS_STR,
-                    intStatusCode=ResponseStatus.HTTP_OK,
-                    strMessage="Quotation generated successfully",
-                    intAiResponseId=intAiResponseId,
-                    lstItems=lstItems,
-                    strCustomerName=dctParsed.get("customer_name"),
-                    strCustomerPhone=dctParsed.get("customer_phone"),
-                    strNotes=dctParsed.get("notes"),
-                    intTokensInput=intTokensInput,
-                    intTokensOutput=intTokensOutput
-                )
+            return self.fnBuildResponse(
+                dctParsed,
+                intAiResponseId=intAiResponseId,
+                intTokensInput=intTokensInput,
+                intTokensOutput=intTokensOutput,
+                intInventoryItemsSent=intItemsSent,
+                intTokensSaved=intTokensSaved
+            )
 
+        except ClsCircuitOpenError as e:
+            self.logger.warning(f"AI provider unavailable: {str(e)}")
+            return MdlProcessQuotationResponse(
+                intStatus=ResponseStatus.ERROR,
+                strStatus=ResponseStatus.ERROR_STR,
+                intStatusCode=ResponseStatus.HTTP_SERVICE_UNAVAILABLE,
+                strMessage=f"AI provider unavailable: {str(e)}",
+                lstItems=[]
+            )
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to parse AI response: {str(e)}")
             return MdlProcessQuotationResponse(
@@ -260,3 +365,190 @@ Return ONLY valid JSON, no markdown formatting.
                 strMessage=f"AI processing failed: {str(e)}",
                 lstItems=[]
             )
+
+    async def fnStreamQuotation(self, strRawText: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of fnProcessQuotation (SSE frames)
+
+        event: item   one MdlAIQuotationItem, sent as soon as the model finishes it
+        event: done   the full MdlProcessQuotationResponse (after it is saved)
+        event: error  MdlProcessQuotationResponse with the error
+        """
+        self.logger.info(f"Processing streamed AI quotation request: {strRawText[:100]}...")
+
+        def fnErrorEvent(intStatusCode: int, strMessage: str) -> str:
+            return fnSseEvent("error", MdlProcessQuotationResponse(
+                intStatus=ResponseStatus.ERROR,
+                strStatus=ResponseStatus.ERROR_STR,
+                intStatusCode=intStatusCode,
+                strMessage=strMessage,
+                lstItems=[]
+            ).model_dump_json())
+
+        if not self.strGroqApiKey:
+            yield fnErrorEvent(ResponseStatus.HTTP_BAD_REQUEST, "GROQ API key not configured")
+            return
+
+        try:
+            intRawInputId = await self.fnSaveRawInput(strRawText)
+
+            strSystemPrompt, strFingerprint, strContextVersion, dctCached = await self.fnLookupCachedResponse(strRawText)
+            if dctCached:
+                mdlResponse = self.fnBuildCachedResponse(dctCached)
+                for mdlItem in mdlResponse.lstItems:
+                    yield fnSseEvent("item", mdlItem.model_dump_json())
+                yield fnSseEvent("done", mdlResponse.model_dump_json())
+                return
+
+            strInventoryList, intItemsTotal, intItemsSent, intTokensSaved = await self.fnGetInventoryContext(strRawText)
+
+            dctHeaders, dctPayload = self.fnBuildGroqRequest(
+                strSystemPrompt, self.fnBuildUserMessage(strInventoryList, strRawText), blnStream=True
+            )
+
+            insParser = ClsItemStreamParser()
+            dctUsage: dict = {}
+            insProvider = ClsGroqProvider()
+            async with insProvider.fnStreamChat(self.strGroqUrl, dctHeaders, dctPayload) as insResponse:
+                if insResponse.status_code != 200:
+                    yield fnErrorEvent(ResponseStatus.HTTP_INTERNAL_ERROR, f"Groq API error: {insResponse.status_code}")
+                    return
+
+                async for strDelta in fnIterGroqContent(insResponse, dctUsage):
+                    for dctItem in insParser.fnFeed(strDelta):
+                        yield fnSseEvent("item", self.fnItemFromDict(dctItem).model_dump_json())
+
+            insProvider.fnSettleTokens(insProvider.fnEstimateRequestTokens(dctPayload), dctUsage)
+            intTokensInput = dctUsage.get("prompt_tokens", 0)
+            intTokensOutput = dctUsage.get("completion_tokens", 0)
+            dctParsed = self.fnParseAiContent(insParser.fnGetText())
+
+            intAiResponseId = await self.fnPersistResult(
+                intRawInputId, dctParsed, intTokensInput, intTokensOutput,
+                intItemsTotal, intItemsSent, intTokensSaved, strFingerprint, strContextVersion
+            )
+
+            yield fnSseEvent("done", self.fnBuildResponse(
+                dctParsed,
+                intAiResponseId=intAiResponseId,
+                intTokensInput=intTokensInput,
+                intTokensOutput=intTokensOutput,
+                intInventoryItemsSent=intItemsSent,
+                intTokensSaved=intTokensSaved
+            ).model_dump_json())
+
+        except ClsCircuitOpenError as e:
+            self.logger.warning(f"AI provider unavailable: {str(e)}")
+            yield fnErrorEvent(ResponseStatus.HTTP_SERVICE_UNAVAILABLE, f"AI provider unavailable: {str(e)}")
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to parse streamed AI response: {str(e)}")
+            yield fnErrorEvent(ResponseStatus.HTTP_INTERNAL_ERROR, f"Failed to parse AI response: {str(e)}")
+        except Exception as e:
+            self.logger.error(f"Streamed AI processing failed: {str(e)}", exc_info=True)
+            yield fnErrorEvent(ResponseStatus.HTTP_INTERNAL_ERROR, f"AI processing failed: {str(e)}")
+
+    async def fnCreateBatchJob(self, lstRawTexts: List[str]) -> MdlBatchJobResponse:
+        """Store a batch of raw inputs and hand them to the background worker pool"""
+        lstRawTexts = [strText.strip() for strText in lstRawTexts if strText and strText.strip()]
+        if not lstRawTexts or len(lstRawTexts) > INT_MAX_BATCH_SIZE:
+            return MdlBatchJobResponse(
+                intStatus=ResponseStatus.ERROR,
+                strStatus=ResponseStatus.ERROR_STR,
+                intStatusCode=ResponseStatus.HTTP_BAD_REQUEST,
+                strMessage=f"Batch must contain 1 to {INT_MAX_BATCH_SIZE} non-empty inputs"
+            )
+
+        async with self.insPool.acquire() as conn:
+            async with conn.transaction():
+                intJobId = await conn.fetchval("""
+                    INSERT INTO tbl_ai_batch_job (fk_bint_user_id, int_total)
+                    VALUES ($1, $2)
+                    RETURNING pk_bint_batch_job_id
+                """, self.intUserId, len(lstRawTexts))
+
+                lstRows = await conn.fetch("""
+                    WITH raw AS (
+                        INSERT INTO tbl_raw_input (fk_bint_user_id, txt_site_notes)
+                        SELECT $1::bigint, txt
+                        FROM unnest($3::text[]) WITH ORDINALITY AS t(txt, pos)
+                        ORDER BY pos
+                        RETURNING pk_bint_raw_input_id
+                    ),
+                    numbered AS (
+                        SELECT pk_bint_raw_input_id, ROW_NUMBER() OVER (ORDER BY pk_bint_raw_input_id) AS pos
+                        FROM raw
+                    )
+                    INSERT INTO tbl_ai_batch_item (fk_bint_batch_job_id, fk_bint_user_id, fk_bint_raw_input_id, int_position)
+                    SELECT $2::bigint, $1::bigint, pk_bint_raw_input_id, pos
+                    FROM numbered
+                    RETURNING pk_bint_batch_item_id
+                """, self.intUserId, intJobId, lstRawTexts)
+
+        ClsAIBatchQueue().fnEnqueue(sorted(row['pk_bint_batch_item_id'] for row in lstRows))
+        self.logger.info(f"AI batch job {intJobId} queued with {len(lstRawTexts)} inputs")
+
+        return MdlBatchJobResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_CREATED,
+            strMessage=f"Batch queued with {len(lstRawTexts)} inputs",
+            intJobId=intJobId,
+            strJobStatus=BATCH_STATUS_QUEUED,
+            intTotal=len(lstRawTexts)
+        )
+
+    async def fnGetBatchJobStatus(self, intJobId: int) -> MdlBatchStatusResponse:
+        """Batch progress plus the generated items of finished inputs"""
+        async with self.insPool.acquire() as conn:
+            rowJob = await conn.fetchrow("""
+                SELECT vchr_status, int_total, int_completed, int_failed
+                FROM tbl_ai_batch_job
+                WHERE pk_bint_batch_job_id = $1 AND fk_bint_user_id = $2
+            """, intJobId, self.intUserId)
+
+            if not rowJob:
+                return MdlBatchStatusResponse(
+                    intStatus=ResponseStatus.NO_DATA,
+                    strStatus=ResponseStatus.NO_DATA_STR,
+                    intStatusCode=ResponseStatus.HTTP_NOT_FOUND,
+                    strMessage="Batch job not found"
+                )
+
+            lstRows = await conn.fetch("""
+                SELECT
+                    i.int_position,
+                    i.fk_bint_raw_input_id,
+                    i.vchr_status,
+                    i.fk_bint_ai_response_id,
+                    i.txt_error,
+                    r.json_ai_response
+                FROM tbl_ai_batch_item i
+                LEFT JOIN tbl_ai_response r ON r.pk_bint_ai_response_id = i.fk_bint_ai_response_id
+                WHERE i.fk_bint_batch_job_id = $1
+                ORDER BY i.int_position
+            """, intJobId)
+
+        lstResults = []
+        for row in lstRows:
+            dctParsed = json.loads(row['json_ai_response']) if row['json_ai_response'] else {}
+            lstResults.append(MdlBatchItemResult(
+                intPosition=row['int_position'],
+                intRawInputId=row['fk_bint_raw_input_id'],
+                strStatus=row['vchr_status'],
+                intAiResponseId=row['fk_bint_ai_response_id'],
+                strError=row['txt_error'],
+                lstItems=[self.fnItemFromDict(dctItem) for dctItem in dctParsed.get("items", [])]
+            ))
+
+        return MdlBatchStatusResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage=f"{rowJob['int_completed'] + rowJob['int_failed']} of {rowJob['int_total']} inputs processed",
+            intJobId=intJobId,
+            strJobStatus=rowJob['vchr_status'],
+            intTotal=rowJob['int_total'],
+            intCompleted=rowJob['int_completed'],
+            intFailed=rowJob['int_failed'],
+            lstResults=lstResults
+        )
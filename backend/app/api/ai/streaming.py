@@ -0,0 +1,124 @@
+"""
+AI Streaming Helpers - Incremental parsing of a streamed Groq completion
+
+Groq (OpenAI-compatible) streams the completion as SSE lines:
+    data: {"choices":[{"delta":{"content":"..."}}], ...}
+    data: [DONE]
+
+fnIterGroqContent yields the content deltas. ClsItemStreamParser is fed
+those deltas and returns each object of the top-level "items" array as soon
+as its closing brace arrives, so items can be pushed to the client while the
+model is still writing the rest of the quotation.
+
+Usage:
+    insParser = ClsItemStreamParser()
+    async for strDelta in fnIterGroqContent(insResponse, dctUsage):
+        for dctItem in insParser.fnFeed(strDelta):
+            yield fnSseEvent("item", json.dumps(dctItem))
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, List
+
+
+def fnSseEvent(strEvent: str, strData: str) -> str:
+    """One server-sent event frame"""
+    return f"event: {strEvent}\ndata: {strData}\n\n"
+
+
+async def fnIterGroqContent(insResponse, dctUsage: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Content deltas from a streamed chat completion.
+
+    Token usage (sent with the last chunk, as "usage" or "x_groq.usage")
+    is copied into dctUsage.
+    """
+    async for strLine in insResponse.aiter_lines():
+        if not strLine.startswith("data:"):
+            continue
+
+        strData = strLine[5:].strip()
+        if strData == "[DONE]":
+            break
+
+        dctChunk = json.loads(strData)
+        dctChunkUsage = dctChunk.get("usage") or (dctChunk.get("x_groq") or {}).get("usage")
+        if dctChunkUsage:
+            dctUsage.update(dctChunkUsage)
+
+        for dctChoice in dctChunk.get("choices", []):
+            strContent = (dctChoice.get("delta") or {}).get("content")
+            if strContent:
+                yield strContent
+
+
+class ClsItemStreamParser:
+    """
+    Incremental scanner for {"...": ..., "items": [{...}, {...}], ...}
+
+    Keeps the whole text (for the final json.loads) but scans each character
+    once, tracking string / escape state and nesting depth. Objects that sit
+    directly inside the top-level "items" array are returned when complete.
+    """
+
+    def __init__(self) -> None:
+        self.lstText: List[str] = []
+        self.strPending = ""            # text scanned so far in the current item
+        self.intDepth = 0               # {} / [] nesting depth
+        self.blnInString = False
+        self.blnEscape = False
+        self.strLastKey = ""            # last complete string at depth 1 (key candidate)
+        self.lstString: List[str] = []  # current string chars (depth 1 keys only)
+        self.intItemsDepth = 0          # depth of the "items" array, 0 = not inside it
+        self.blnInItem = False
+
+    def fnFeed(self, strChunk: str) -> List[Dict[str, Any]]:
+        """Scan a chunk; return the items completed by it"""
+        self.lstText.append(strChunk)
+        lstDone = []
+
+        for strChar in strChunk:
+            if self.blnInItem:
+                self.strPending += strChar
+
+            if self.blnInString:
+                if self.blnEscape:
+                    self.blnEscape = False
+                elif strChar == "\\":
+                    self.blnEscape = True
+                elif strChar == '"':
+                    self.blnInString = False
+                    if self.intDepth == 1:
+                        self.strLastKey = "".join(self.lstString)
+                elif self.intDepth == 1:
+                    self.lstString.append(strChar)
+                continue
+
+            if strChar == '"':
+                self.blnInString = True
+                self.lstString = []
+            elif strChar in "{[":
+                self.intDepth += 1
+                if strChar == "[" and self.intDepth == 2 and self.strLastKey == "items":
+                    self.intItemsDepth = 2
+                elif strChar == "{" and self.intItemsDepth and self.intDepth == self.intItemsDepth + 1:
+                    self.blnInItem = True
+                    self.strPending = "{"
+            elif strChar in "}]":
+                if self.blnInItem and strChar == "}" and self.intDepth == self.intItemsDepth + 1:
+                    self.blnInItem = False
+                    try:
+                        lstDone.append(json.loads(self.strPending))
+                    except json.JSONDecodeError:
+                        pass  # malformed item - final json.loads decides
+                    self.strPending = ""
+                if strChar == "]" and self.intDepth == self.intItemsDepth:
+                    self.intItemsDepth = 0
+                self.intDepth -= 1
+            elif strChar == "," and self.intDepth == 1:
+                self.strLastKey = ""
+
+        return lstDone
+
+    def fnGetText(self) -> str:
+        return "".join(self.lstText)
@@ -0,0 +1,368 @@
+"""
+Dashboard Rollup - Materialized per-tenant dashboard aggregates
+
+tbl_dashboard_summary  : one row per tenant (totals, paid/pending counts, quotation count)
+tbl_dashboard_daily    : one row per tenant per day (earnings, invoices, quotations,
+                         invoices converted from a quotation) - also feeds /dashboard/timeseries
+
+Conversions are counted in the SOURCE QUOTATION's day bucket (not the
+invoice's), so int_converted_invoices / int_quotations is the conversion
+rate of the quotations issued in that period.
+
+Write paths (invoice create/delete/payment status, quotation create/delete)
+call the fnApply* functions with their OWN connection inside their OWN
+transaction, so the rollup commits or rolls back with the document.
+The dashboard then reads a single row instead of scanning tbl_invoice.
+
+Once that transaction has COMMITTED, the writer calls fnBumpRollupVersion.
+Bumping earlier would let a concurrent read cache the old rows under the
+new version and serve them for the whole cache TTL.
+
+The tenant's summary row is the lock: every fnApply* path and every rebuild
+takes it (UPDATE / SELECT ... FOR UPDATE) before touching the rollup, and a
+rebuild aggregates only in statements AFTER it holds the lock. So a rebuild
+either sees a writer's committed rows or runs before the writer's deltas -
+it can never overwrite them with totals from an older snapshot.
+
+If a tenant has no summary row yet (new tenant / rollup just deployed), a
+placeholder row (tim_refreshed_at NULL) is inserted and locked, and the
+first write or read rebuilds it from the source tables in that transaction.
+
+Usage:
+    from app.api.dashboard.rollup import fnApplyInvoiceCreated
+
+    async with conn.transaction():
+        ...INSERT invoice...
+        await fnApplyInvoiceCreated(conn, intUserId, datInvoiceDate, dblTotalAmount, strPaymentStatus)
+    fnBumpRollupVersion(intUserId)
+"""
+
+import datetime
+from typing import Dict, Optional
+
+
+PAYMENT_STATUS_PAID = "paid"
+
+# Per-tenant rollup version, bumped after every committed rollup write in this
+# process. In-process caches over the rollup (timeseries) include it in their keys.
+_dctRollupVersion: Dict[int, int] = {}
+
+
+def fnGetRollupVersion(intUserId: int) -> int:
+    return _dctRollupVersion.get(intUserId, 0)
+
+
+def fnBumpRollupVersion(intUserId: int) -> None:
+    """Call after the write transaction has committed"""
+    _dctRollupVersion[intUserId] = _dctRollupVersion.get(intUserId, 0) + 1
+
+
+def fnIsPaid(strPaymentStatus: Optional[str]) -> bool:
+    return strPaymentStatus == PAYMENT_STATUS_PAID
+
+
+# =============================================================================
+# Rebuild from source tables
+# =============================================================================
+
+async def fnLockSummaryRow(conn, intUserId: int) -> bool:
+    """
+    Lock the tenant's summary row until the transaction ends, inserting a
+    placeholder if there is none. Returns True when the row still has to be
+    built (placeholder). Call inside a transaction.
+    """
+    await conn.execute("""
+        INSERT INTO tbl_dashboard_summary (fk_bint_user_id, tim_refreshed_at)
+        VALUES ($1, NULL)
+        ON CONFLICT (fk_bint_user_id) DO NOTHING
+    """, intUserId)
+    timRefreshedAt = await conn.fetchval("""
+        SELECT tim_refreshed_at FROM tbl_dashboard_summary
+        WHERE fk_bint_user_id = $1
+        FOR UPDATE
+    """, intUserId)
+    return timRefreshedAt is None
+
+
+async def fnRebuildLocked(conn, intUserId: int) -> None:
+    """Recompute summary row and daily buckets - the summary row must already be locked"""
+    await conn.execute("""
+        UPDATE tbl_dashboard_summary
+        SET (dbl_total_collected, int_total_invoices, int_paid_invoices, int_pending_invoices) = (
+                SELECT
+                    COALESCE(SUM(dbl_total_amount), 0),
+                    COUNT(*),
+                    COUNT(CASE WHEN vchr_payment_status = 'paid' THEN 1 END),
+                    COUNT(CASE WHEN vchr_payment_status != 'paid' THEN 1 END)
+                FROM tbl_invoice
+                WHERE fk_bint_user_id = $1
+            ),
+            int_total_quotations = (SELECT COUNT(*) FROM tbl_quotation WHERE fk_bint_user_id = $1),
+            tim_refreshed_at = CURRENT_TIMESTAMP
+        WHERE fk_bint_user_id = $1
+    """, intUserId)
+
+    await conn.execute("DELETE FROM tbl_dashboard_daily WHERE fk_bint_user_id = $1", intUserId)
+    await conn.execute("""
+        INSERT INTO tbl_dashboard_daily (
+            fk_bint_user_id,
+            dat_day,
+            dbl_earnings,
+            int_invoices,
+            int_quotations,
+            int_converted_invoices
+        )
+        SELECT $1::bigint, dat_day, SUM(dbl_earnings), SUM(int_invoices), SUM(int_quotations), SUM(int_converted)
+        FROM (
+            SELECT
+                dat_invoice_date as dat_day,
+                COALESCE(dbl_total_amount, 0) as dbl_earnings,
+                1 as int_invoices,
+                0 as int_quotations,
+                0 as int_converted
+            FROM tbl_invoice
+            WHERE fk_bint_user_id = $1
+            UNION ALL
+            SELECT
+                q.dat_quotation_date,
+                0,
+                0,
+                1,
+                (SELECT COUNT(*) FROM tbl_invoice i
+                 WHERE i.fk_bint_quotation_id = q.pk_bint_quotation_id AND i.fk_bint_user_id = $1)
+            FROM tbl_quotation q
+            WHERE q.fk_bint_user_id = $1
+        ) src
+        GROUP BY dat_day
+    """, intUserId)
+
+
+async def fnReconcileDashboard(conn, intUserId: int) -> None:
+    """
+    Rebuild one tenant's summary row and daily buckets from tbl_invoice / tbl_quotation.
+
+    Bumps the rollup version itself only when it owns the transaction;
+    inside a writer's transaction the writer bumps after its commit.
+    """
+    blnOwnTransaction = not conn.is_in_transaction()
+
+    async with conn.transaction():
+        # Waits for in-flight writers; the aggregates below then see their commits
+        await fnLockSummaryRow(conn, intUserId)
+        await fnRebuildLocked(conn, intUserId)
+
+    if blnOwnTransaction:
+        fnBumpRollupVersion(intUserId)
+
+
+async def fnLockTenantRollup(conn, intUserId: int) -> bool:
+    """
+    Take the tenant's rollup lock for this write transaction.
+
+    Returns False when the tenant had no rollup yet - it was just rebuilt
+    from source (already including this transaction's writes), so the
+    caller must not apply its deltas.
+    """
+    if await fnLockSummaryRow(conn, intUserId):
+        await fnRebuildLocked(conn, intUserId)
+        return False
+    return True
+
+
+async def fnReconcileAllDashboards(pool) -> int:
+    """Rebuild the rollup for every tenant (reconcile job). Returns tenant count."""
+    async with pool.acquire() as conn:
+        lstUserIds = await conn.fetch("SELECT pk_bint_user_id FROM tbl_user ORDER BY pk_bint_user_id")
+
+    for dctRow in lstUserIds:
+        async with pool.acquire() as conn:
+            await fnReconcileDashboard(conn, dctRow['pk_bint_user_id'])
+
+    return len(lstUserIds)
+
+
+# =============================================================================
+# Incremental updates (call inside the write transaction)
+# =============================================================================
+
+async def fnApplySummaryDelta(
+    conn,
+    intUserId: int,
+    dblAmount: float = 0,
+    intInvoices: int = 0,
+    intPaid: int = 0,
+    intPending: int = 0,
+    intQuotations: int = 0
+) -> bool:
+    """
+    Add deltas to the tenant's summary row (takes the tenant's rollup lock).
+
+    Returns False when the tenant had no summary row - in that case the
+    rollup was rebuilt from source (which already includes this write).
+    """
+    strQuery = """
+        UPDATE tbl_dashboard_summary
+        SET dbl_total_collected = dbl_total_collected + $2,
+            int_total_invoices = int_total_invoices + $3,
+            int_paid_invoices = int_paid_invoices + $4,
+            int_pending_invoices = int_pending_invoices + $5,
+            int_total_quotations = int_total_quotations + $6
+        WHERE fk_bint_user_id = $1
+          AND tim_refreshed_at IS NOT NULL
+    """
+    tupArgs = (intUserId, dblAmount, intInvoices, intPaid, intPending, intQuotations)
+
+    # Common case: the UPDATE itself takes the row lock (held until commit)
+    if await conn.execute(strQuery, *tupArgs) == "UPDATE 1":
+        return True
+
+    # No built row visible yet (new tenant, or another first write seeding it)
+    if not await fnLockTenantRollup(conn, intUserId):
+        return False
+    await conn.execute(strQuery, *tupArgs)
+    return True
+
+
+async def fnGetQuotationDate(conn, intUserId: int, intQuotationId: Optional[int]) -> Optional[datetime.date]:
+    """
+    Day bucket a conversion is counted in. Read while holding the tenant's
+    rollup lock, so a concurrent quotation date edit is either fully before
+    or fully after it.
+    """
+    if intQuotationId is None:
+        return None
+    return await conn.fetchval("""
+        SELECT dat_quotation_date FROM tbl_quotation
+        WHERE pk_bint_quotation_id = $1 AND fk_bint_user_id = $2
+    """, intQuotationId, intUserId)
+
+
+async def fnApplyDailyDelta(
+    conn,
+    intUserId: int,
+    datDay: datetime.date,
+    dblAmount: float = 0,
+    intInvoices: int = 0,
+    intQuotations: int = 0,
+    intConverted: int = 0
+) -> None:
+    """Add deltas to one day bucket (caller holds the tenant's rollup lock)"""
+    await conn.execute("""
+        INSERT INTO tbl_dashboard_daily (
+            fk_bint_user_id,
+            dat_day,
+            dbl_earnings,
+            int_invoices,
+            int_quotations,
+            int_converted_invoices
+        )
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (fk_bint_user_id, dat_day) DO UPDATE SET
+            dbl_earnings = tbl_dashboard_daily.dbl_earnings + EXCLUDED.dbl_earnings,
+            int_invoices = tbl_dashboard_daily.int_invoices + EXCLUDED.int_invoices,
+            int_quotations = tbl_dashboard_daily.int_quotations + EXCLUDED.int_quotations,
+            int_converted_invoices = tbl_dashboard_daily.int_converted_invoices + EXCLUDED.int_converted_invoices
+    """, intUserId, datDay, dblAmount, intInvoices, intQuotations, intConverted)
+
+
+async def fnApplyInvoiceCreated(
+    conn,
+    intUserId: int,
+    datInvoiceDate: datetime.date,
+    dblTotalAmount: float,
+    strPaymentStatus: Optional[str],
+    intQuotationId: Optional[int] = None
+) -> None:
+    """intQuotationId: source quotation - the conversion goes in its day bucket"""
+    blnPaid = fnIsPaid(strPaymentStatus)
+    if await fnApplySummaryDelta(
+        conn, intUserId,
+        dblAmount=dblTotalAmount,
+        intInvoices=1,
+        intPaid=1 if blnPaid else 0,
+        intPending=0 if blnPaid or strPaymentStatus is None else 1
+    ):
+        await fnApplyDailyDelta(conn, intUserId, datInvoiceDate, dblAmount=dblTotalAmount, intInvoices=1)
+        datQuotationDate = await fnGetQuotationDate(conn, intUserId, intQuotationId)
+        if datQuotationDate is not None:
+            await fnApplyDailyDelta(conn, intUserId, datQuotationDate, intConverted=1)
+
+
+async def fnApplyInvoiceDeleted(
+    conn,
+    intUserId: int,
+    datInvoiceDate: datetime.date,
+    dblTotalAmount: float,
+    strPaymentStatus: Optional[str],
+    intQuotationId: Optional[int] = None
+) -> None:
+    """intQuotationId: source quotation - the conversion is taken off its day bucket"""
+    blnPaid = fnIsPaid(strPaymentStatus)
+    if await fnApplySummaryDelta(
+        conn, intUserId,
+        dblAmount=-dblTotalAmount,
+        intInvoices=-1,
+        intPaid=-1 if blnPaid else 0,
+        intPending=0 if blnPaid or strPaymentStatus is None else -1
+    ):
+        await fnApplyDailyDelta(conn, intUserId, datInvoiceDate, dblAmount=-dblTotalAmount, intInvoices=-1)
+        datQuotationDate = await fnGetQuotationDate(conn, intUserId, intQuotationId)
+        if datQuotationDate is not None:
+            await fnApplyDailyDelta(conn, intUserId, datQuotationDate, intConverted=-1)
+
+
+async def fnApplyPaymentStatusChange(
+    conn,
+    intUserId: int,
+    strOldStatus: Optional[str],
+    strNewStatus: Optional[str]
+) -> None:
+    """Move an invoice between paid / pending (amount and day buckets are unchanged)"""
+    intPaid = int(fnIsPaid(strNewStatus)) - int(fnIsPaid(strOldStatus))
+    intPending = int(strNewStatus is not None and not fnIsPaid(strNewStatus)) \
+        - int(strOldStatus is not None and not fnIsPaid(strOldStatus))
+
+    if intPaid or intPending:
+        await fnApplySummaryDelta(conn, intUserId, intPaid=intPaid, intPending=intPending)
+
+
+async def fnApplyQuotationCreated(conn, intUserId: int, datQuotationDate: datetime.date) -> None:
+    if await fnApplySummaryDelta(conn, intUserId, intQuotations=1):
+        await fnApplyDailyDelta(conn, intUserId, datQuotationDate, intQuotations=1)
+
+
+async def fnApplyQuotationDeleted(
+    conn,
+    intUserId: int,
+    datQuotationDate: datetime.date,
+    intConvertedInvoices: int = 0
+) -> None:
+    """
+    intConvertedInvoices: invoices made from this quotation. Their link is set
+    to NULL by the delete, so they no longer count as converted.
+    """
+    if await fnApplySummaryDelta(conn, intUserId, intQuotations=-1):
+        await fnApplyDailyDelta(
+            conn, intUserId, datQuotationDate,
+            intQuotations=-1,
+            intConverted=-intConvertedInvoices
+        )
+
+
+async def fnApplyQuotationDateChange(
+    conn,
+    intUserId: int,
+    intQuotationId: int,
+    datOldDate: datetime.date,
+    datNewDate: datetime.date
+) -> None:
+    """Move a quotation (and the invoices converted from it) between day buckets when its date is edited"""
+    if datOldDate == datNewDate or not await fnLockTenantRollup(conn, intUserId):
+        return
+    # Counted under the lock - see fnGetQuotationDate
+    intConverted = await conn.fetchval("""
+        SELECT COUNT(*) FROM tbl_invoice
+        WHERE fk_bint_quotation_id = $1 AND fk_bint_user_id = $2
+    """, intQuotationId, intUserId)
+    await fnApplyDailyDelta(conn, intUserId, datOldDate, intQuotations=-1, intConverted=-intConverted)
+    await fnApplyDailyDelta(conn, intUserId, datNewDate, intQuotations=1, intConverted=intConverted)
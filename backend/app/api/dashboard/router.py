@@ -2,11 +2,16 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 import asyncpg
 
-from app.api.dashboard.schema import MdlDashboardResponse
+from app.api.dashboard.schema import (
+    MdlDashboardResponse,
+    MdlReconcileResponse,
+    MdlTimeseriesRequest,
+    MdlTimeseriesResponse
+)
 from app.api.dashboard.service import ClsDashboardService
 from app.core.database import ClsDatabasepool
 from app.core.baseSchema import ResponseStatus
-from app.core.security import fnGetCurrentUser
+from app.core.security import fnGetCurrentUser, fnGetAdminUser
 from app.core.logger import getUserLogger
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -40,3 +45,62 @@ async def fnGetDashboardSummary(intUserId: Annotated[int, Depends(fnGetCurrentUs
             strMessage=f"Error: {str(e)}",
             data=None
         )
+
+
+@router.post("/timeseries", response_model=MdlTimeseriesResponse)
+async def fnGetTimeseries(
+    intUserId: Annotated[int, Depends(fnGetCurrentUser)],
+    mdlRequest: MdlTimeseriesRequest
+):
+    """Daily / weekly / monthly revenue, invoice counts and quote-to-invoice conversion"""
+    logger = getUserLogger(intUserId)
+    try:
+        insPool = ClsDatabasepool()
+        pool = await insPool.fnGetPool()
+
+        insService = ClsDashboardService(pool, intUserId)
+        return await insService.fnGetTimeseries(mdlRequest)
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error in dashboard timeseries: {str(e)}")
+        return MdlTimeseriesResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in dashboard timeseries: {str(e)}", exc_info=True)
+        return MdlTimeseriesResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Error: {str(e)}"
+        )
+
+
+@router.post("/reconcile", response_model=MdlReconcileResponse)
+async def fnReconcileDashboardRollup(intUserId: Annotated[int, Depends(fnGetAdminUser)]):
+    """Rebuild dashboard rollup for all tenants from source tables (Admin only)"""
+    logger = getUserLogger(intUserId)
+    try:
+        insPool = ClsDatabasepool()
+        pool = await insPool.fnGetPool()
+
+        insService = ClsDashboardService(pool, intUserId)
+        return await insService.fnReconcileAll()
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error in dashboard reconcile: {str(e)}")
+        return MdlReconcileResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in dashboard reconcile: {str(e)}", exc_info=True)
+        return MdlReconcileResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Error: {str(e)}"
+        )
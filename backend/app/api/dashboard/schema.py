@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from datetime import date
 
-from app.core.baseSchema import MdlBaseResponse
+from app.core.baseSchema import MdlBaseRequest, MdlBaseResponse
 
 
 class MdlDashboardSummary(BaseModel):
@@ -18,3 +19,43 @@ class MdlDashboardSummary(BaseModel):
 class MdlDashboardResponse(MdlBaseResponse):
     """Response with dashboard summary"""
     data: Optional[MdlDashboardSummary] = None
+
+
+class MdlReconcileResponse(MdlBaseResponse):
+    """Response after rebuilding dashboard rollup"""
+    intTenantsRebuilt: int = 0
+
+
+class MdlTimeseriesRequest(MdlBaseRequest):
+    """
+    Revenue timeseries request
+
+    strGranularity: day, week (periods start Monday) or month
+    Default range: last 30 days
+    """
+    datFromDate: Optional[date] = None
+    datToDate: Optional[date] = None
+    strGranularity: str = "day"
+
+
+class MdlTimeseriesPoint(BaseModel):
+    """One period in the timeseries"""
+    datPeriodStart: date
+    dblRevenue: float = 0.0
+    intInvoices: int = 0
+    intQuotations: int = 0
+    intConvertedInvoices: int = 0                 # Invoices created from this period's quotations
+    dblConversionRate: float = 0.0                # intConvertedInvoices / intQuotations (0..1)
+
+
+class MdlTimeseriesResponse(MdlBaseResponse):
+    """Response with revenue timeseries (empty periods included as zero)"""
+    strGranularity: Optional[str] = None
+    datFromDate: Optional[date] = None
+    datToDate: Optional[date] = None
+    lstPoints: List[MdlTimeseriesPoint] = []
+    dblTotalRevenue: float = 0.0
+    intTotalInvoices: int = 0
+    intTotalQuotations: int = 0
+    intTotalConvertedInvoices: int = 0
+    dblConversionRate: float = 0.0
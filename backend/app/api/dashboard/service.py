@@ -1,13 +1,50 @@
+import datetime
 from asyncpg import Pool
 
 from app.api.dashboard.schema import (
     MdlDashboardSummary,
-    MdlDashboardResponse
+    MdlDashboardResponse,
+    MdlReconcileResponse,
+    MdlTimeseriesRequest,
+    MdlTimeseriesPoint,
+    MdlTimeseriesResponse
 )
+from app.api.dashboard.rollup import fnReconcileDashboard, fnReconcileAllDashboards, fnGetRollupVersion
 from app.core.baseSchema import ResponseStatus
+from app.core.cache import ClsTTLCache
 from app.core.logger import getUserLogger
 
 
+LST_GRANULARITIES = ["day", "week", "month"]
+DEFAULT_TIMESERIES_DAYS = 30
+MAX_TIMESERIES_DAYS = 3660  # ~10 years
+
+# Hot ranges per worker. Key includes the tenant's rollup version, so local
+# writes invalidate at once; the TTL bounds staleness from other workers.
+insTimeseriesCache = ClsTTLCache(intMaxSize=512, fltTtlSeconds=60)
+
+
+def fnPeriodStart(datDay: datetime.date, strGranularity: str) -> datetime.date:
+    """Same bucketing as Postgres date_trunc (weeks start Monday)"""
+    if strGranularity == "week":
+        return datDay - datetime.timedelta(days=datDay.weekday())
+    if strGranularity == "month":
+        return datDay.replace(day=1)
+    return datDay
+
+
+def fnNextPeriod(datPeriod: datetime.date, strGranularity: str) -> datetime.date:
+    if strGranularity == "week":
+        return datPeriod + datetime.timedelta(days=7)
+    if strGranularity == "month":
+        return (datPeriod.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+    return datPeriod + datetime.timedelta(days=1)
+
+
+def fnConversionRate(intConverted: int, intQuotations: int) -> float:
+    return round(intConverted / intQuotations, 4) if intQuotations else 0.0
+
+
 class ClsDashboardService:
     def __init__(self, pool: Pool, intUserId: int):
         self.pool = pool
@@ -15,57 +52,152 @@ class ClsDashboardService:
         self.logger = getUserLogger(intUserId)
 
     async def fnGetDashboardSummary(self) -> MdlDashboardResponse:
-        """Get dashboard summary with collected and today's earnings"""
+        """Get dashboard summary with collected and today's earnings (single row from rollup)"""
         self.logger.debug("Fetching dashboard summary")
+
+        # Summary row + today's bucket in one lookup (see app/api/dashboard/rollup.py)
+        strQuery = """
+            SELECT
+                s.dbl_total_collected,
+                s.int_total_invoices,
+                s.int_paid_invoices,
+                s.int_pending_invoices,
+                s.int_total_quotations,
+                COALESCE(d.dbl_earnings, 0) as today_earnings,
+                COALESCE(d.int_invoices, 0) as today_invoices
+            FROM tbl_dashboard_summary s
+            LEFT JOIN tbl_dashboard_daily d
+                ON d.fk_bint_user_id = s.fk_bint_user_id
+                AND d.dat_day = CURRENT_DATE
+            WHERE s.fk_bint_user_id = $1
+        """
+
         async with self.pool.acquire() as conn:
-            # Get invoice summary - total collected (all time)
-            strQuery = """
-                SELECT
-                    COALESCE(SUM(dbl_total_amount), 0) as total_collected,
-                    COUNT(*) as total_invoices,
-                    COUNT(CASE WHEN vchr_payment_status = 'paid' THEN 1 END) as paid_invoices,
-                    COUNT(CASE WHEN vchr_payment_status != 'paid' THEN 1 END) as pending_invoices
-                FROM tbl_invoice
-                WHERE fk_bint_user_id = $1
-            """
-
-            invoiceRow = await conn.fetchrow(strQuery, self.intUserId)
-
-            # Get today's earnings
-            strTodayQuery = """
-                SELECT
-                    COALESCE(SUM(dbl_total_amount), 0) as today_earnings,
-                    COUNT(*) as today_invoices
-                FROM tbl_invoice
-                WHERE fk_bint_user_id = $1
-                AND DATE(dat_invoice_date) = CURRENT_DATE
-            """
-
-            todayRow = await conn.fetchrow(strTodayQuery, self.intUserId)
-
-            # Get quotation count
-            strQuotationQuery = """
-                SELECT COUNT(*) as total_quotations
-                FROM tbl_quotation
-                WHERE fk_bint_user_id = $1
-            """
-
-            quotationRow = await conn.fetchrow(strQuotationQuery, self.intUserId)
-
-            summary = MdlDashboardSummary(
-                dblTotalCollected=float(invoiceRow['total_collected']) if invoiceRow else 0.0,
-                dblTodayEarnings=float(todayRow['today_earnings']) if todayRow else 0.0,
-                intTotalInvoices=int(invoiceRow['total_invoices']) if invoiceRow else 0,
-                intPaidInvoices=int(invoiceRow['paid_invoices']) if invoiceRow else 0,
-                intPendingInvoices=int(invoiceRow['pending_invoices']) if invoiceRow else 0,
-                intTotalQuotations=int(quotationRow['total_quotations']) if quotationRow else 0,
-                intTodayInvoices=int(todayRow['today_invoices']) if todayRow else 0
+            summaryRow = await conn.fetchrow(strQuery, self.intUserId)
+
+            if not summaryRow:
+                # No rollup yet for this tenant - build it once from source tables
+                self.logger.info("Dashboard rollup missing, rebuilding from source")
+                await fnReconcileDashboard(conn, self.intUserId)
+                summaryRow = await conn.fetchrow(strQuery, self.intUserId)
+
+        summary = MdlDashboardSummary(
+            dblTotalCollected=float(summaryRow['dbl_total_collected']),
+            dblTodayEarnings=float(summaryRow['today_earnings']),
+            intTotalInvoices=int(summaryRow['int_total_invoices']),
+            intPaidInvoices=int(summaryRow['int_paid_invoices']),
+            intPendingInvoices=int(summaryRow['int_pending_invoices']),
+            intTotalQuotations=int(summaryRow['int_total_quotations']),
+            intTodayInvoices=int(summaryRow['today_invoices'])
+        )
+
+        return MdlDashboardResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage="Dashboard summary fetched successfully",
+            data=summary
+        )
+
+    async def fnGetTimeseries(self, mdlRequest: MdlTimeseriesRequest) -> MdlTimeseriesResponse:
+        """Revenue / invoice / conversion timeseries from the daily rollup buckets"""
+
+        strGranularity = (mdlRequest.strGranularity or "day").lower()
+        datToDate = mdlRequest.datToDate or datetime.date.today()
+        datFromDate = mdlRequest.datFromDate or (datToDate - datetime.timedelta(days=DEFAULT_TIMESERIES_DAYS - 1))
+
+        if strGranularity not in LST_GRANULARITIES:
+            return MdlTimeseriesResponse(
+                intStatus=ResponseStatus.ERROR,
+                strStatus=ResponseStatus.ERROR_STR,
+                intStatusCode=ResponseStatus.HTTP_BAD_REQUEST,
+                strMessage=f"strGranularity must be one of: {', '.join(LST_GRANULARITIES)}"
             )
 
-            return MdlDashboardResponse(
-                intStatus=ResponseStatus.SUCCESS,
-                strStatus=ResponseStatus.SUCCESS_STR,
-                intStatusCode=ResponseStatus.HTTP_OK,
-                strMessage="Dashboard summary fetched successfully",
-                data=summary
+        if datFromDate > datToDate or (datToDate - datFromDate).days >= MAX_TIMESERIES_DAYS:
+            return MdlTimeseriesResponse(
+                intStatus=ResponseStatus.ERROR,
+                strStatus=ResponseStatus.ERROR_STR,
+                intStatusCode=ResponseStatus.HTTP_BAD_REQUEST,
+                strMessage=f"Invalid date range (max {MAX_TIMESERIES_DAYS} days)"
+            )
+
+        tupCacheKey = (self.intUserId, fnGetRollupVersion(self.intUserId), datFromDate, datToDate, strGranularity)
+        mdlCached = insTimeseriesCache.fnGet(tupCacheKey)
+        if mdlCached is not None:
+            return mdlCached
+
+        strQuery = """
+            SELECT
+                date_trunc($4, dat_day)::date as period_start,
+                SUM(dbl_earnings) as revenue,
+                SUM(int_invoices) as invoices,
+                SUM(int_quotations) as quotations,
+                SUM(int_converted_invoices) as converted
+            FROM tbl_dashboard_daily
+            WHERE fk_bint_user_id = $1
+            AND dat_day BETWEEN $2 AND $3
+            GROUP BY 1
+        """
+        async with self.pool.acquire() as conn:
+            blnHasRollup = await conn.fetchval(
+                "SELECT 1 FROM tbl_dashboard_summary WHERE fk_bint_user_id = $1", self.intUserId
             )
+            if not blnHasRollup:
+                self.logger.info("Dashboard rollup missing, rebuilding from source")
+                await fnReconcileDashboard(conn, self.intUserId)
+
+            lstRows = await conn.fetch(strQuery, self.intUserId, datFromDate, datToDate, strGranularity)
+
+        dctRows = {row['period_start']: row for row in lstRows}
+
+        # Zero-fill empty periods so charts get a continuous axis
+        lstPoints = []
+        datPeriod = fnPeriodStart(datFromDate, strGranularity)
+        while datPeriod <= datToDate:
+            row = dctRows.get(datPeriod)
+            intQuotations = int(row['quotations']) if row else 0
+            intConverted = int(row['converted']) if row else 0
+            lstPoints.append(MdlTimeseriesPoint(
+                datPeriodStart=datPeriod,
+                dblRevenue=float(row['revenue']) if row else 0.0,
+                intInvoices=int(row['invoices']) if row else 0,
+                intQuotations=intQuotations,
+                intConvertedInvoices=intConverted,
+                dblConversionRate=fnConversionRate(intConverted, intQuotations)
+            ))
+            datPeriod = fnNextPeriod(datPeriod, strGranularity)
+
+        intTotalQuotations = sum(mdlPoint.intQuotations for mdlPoint in lstPoints)
+        intTotalConverted = sum(mdlPoint.intConvertedInvoices for mdlPoint in lstPoints)
+
+        mdlResponse = MdlTimeseriesResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage=f"Timeseries with {len(lstPoints)} {strGranularity} periods",
+            strGranularity=strGranularity,
+            datFromDate=datFromDate,
+            datToDate=datToDate,
+            lstPoints=lstPoints,
+            dblTotalRevenue=sum(mdlPoint.dblRevenue for mdlPoint in lstPoints),
+            intTotalInvoices=sum(mdlPoint.intInvoices for mdlPoint in lstPoints),
+            intTotalQuotations=intTotalQuotations,
+            intTotalConvertedInvoices=intTotalConverted,
+            dblConversionRate=fnConversionRate(intTotalConverted, intTotalQuotations)
+        )
+        insTimeseriesCache.fnSet(tupCacheKey, mdlResponse)
+        return mdlResponse
+
+    async def fnReconcileAll(self) -> MdlReconcileResponse:
+        """Rebuild dashboard rollup for all tenants from source tables (Admin only)"""
+        self.logger.info("Reconciling dashboard rollup for all tenants")
+        intTenants = await fnReconcileAllDashboards(self.pool)
+
+        return MdlReconcileResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage=f"Dashboard rebuilt for {intTenants} tenants",
+            intTenantsRebuilt=intTenants
+        )
@@ -0,0 +1,136 @@
+"""
+Inventory Catalog Cache - Per-tenant in-process copy of tbl_inventory
+
+The catalog is read by the inventory list, the AI quotation prompt and
+quoting bursts far more often than it is written, so each tenant's rows
+are kept in a bounded LRU with a TTL (app/core/cache.py).
+
+Write paths in ClsInventoryService keep it in step (write-through):
+    add / update -> fnPatchInventoryItem (replace the row in the cached copy)
+    delete       -> fnRemoveInventoryItem
+
+Every write also bumps the tenant's catalog version. A load that started
+before a write is not stored, so a slow read can never put back stale rows.
+
+NOTE: Cache is per worker process. A write on another worker is picked up
+when the TTL expires.
+
+Usage:
+    from app.api.inventory.cache import fnGetInventoryCatalog
+
+    lstRows = await fnGetInventoryCatalog(pool, intUserId)   # tuple of dicts, ordered by item name
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache import ClsTTLCache
+
+
+INT_MAX_TENANTS = 1024
+FLT_TTL_SECONDS = 300
+
+STR_CATALOG_QUERY = """
+    SELECT
+        pk_bint_inventory_id,
+        vchr_item_code,
+        vchr_item_name,
+        vchr_category,
+        vchr_unit,
+        dbl_unit_price,
+        int_stock_qty
+    FROM tbl_inventory
+    WHERE fk_bint_user_id = $1
+    ORDER BY vchr_item_name, pk_bint_inventory_id
+"""
+
+LST_CATALOG_COLUMNS = [
+    "pk_bint_inventory_id",
+    "vchr_item_code",
+    "vchr_item_name",
+    "vchr_category",
+    "vchr_unit",
+    "dbl_unit_price",
+    "int_stock_qty"
+]
+
+insInventoryCache = ClsTTLCache(intMaxSize=INT_MAX_TENANTS, fltTtlSeconds=FLT_TTL_SECONDS)
+
+# Per-tenant catalog version, bumped on every write in this process
+_dctInventoryVersion: Dict[int, int] = {}
+
+
+def fnGetInventoryVersion(intUserId: int) -> int:
+    return _dctInventoryVersion.get(intUserId, 0)
+
+
+def fnBumpInventoryVersion(intUserId: int) -> None:
+    _dctInventoryVersion[intUserId] = _dctInventoryVersion.get(intUserId, 0) + 1
+
+
+def fnSortKey(dctRow: Dict[str, Any]) -> Tuple:
+    return (dctRow['vchr_item_name'], dctRow['pk_bint_inventory_id'])
+
+
+async def fnGetInventoryCatalog(pool, intUserId: int) -> Tuple[Dict[str, Any], ...]:
+    """Tenant's inventory rows (read-only), loaded from DB only on a miss"""
+    tupCatalog = insInventoryCache.fnGet(intUserId)
+    if tupCatalog is not None:
+        return tupCatalog
+
+    intVersion = fnGetInventoryVersion(intUserId)
+    async with pool.acquire() as conn:
+        lstRows = await conn.fetch(STR_CATALOG_QUERY, intUserId)
+
+    tupCatalog = tuple(dict(row) for row in lstRows)
+
+    # Skip the store if a write happened while we were loading
+    if fnGetInventoryVersion(intUserId) == intVersion:
+        insInventoryCache.fnSet(intUserId, tupCatalog)
+    return tupCatalog
+
+
+async def fnGetInventoryItem(pool, intUserId: int, intInventoryId: int) -> Optional[Dict[str, Any]]:
+    """Single catalog row by ID (memory lookup once the catalog is cached)"""
+    for dctRow in await fnGetInventoryCatalog(pool, intUserId):
+        if dctRow['pk_bint_inventory_id'] == intInventoryId:
+            return dctRow
+    return None
+
+
+def fnPatchInventoryItem(intUserId: int, rowItem) -> None:
+    """Insert or replace one row in the cached catalog (after add / update)"""
+    fnBumpInventoryVersion(intUserId)
+
+    tupCatalog = insInventoryCache.fnGet(intUserId)
+    if tupCatalog is None:
+        return
+
+    dctItem = {strColumn: rowItem[strColumn] for strColumn in LST_CATALOG_COLUMNS}
+    lstRows = [dctRow for dctRow in tupCatalog if dctRow['pk_bint_inventory_id'] != dctItem['pk_bint_inventory_id']]
+    lstRows.append(dctItem)
+    lstRows.sort(key=fnSortKey)
+    insInventoryCache.fnSet(intUserId, tuple(lstRows))
+
+
+def fnRemoveInventoryItem(intUserId: int, intInventoryId: int) -> None:
+    """Drop one row from the cached catalog (after delete)"""
+    fnBumpInventoryVersion(intUserId)
+
+    tupCatalog = insInventoryCache.fnGet(intUserId)
+    if tupCatalog is None:
+        return
+
+    insInventoryCache.fnSet(
+        intUserId,
+        tuple(dctRow for dctRow in tupCatalog if dctRow['pk_bint_inventory_id'] != intInventoryId)
+    )
+
+
+def fnInvalidateInventory(intUserId: int) -> None:
+    """Forget the tenant's catalog; next read reloads from DB"""
+    fnBumpInventoryVersion(intUserId)
+    insInventoryCache.fnDelete(intUserId)
+
+
+def fnGetInventoryCacheStats() -> Dict[str, Any]:
+    return insInventoryCache.fnGetStats()
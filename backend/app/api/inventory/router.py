@@ -8,12 +8,14 @@ from app.api.inventory.schema import (
     MdlInventoryListResponse,
     MdlInventoryResponse,
     MdlDeleteInventoryRequest,
-    MdlDeleteInventoryResponse
+    MdlDeleteInventoryResponse,
+    MdlInventoryCacheStatsResponse
 )
+from app.api.inventory.cache import fnGetInventoryCacheStats
 from app.api.inventory.service import ClsInventoryService
 from app.core.database import ClsDatabasepool
 from app.core.baseSchema import ResponseStatus
-from app.core.security import fnGetCurrentUser
+from app.core.security import fnGetCurrentUser, fnGetAdminUser
 from app.core.logger import getUserLogger
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
@@ -152,3 +154,31 @@ async def fnDeleteInventory(
             strMessage=f"Unexpected error: {str(e)}",
             intDeletedId=None
         )
+
+
+# Cache stats - Catalog cache hit/miss counters (Admin only)
+@router.post("/cache-stats", response_model=MdlInventoryCacheStatsResponse)
+async def fnGetInventoryCacheStatsRoute(intUserId: Annotated[int, Depends(fnGetAdminUser)]):
+    logger = getUserLogger(intUserId)
+    try:
+        dctStats = fnGetInventoryCacheStats()
+        return MdlInventoryCacheStatsResponse(
+            intStatus=ResponseStatus.SUCCESS,
+            strStatus=ResponseStatus.SUCCESS_STR,
+            intStatusCode=ResponseStatus.HTTP_OK,
+            strMessage="Inventory cache stats (this worker)",
+            intSize=dctStats["size"],
+            intMaxSize=dctStats["max_size"],
+            intHits=dctStats["hits"],
+            intMisses=dctStats["misses"],
+            intEvictions=dctStats["evictions"],
+            dblHitRatio=dctStats["hit_ratio"]
+        )
+    except Exception as e:
+        logger.error(f"Error in inventory cache stats: {str(e)}", exc_info=True)
+        return MdlInventoryCacheStatsResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_INTERNAL_ERROR,
+            strMessage=f"Unexpected error: {str(e)}"
+        )
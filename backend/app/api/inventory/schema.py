@@ -56,3 +56,13 @@ class MdlInventoryListResponse(MdlBaseResponse):
 # Response for delete
 class MdlDeleteInventoryResponse(MdlBaseResponse):
     intDeletedId: Optional[int] = None
+
+
+# Response for catalog cache counters (this worker process)
+class MdlInventoryCacheStatsResponse(MdlBaseResponse):
+    intSize: int = 0
+    intMaxSize: int = 0
+    intHits: int = 0
+    intMisses: int = 0
+    intEvictions: int = 0
+    dblHitRatio: float = 0.0
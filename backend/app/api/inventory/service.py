@@ -6,6 +6,11 @@ from app.api.inventory.schema import (
     MdlInventoryItem,
     MdlDeleteInventoryResponse
 )
+from app.api.inventory.cache import (
+    fnGetInventoryCatalog,
+    fnPatchInventoryItem,
+    fnRemoveInventoryItem
+)
 from app.core.baseSchema import ResponseStatus
 from app.core.logger import getUserLogger
 
@@ -19,22 +24,7 @@ class ClsInventoryService:
     async def fnGetInventoryListService(self):
         """Inventory listing"""
 
-        strQuery = """
-                SELECT
-                    pk_bint_inventory_id,
-                    vchr_item_code,
-                    vchr_item_name,
-                    vchr_category,
-                    vchr_unit,
-                    dbl_unit_price,
-                    int_stock_qty
-                FROM
-                    tbl_inventory
-                WHERE
-                    fk_bint_user_id = $1
-                """
-        async with self.insPool.acquire() as conn:
-            lstInventoryItems = await conn.fetch(strQuery, self.intUserId)
+        lstInventoryItems = await fnGetInventoryCatalog(self.insPool, self.intUserId)
 
         # No data found
         if not lstInventoryItems:
@@ -119,6 +109,7 @@ class ClsInventoryService:
                 mdlCreateInventoryRequest.strDescription,
                 datetime.datetime.now()
             )
+        fnPatchInventoryItem(self.intUserId, rstItems)
 
         mdlInventoryItem = MdlInventoryItem(
             intPkInventoryId=rstItems['pk_bint_inventory_id'],
@@ -234,6 +225,7 @@ class ClsInventoryService:
         """
         async with self.insPool.acquire() as conn:
             rstItems = await conn.fetchrow(strQuery, *lstValues)
+        fnPatchInventoryItem(self.intUserId, rstItems)
 
         mdlInventoryItem = MdlInventoryItem(
             intPkInventoryId=rstItems['pk_bint_inventory_id'],
@@ -264,6 +256,8 @@ class ClsInventoryService:
         """
         async with self.insPool.acquire() as conn:
             rstDeleted = await conn.fetchrow(strQuery, intInventoryId, self.intUserId)
+        if rstDeleted:
+            fnRemoveInventoryItem(self.intUserId, intInventoryId)
 
         if not rstDeleted:
             return MdlDeleteInventoryResponse(
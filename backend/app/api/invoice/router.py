@@ -1,10 +1,11 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends
 import asyncpg
 
 from app.api.invoice.schema import (
     MdlCreateInvoiceRequest,
     MdlGetInvoiceRequest,
+    MdlInvoiceListRequest,
     MdlDeleteInvoiceRequest,
     MdlInvoiceResponse,
     MdlInvoiceListResponse,
@@ -20,15 +21,27 @@ router = APIRouter(prefix="/invoice", tags=["Invoice"])
 
 
 @router.post("/list", response_model=MdlInvoiceListResponse)
-async def fnGetInvoiceList(intUserId: Annotated[int, Depends(fnGetCurrentUser)]):
-    """Get all invoices"""
+async def fnGetInvoiceList(
+    intUserId: Annotated[int, Depends(fnGetCurrentUser)],
+    mdlRequest: Optional[MdlInvoiceListRequest] = None
+):
+    """Get one keyset page of invoices (no body = first page)"""
     logger = getUserLogger(intUserId)
     try:
         insPool = ClsDatabasepool()
         pool = await insPool.fnGetPool()
 
         insService = ClsInvoiceService(pool, intUserId)
-        return await insService.fnGetAllInvoiceList()
+        return await insService.fnGetInvoicePage(mdlRequest or MdlInvoiceListRequest())
+    except ValueError as e:
+        logger.warning(f"Bad invoice list request: {str(e)}")
+        return MdlInvoiceListResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_BAD_REQUEST,
+            strMessage=str(e),
+            lstInvoice=[]
+        )
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in invoice list: {str(e)}")
         return MdlInvoiceListResponse(
@@ -56,6 +56,21 @@ class MdlCreateInvoiceRequest(MdlBaseRequest):
     lstItems: List[MdlInvoiceItemRequest]
 
 
+class MdlInvoiceListRequest(MdlBaseRequest):
+    """
+    Paginated + filtered invoice list (optional body for /invoice/list)
+
+    No body -> first page with the default page size.
+    Next page -> send strNextCursor of previous page as strCursor.
+    """
+    intPageSize: Optional[int] = None          # Default 50, max 200
+    strCursor: Optional[str] = None            # NULL = first page
+    strPaymentStatus: Optional[str] = None     # paid, pending
+    datFromDate: Optional[date] = None         # Invoice date from (inclusive)
+    datToDate: Optional[date] = None           # Invoice date to (inclusive)
+    strCustomer: Optional[str] = None          # Matches customer name or phone
+
+
 class MdlGetInvoiceRequest(MdlBaseRequest):
     """Get single invoice"""
     intInvoiceId: int
@@ -113,6 +128,8 @@ class MdlInvoiceResponse(MdlBaseResponse):
 class MdlInvoiceListResponse(MdlBaseResponse):
     """Response with invoice list"""
     lstInvoice: List[MdlInvoiceListItem] = []
+    strNextCursor: Optional[str] = None        # Paginated mode: cursor for next page
+    blnHasMore: bool = False                   # Paginated mode: more pages available
 
 
 class MdlDeleteInvoiceResponse(MdlBaseResponse):
@@ -3,8 +3,14 @@ from asyncpg import Pool
 
 from app.core.baseSchema import ResponseStatus
 from app.core.logger import getUserLogger
+from app.core.lineItemWriter import fnInsertLineItems
+from app.core.documentNumber import fnNextDocumentNumber, PREFIX_INVOICE
+from app.core.documentLoader import fnLoadInvoice
+from app.core.pagination import fnClampPageSize, fnEncodeCursor, fnBuildPageFilter
+from app.api.dashboard.rollup import fnApplyInvoiceCreated, fnApplyInvoiceDeleted, fnBumpRollupVersion
 from app.api.invoice.schema import (
     MdlCreateInvoiceRequest,
+    MdlInvoiceListRequest,
     MdlInvoiceResponse,
     MdlInvoiceListResponse,
     MdlDeleteInvoiceResponse,
@@ -20,27 +26,30 @@ class ClsInvoiceService:
         self.intUserId = intUserId
         self.logger = getUserLogger(intUserId)
 
-    async def fnGenerateInvoiceNumber(self):
-        """Generate unique invoice number: INV-YYYY-NNNN"""
-        strYear = str(datetime.date.today().year)
+    async def fnGenerateInvoiceNumber(self, conn):
+        """Generate unique invoice number: INV-YYYY-NNNN (call inside the insert transaction)"""
+        return await fnNextDocumentNumber(conn, self.intUserId, PREFIX_INVOICE)
+    
+    async def fnGetInvoicePage(self, mdlRequest: MdlInvoiceListRequest):
+        """Get one keyset page of invoices with optional filters"""
 
-        strQuery = """
-            SELECT MAX(CAST(SUBSTRING(vchr_invoice_number FROM 10) AS INTEGER)) as max_num
-            FROM tbl_invoice
-            WHERE fk_bint_user_id = $1
-            AND vchr_invoice_number LIKE $2
-        """
-        async with self.insPool.acquire() as conn:
-            rstMax = await conn.fetchrow(strQuery, self.intUserId, f"INV-{strYear}-%")
-            intNextNum = (rstMax['max_num'] or 0) + 1
+        intPageSize = fnClampPageSize(mdlRequest.intPageSize)
+        strWhere, lstValues = fnBuildPageFilter(
+            self.intUserId,
+            "pk_bint_invoice_id",
+            mdlRequest.strCursor,
+            intPageSize,
+            strStatusColumn="vchr_payment_status",
+            strStatus=mdlRequest.strPaymentStatus,
+            strDateColumn="dat_invoice_date",
+            datFromDate=mdlRequest.datFromDate,
+            datToDate=mdlRequest.datToDate,
+            strCustomer=mdlRequest.strCustomer
+        )
 
-        return f"INV-{strYear}-{str(intNextNum).zfill(4)}"
-    
-    async def fnGetAllInvoiceList(self):
-        """Get all invoices for user"""
-        
-        strQuery = """
-            SELECT 
+        # Page is cut first (index scan on user + created_at), items counted only for that page
+        strQuery = f"""
+            SELECT
                 i.pk_bint_invoice_id,
                 i.fk_bint_quotation_id,
                 q.vchr_quotation_number,
@@ -50,15 +59,28 @@ class ClsInvoiceService:
                 i.vchr_customer_phone,
                 i.dbl_total_amount,
                 i.vchr_payment_status,
-                (SELECT COUNT(*) FROM tbl_invoice_item WHERE fk_bint_invoice_id = i.pk_bint_invoice_id) as item_count
-            FROM tbl_invoice i
+                i.tim_created_at,
+                ic.item_count
+            FROM (
+                SELECT *
+                FROM tbl_invoice
+                WHERE {strWhere}
+                ORDER BY tim_created_at DESC, pk_bint_invoice_id DESC
+                LIMIT ${len(lstValues)}
+            ) i
             LEFT JOIN tbl_quotation q ON i.fk_bint_quotation_id = q.pk_bint_quotation_id
-            WHERE i.fk_bint_user_id = $1
-            ORDER BY i.tim_created_at DESC
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) as item_count
+                FROM tbl_invoice_item
+                WHERE fk_bint_invoice_id = i.pk_bint_invoice_id
+            ) ic
+            ORDER BY i.tim_created_at DESC, i.pk_bint_invoice_id DESC
         """
-        
         async with self.insPool.acquire() as conn:
-            rstInvoices = await conn.fetch(strQuery, self.intUserId)
+            rstInvoices = await conn.fetch(strQuery, *lstValues)
+
+        blnHasMore = len(rstInvoices) > intPageSize
+        rstInvoices = rstInvoices[:intPageSize]
 
         if not rstInvoices:
             return MdlInvoiceListResponse(
@@ -85,72 +107,39 @@ class ClsInvoiceService:
             )
             lstInvoices.append(mdlInvoice)
 
+        strNextCursor = None
+        if blnHasMore:
+            rowLast = rstInvoices[-1]
+            strNextCursor = fnEncodeCursor(rowLast['tim_created_at'], rowLast['pk_bint_invoice_id'])
+
         return MdlInvoiceListResponse(
             intStatus=ResponseStatus.SUCCESS,
             strStatus=ResponseStatus.SUCCESS_STR,
             intStatusCode=ResponseStatus.HTTP_OK,
             strMessage=f"Found {len(lstInvoices)} invoices",
-            lstInvoice=lstInvoices
+            lstInvoice=lstInvoices,
+            strNextCursor=strNextCursor,
+            blnHasMore=blnHasMore
         )
     
     async def fnGetSingleInvoiceDetails(self, intInvoiceId: int):
         """Get single invoice with all items"""
         
-        strInvoiceQuery = """
-            SELECT 
-                i.pk_bint_invoice_id,
-                i.fk_bint_quotation_id,
-                q.vchr_quotation_number,
-                i.vchr_invoice_number,
-                i.dat_invoice_date,
-                i.vchr_customer_name,
-                i.vchr_customer_phone,
-                i.txt_customer_address,
-                i.dbl_subtotal,
-                i.dbl_tax_percent,
-                i.dbl_tax_amount,
-                i.dbl_discount_amount,
-                i.dbl_total_amount,
-                i.txt_notes,
-                i.vchr_payment_status,
-                i.dat_due_date
-            FROM tbl_invoice i
-            LEFT JOIN tbl_quotation q ON i.fk_bint_quotation_id = q.pk_bint_quotation_id
-            WHERE i.pk_bint_invoice_id = $1 AND i.fk_bint_user_id = $2
-        """
-        
-        strItemsQuery = """
-            SELECT 
-                pk_bint_invoice_item_id,
-                fk_bint_inventory_id,
-                vchr_item_code,
-                vchr_item_name,
-                vchr_unit,
-                dbl_quantity,
-                dbl_unit_price,
-                dbl_total_price,
-                int_sort_order
-            FROM tbl_invoice_item
-            WHERE fk_bint_invoice_id = $1
-            ORDER BY int_sort_order
-        """
-        
         async with self.insPool.acquire() as conn:
-            rstInvoice = await conn.fetchrow(strInvoiceQuery, intInvoiceId, self.intUserId)
-            
-            if not rstInvoice:
-                return MdlInvoiceResponse(
-                    intStatus=ResponseStatus.NO_DATA,
-                    strStatus=ResponseStatus.NO_DATA_STR,
-                    intStatusCode=ResponseStatus.HTTP_NOT_FOUND,
-                    strMessage="Invoice not found",
-                    data=None
-                )
-            
-            rstItems = await conn.fetch(strItemsQuery, intInvoiceId)
+            # Header, quotation number and items in one round trip
+            dctInvoice = await fnLoadInvoice(conn, intInvoiceId, self.intUserId)
+
+        if not dctInvoice:
+            return MdlInvoiceResponse(
+                intStatus=ResponseStatus.NO_DATA,
+                strStatus=ResponseStatus.NO_DATA_STR,
+                intStatusCode=ResponseStatus.HTTP_NOT_FOUND,
+                strMessage="Invoice not found",
+                data=None
+            )
 
         lstItems = []
-        for row in rstItems:
+        for row in dctInvoice['lstItems']:
             mdlItem = MdlInvoiceItem(
                 intPkInvoiceItemId=row['pk_bint_invoice_item_id'],
                 intInventoryId=row['fk_bint_inventory_id'],
@@ -165,22 +154,22 @@ class ClsInvoiceService:
             lstItems.append(mdlItem)
 
         mdlInvoice = MdlInvoice(
-            intPkInvoiceId=rstInvoice['pk_bint_invoice_id'],
-            intQuotationId=rstInvoice['fk_bint_quotation_id'],
-            strQuotationNumber=rstInvoice['vchr_quotation_number'],
-            strInvoiceNumber=rstInvoice['vchr_invoice_number'],
-            datInvoiceDate=rstInvoice['dat_invoice_date'],
-            strCustomerName=rstInvoice['vchr_customer_name'],
-            strCustomerPhone=rstInvoice['vchr_customer_phone'],
-            strCustomerAddress=rstInvoice['txt_customer_address'],
-            dblSubtotal=float(rstInvoice['dbl_subtotal']),
-            dblTaxPercent=float(rstInvoice['dbl_tax_percent']),
-            dblTaxAmount=float(rstInvoice['dbl_tax_amount']),
-            dblDiscountAmount=float(rstInvoice['dbl_discount_amount']),
-            dblTotalAmount=float(rstInvoice['dbl_total_amount']),
-            strNotes=rstInvoice['txt_notes'],
-            strPaymentStatus=rstInvoice['vchr_payment_status'],
-            datDueDate=rstInvoice['dat_due_date'],
+            intPkInvoiceId=dctInvoice['pk_bint_invoice_id'],
+            intQuotationId=dctInvoice['fk_bint_quotation_id'],
+            strQuotationNumber=dctInvoice['vchr_quotation_number'],
+            strInvoiceNumber=dctInvoice['vchr_invoice_number'],
+            datInvoiceDate=dctInvoice['dat_invoice_date'],
+            strCustomerName=dctInvoice['vchr_customer_name'],
+            strCustomerPhone=dctInvoice['vchr_customer_phone'],
+            strCustomerAddress=dctInvoice['txt_customer_address'],
+            dblSubtotal=float(dctInvoice['dbl_subtotal']),
+            dblTaxPercent=float(dctInvoice['dbl_tax_percent']),
+            dblTaxAmount=float(dctInvoice['dbl_tax_amount']),
+            dblDiscountAmount=float(dctInvoice['dbl_discount_amount']),
+            dblTotalAmount=float(dctInvoice['dbl_total_amount']),
+            strNotes=dctInvoice['txt_notes'],
+            strPaymentStatus=dctInvoice['vchr_payment_status'],
+            datDueDate=dctInvoice['dat_due_date'],
             lstItems=lstItems
         )
 
@@ -215,16 +204,17 @@ class ClsInvoiceService:
                         data=None
                     )
 
-        strInvoiceNumber = await self.fnGenerateInvoiceNumber()
-        
         dblSubtotal = sum(item.dblQuantity * item.dblUnitPrice for item in mdlRequest.lstItems)
         dblTaxAmount = dblSubtotal * (mdlRequest.dblTaxPercent or 0) / 100
         dblTotalAmount = dblSubtotal + dblTaxAmount - (mdlRequest.dblDiscountAmount or 0)
         
         datInvoiceDate = mdlRequest.datInvoiceDate or datetime.date.today()
+        strPaymentStatus = mdlRequest.strPaymentStatus or "paid"
         
         async with self.insPool.acquire() as conn:
             async with conn.transaction():
+                strInvoiceNumber = await self.fnGenerateInvoiceNumber(conn)
+
                 strInsertInvoice = """
                     INSERT INTO tbl_invoice (
                         fk_bint_user_id,
@@ -261,7 +251,7 @@ class ClsInvoiceService:
                     mdlRequest.dblDiscountAmount or 0,
                     dblTotalAmount,
                     mdlRequest.strNotes,
-                    mdlRequest.strPaymentStatus or "paid",
+                    strPaymentStatus,
                     mdlRequest.datDueDate,
                     datetime.datetime.now()
                 )
@@ -269,33 +259,19 @@ class ClsInvoiceService:
                 intInvoiceId = rstInvoice['pk_bint_invoice_id']
                 self.logger.info(f"Invoice created: {strInvoiceNumber} | ID={intInvoiceId} | Amount={dblTotalAmount}")
 
-                strInsertItem = """
-                    INSERT INTO tbl_invoice_item (
-                        fk_bint_invoice_id,
-                        fk_bint_inventory_id,
-                        vchr_item_code,
-                        vchr_item_name,
-                        vchr_unit,
-                        dbl_quantity,
-                        dbl_unit_price,
-                        dbl_total_price,
-                        int_sort_order
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """
-                for intIndex, mdlItem in enumerate(mdlRequest.lstItems):
-                    dblItemTotal = mdlItem.dblQuantity * mdlItem.dblUnitPrice
-                    await conn.execute(
-                        strInsertItem,
-                        intInvoiceId,
-                        mdlItem.intInventoryId,
-                        mdlItem.strItemCode,
-                        mdlItem.strItemName,
-                        mdlItem.strUnit,
-                        mdlItem.dblQuantity,
-                        mdlItem.dblUnitPrice,
-                        dblItemTotal,
-                        mdlItem.intSortOrder or intIndex
-                    )
+                # All items in one round-trip
+                await fnInsertLineItems(conn, "tbl_invoice_item", intInvoiceId, mdlRequest.lstItems)
+
+                # Keep dashboard rollup in step (same transaction)
+                await fnApplyInvoiceCreated(
+                    conn,
+                    self.intUserId,
+                    datInvoiceDate,
+                    dblTotalAmount,
+                    strPaymentStatus,
+                    intQuotationId=mdlRequest.intQuotationId
+                )
+            fnBumpRollupVersion(self.intUserId)   # after commit
 
         return await self.fnGetSingleInvoiceDetails(intInvoiceId)
     
@@ -307,10 +283,23 @@ class ClsInvoiceService:
         strQuery = """
             DELETE FROM tbl_invoice
             WHERE pk_bint_invoice_id = $1 AND fk_bint_user_id = $2
-            RETURNING pk_bint_invoice_id
+            RETURNING pk_bint_invoice_id, fk_bint_quotation_id, dat_invoice_date, dbl_total_amount, vchr_payment_status
         """
         async with self.insPool.acquire() as conn:
-            rstDeleted = await conn.fetchrow(strQuery, intInvoiceId, self.intUserId)
+            async with conn.transaction():
+                rstDeleted = await conn.fetchrow(strQuery, intInvoiceId, self.intUserId)
+
+                if rstDeleted:
+                    await fnApplyInvoiceDeleted(
+                        conn,
+                        self.intUserId,
+                        rstDeleted['dat_invoice_date'],
+                        float(rstDeleted['dbl_total_amount'] or 0),
+                        rstDeleted['vchr_payment_status'],
+                        intQuotationId=rstDeleted['fk_bint_quotation_id']
+                    )
+            if rstDeleted:
+                fnBumpRollupVersion(self.intUserId)   # after commit
 
         if not rstDeleted:
             return MdlDeleteInvoiceResponse(
@@ -1,7 +1,14 @@
-from fastapi import APIRouter,HTTPException,status
+from fastapi import APIRouter,HTTPException,Request,status
 import asyncpg
 
-from app.api.login.schema import MdlLoginRequest,MdlLoginResponse
+from app.api.login.schema import (
+    MdlLoginRequest,
+    MdlLoginResponse,
+    MdlRefreshRequest,
+    MdlRefreshResponse,
+    MdlLogoutRequest,
+    MdlLogoutResponse
+)
 from app.api.login.service import ClsLoginService
 from app.core.database import ClsDatabasepool
 from app.core.logger import getLogger
@@ -12,14 +19,15 @@ router = APIRouter(prefix="/auth",tags=["Authentication"])
 
 
 @router.post("/login",response_model=MdlLoginResponse)
-async def fnLogin(mdlLoginRequest:MdlLoginRequest):
+async def fnLogin(mdlLoginRequest:MdlLoginRequest, request: Request):
     try:
         logger.info(f"Login attempt: {mdlLoginRequest.email}")
         insPool = ClsDatabasepool()
         pool = await insPool.fnGetPool()
 
         insLoginService = ClsLoginService(pool)
-        mdlLoginResponse = await insLoginService.fnLoginService(mdlLoginRequest)
+        strClientIp = request.client.host if request.client else None
+        mdlLoginResponse = await insLoginService.fnLoginService(mdlLoginRequest, strClientIp)
         logger.info(f"Login successful: {mdlLoginRequest.email}")
         return mdlLoginResponse
 
@@ -37,4 +45,56 @@ async def fnLogin(mdlLoginRequest:MdlLoginRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/refresh",response_model=MdlRefreshResponse)
+async def fnRefresh(mdlRefreshRequest:MdlRefreshRequest):
+    """Exchange a refresh token for a new access token (the refresh token is rotated)"""
+    try:
+        insPool = ClsDatabasepool()
+        pool = await insPool.fnGetPool()
+
+        insLoginService = ClsLoginService(pool)
+        return await insLoginService.fnRefreshService(mdlRefreshRequest)
+
+    except HTTPException as e:
+        logger.warning(f"Token refresh failed: {e.detail}")
+        raise
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error during token refresh: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Token refresh error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.post("/logout",response_model=MdlLogoutResponse)
+async def fnLogout(mdlLogoutRequest:MdlLogoutRequest):
+    """Revoke a refresh token (blnAllSessions=true: every session of that user)"""
+    try:
+        insPool = ClsDatabasepool()
+        pool = await insPool.fnGetPool()
+
+        insLoginService = ClsLoginService(pool)
+        mdlLogoutResponse = await insLoginService.fnLogoutService(mdlLogoutRequest)
+        logger.info(f"Logout: {mdlLogoutResponse.intRevokedSessions} session(s) revoked")
+        return mdlLogoutResponse
+
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error during logout: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Logout error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
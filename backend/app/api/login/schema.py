@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 class MdlLoginRequest(BaseModel):
@@ -8,4 +9,24 @@ class MdlLoginResponse(BaseModel):
     strAccessToken:str
     strTokentype:str ="bearer"
     dctUserInfo :dict
+    strRefreshToken: Optional[str] = None
+    intExpiresIn: Optional[int] = None     # access token lifetime (seconds)
+
+class MdlRefreshRequest(BaseModel):
+    strRefreshToken: str
+
+class MdlRefreshResponse(BaseModel):
+    strAccessToken: str
+    strTokentype: str = "bearer"
+    strRefreshToken: str
+    intExpiresIn: int
+
+class MdlLogoutRequest(BaseModel):
+    strRefreshToken: str
+    blnAllSessions: bool = False           # log out every device
+
+class MdlLogoutResponse(BaseModel):
+    strMessage: str
+    intRevokedSessions: int
+
      
\ No newline at end of file
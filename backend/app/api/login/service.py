@@ -1,18 +1,53 @@
+import os
+import math
 import asyncio
+from typing import Optional
 from fastapi  import HTTPException,status
 
-from app.api.login.schema import MdlLoginResponse
-from app.core.security import fnCreateAccesToken, fnVerifyPassword
+from app.api.login.schema import MdlLoginResponse, MdlRefreshResponse, MdlLogoutResponse
+from app.api.login.session import ClsSessionService
+from app.core.security import fnCreateAccesToken, JWT_ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.passwordHasher import ClsPasswordHasher, ClsPasswordHasherBusyError
+from app.core.rateLimiter import ClsSlidingWindowLimiter
 from app.core.logger import getUserLogger
 
+# Checked before any DB / bcrypt work, so a credential-stuffing flood costs a dict lookup per attempt.
+# Per IP: every attempt. Per email: every attempt, counted up front so concurrent guesses
+# cannot all pass the check before the first one fails; reset on success.
+insLoginIpLimiter = ClsSlidingWindowLimiter(
+    intLimit=int(os.getenv("LOGIN_IP_LIMIT", "20")),
+    fltWindowSeconds=float(os.getenv("LOGIN_IP_WINDOW_SECONDS", "60"))
+)
+insLoginFailureLimiter = ClsSlidingWindowLimiter(
+    intLimit=int(os.getenv("LOGIN_EMAIL_FAILURE_LIMIT", "5")),
+    fltWindowSeconds=float(os.getenv("LOGIN_EMAIL_FAILURE_WINDOW_SECONDS", "900"))
+)
+
+
+def fnTooManyAttempts(fltRetryAfter: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts. Please try again later.",
+        headers={"Retry-After": str(math.ceil(fltRetryAfter))}
+    )
+
 
 class ClsLoginService:
     def __init__(self,insPool) -> None:
         self.insPool = insPool
 
-    async def fnLoginService(self,mdlLoginRequest) :
+    async def fnLoginService(self,mdlLoginRequest, strClientIp: Optional[str] = None) :
             logger = getUserLogger(0)  # Use 0 for login (user not known yet)
 
+            # Rate limits first - over-limit attempts never reach the DB or bcrypt
+            strEmailKey = mdlLoginRequest.email.lower()
+            fltRetryAfter = insLoginIpLimiter.fnHit(strClientIp) if strClientIp else 0.0
+            if not fltRetryAfter:
+                fltRetryAfter = insLoginFailureLimiter.fnHit(strEmailKey)
+            if fltRetryAfter:
+                logger.warning(f"Login throttled: {mdlLoginRequest.email} from {strClientIp}")
+                raise fnTooManyAttempts(fltRetryAfter)
+
             # get user details using email
             strQuery = """ SELECT
                                 pk_bint_user_id,
@@ -41,13 +76,25 @@ class ClsLoginService:
                     detail="Invalid Email or password"
                 )
 
-            # Verify password using bcrypt
-            if not fnVerifyPassword(mdlLoginRequest.password, rstUser['vchr_password_hash']):
+            # Verify password using bcrypt (thread pool - keeps the event loop free)
+            try:
+                blnValid = await ClsPasswordHasher().fnVerify(mdlLoginRequest.password, rstUser['vchr_password_hash'])
+            except ClsPasswordHasherBusyError as e:
+                logger.warning(f"Login rejected, hasher busy: {mdlLoginRequest.email}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e),
+                    headers={"Retry-After": "2"}
+                )
+
+            if not blnValid:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid email or password"
                 )
 
+            insLoginFailureLimiter.fnReset(strEmailKey)
+
             ## Create JWT token
             strAccessToken = fnCreateAccesToken(
                 data={
@@ -63,9 +110,47 @@ class ClsLoginService:
                 "strBusinessName": rstUser['vchr_business_name']
             }
 
+            # Refresh token - later access tokens come from /auth/refresh (no bcrypt)
+            strRefreshToken = await ClsSessionService(self.insPool).fnCreateSession(rstUser['pk_bint_user_id'])
+
             # Return instance, not class!
             return MdlLoginResponse(
                 strAccessToken=strAccessToken,
                 strTokentype="bearer",
-                dctUserInfo=dctUserInfo
+                dctUserInfo=dctUserInfo,
+                strRefreshToken=strRefreshToken,
+                intExpiresIn=JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            )
+
+    async def fnRefreshService(self, mdlRefreshRequest) -> MdlRefreshResponse:
+        """New access token + rotated refresh token (one indexed statement, no bcrypt)"""
+        dctSession = await ClsSessionService(self.insPool).fnRotateSession(mdlRefreshRequest.strRefreshToken)
+        if not dctSession:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
             )
+
+        strAccessToken = fnCreateAccesToken(
+            data={
+                "user_id": dctSession['intUserId'],
+                "email": dctSession['strEmail']
+            }
+        )
+        return MdlRefreshResponse(
+            strAccessToken=strAccessToken,
+            strTokentype="bearer",
+            strRefreshToken=dctSession['strRefreshToken'],
+            intExpiresIn=JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+    async def fnLogoutService(self, mdlLogoutRequest) -> MdlLogoutResponse:
+        """Revoke the refresh token (or all sessions of its user)"""
+        intRevoked = await ClsSessionService(self.insPool).fnRevokeSession(
+            mdlLogoutRequest.strRefreshToken,
+            mdlLogoutRequest.blnAllSessions
+        )
+        return MdlLogoutResponse(
+            strMessage="Logged out" if intRevoked else "No active session for this token",
+            intRevokedSessions=intRevoked
+        )
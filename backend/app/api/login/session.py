@@ -0,0 +1,182 @@
+"""
+Refresh Token Sessions - Long-lived login without re-entering the password
+
+Login returns a short-lived JWT access token plus an opaque refresh token.
+Only the SHA-256 of the refresh token is stored (tbl_user_session), so a DB
+leak does not leak usable tokens, and the lookup is one unique-index probe -
+no bcrypt.
+
+/auth/refresh rotates: the presented token is revoked and a new one in the
+same family is issued, in ONE statement. Presenting a token that was already
+rotated (revoked) means two parties hold it, so the whole family is revoked
+and both have to log in again.
+
+Grace period: two tabs refreshing at once send the same token, and a client
+whose refresh response was lost retries with it. So a token rotated less
+than REFRESH_REUSE_GRACE_SECONDS ago, whose successor is still active, gets
+a new token in the same family instead of counting as reuse. Tokens revoked
+by logout have no successor and never qualify.
+
+Revocation (logout) applies to refresh tokens; access tokens already issued
+stay valid until they expire (JWT_ACCESS_TOKEN_EXPIRE_MINUTES).
+
+Config (.env, all optional):
+    REFRESH_TOKEN_EXPIRE_DAYS       (default 30, renewed on every refresh)
+    REFRESH_REUSE_GRACE_SECONDS     (default 30, 0 = no grace)
+
+Usage:
+    insSession = ClsSessionService(pool)
+    strRefreshToken = await insSession.fnCreateSession(intUserId)
+    dctUser = await insSession.fnRotateSession(strRefreshToken)   # None = invalid / expired / reused
+"""
+
+import os
+import uuid
+import hashlib
+import secrets
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+REFRESH_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "30"))
+INT_REFRESH_TOKEN_BYTES = 32
+
+
+def fnNewRefreshToken() -> Tuple[str, str]:
+    """(token for the client, hash for the DB)"""
+    strToken = secrets.token_urlsafe(INT_REFRESH_TOKEN_BYTES)
+    return strToken, fnHashRefreshToken(strToken)
+
+
+def fnHashRefreshToken(strToken: str) -> str:
+    # 256 random bits - a fast hash is enough (nothing to brute-force, unlike passwords)
+    return hashlib.sha256(strToken.encode("utf-8")).hexdigest()
+
+
+class ClsSessionService:
+    def __init__(self, insPool) -> None:
+        self.insPool = insPool
+
+    async def fnCreateSession(self, intUserId: int) -> str:
+        """New session family at login; also purges this user's expired sessions"""
+        strToken, strHash = fnNewRefreshToken()
+        strQuery = """
+            WITH purge AS (
+                DELETE FROM tbl_user_session
+                WHERE fk_bint_user_id = $1 AND tim_expires_at < CURRENT_TIMESTAMP
+            )
+            INSERT INTO tbl_user_session (fk_bint_user_id, vchr_token_hash, vchr_family_id, tim_expires_at)
+            VALUES ($1, $2, $3, CURRENT_TIMESTAMP + make_interval(days => $4))
+        """
+        async with self.insPool.acquire() as conn:
+            await conn.execute(strQuery, intUserId, strHash, uuid.uuid4().hex, REFRESH_TOKEN_EXPIRE_DAYS)
+        return strToken
+
+    async def fnRotateSession(self, strToken: str) -> Optional[Dict[str, Any]]:
+        """
+        Revoke the presented token and issue its successor.
+
+        Returns {intUserId, strEmail, strRefreshToken}, or None when the token
+        is unknown, expired or revoked (reuse -> family revoked). A token
+        rotated within the grace period gets a new token in its family.
+        """
+        strNewToken, strNewHash = fnNewRefreshToken()
+        strHash = fnHashRefreshToken(strToken)
+        strQuery = """
+            WITH old AS (
+                UPDATE tbl_user_session
+                SET tim_revoked_at = CURRENT_TIMESTAMP,
+                    vchr_replaced_by_hash = $2
+                WHERE vchr_token_hash = $1
+                  AND tim_revoked_at IS NULL
+                  AND tim_expires_at > CURRENT_TIMESTAMP
+                RETURNING fk_bint_user_id, vchr_family_id
+            ),
+            new AS (
+                INSERT INTO tbl_user_session (fk_bint_user_id, vchr_token_hash, vchr_family_id, tim_expires_at)
+                SELECT fk_bint_user_id, $2, vchr_family_id, CURRENT_TIMESTAMP + make_interval(days => $3)
+                FROM old
+                RETURNING fk_bint_user_id
+            )
+            SELECT u.pk_bint_user_id, u.vchr_email
+            FROM new n
+            JOIN tbl_user u ON u.pk_bint_user_id = n.fk_bint_user_id
+        """
+        # Grace: just rotated and its successor still active -> another token in
+        # the same family (the successor stays valid for the tab that holds it)
+        strGraceQuery = """
+            WITH prev AS (
+                SELECT p.fk_bint_user_id, p.vchr_family_id
+                FROM tbl_user_session p
+                JOIN tbl_user_session s ON s.vchr_token_hash = p.vchr_replaced_by_hash
+                WHERE p.vchr_token_hash = $1
+                  AND p.tim_revoked_at > CURRENT_TIMESTAMP - make_interval(secs => $4)
+                  AND s.tim_revoked_at IS NULL
+                  AND s.tim_expires_at > CURRENT_TIMESTAMP
+            ),
+            new AS (
+                INSERT INTO tbl_user_session (fk_bint_user_id, vchr_token_hash, vchr_family_id, tim_expires_at)
+                SELECT fk_bint_user_id, $2, vchr_family_id, CURRENT_TIMESTAMP + make_interval(days => $3)
+                FROM prev
+                RETURNING fk_bint_user_id
+            )
+            SELECT u.pk_bint_user_id, u.vchr_email
+            FROM new n
+            JOIN tbl_user u ON u.pk_bint_user_id = n.fk_bint_user_id
+        """
+        async with self.insPool.acquire() as conn:
+            rstUser = await conn.fetchrow(strQuery, strHash, strNewHash, REFRESH_TOKEN_EXPIRE_DAYS)
+            if not rstUser and REFRESH_REUSE_GRACE_SECONDS > 0:
+                rstUser = await conn.fetchrow(
+                    strGraceQuery, strHash, strNewHash, REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_REUSE_GRACE_SECONDS
+                )
+            if rstUser:
+                return {
+                    "intUserId": rstUser['pk_bint_user_id'],
+                    "strEmail": rstUser['vchr_email'],
+                    "strRefreshToken": strNewToken
+                }
+
+            # Failure path only: was it a rotated token being replayed?
+            strReuseQuery = """
+                UPDATE tbl_user_session
+                SET tim_revoked_at = CURRENT_TIMESTAMP
+                WHERE tim_revoked_at IS NULL
+                  AND vchr_family_id = (
+                      SELECT vchr_family_id FROM tbl_user_session
+                      WHERE vchr_token_hash = $1 AND tim_revoked_at IS NOT NULL
+                  )
+                RETURNING fk_bint_user_id
+            """
+            lstRevoked = await conn.fetch(strReuseQuery, strHash)
+            if lstRevoked:
+                logger.warning(
+                    f"Refresh token reuse detected - revoked session family of user {lstRevoked[0]['fk_bint_user_id']}"
+                )
+        return None
+
+    async def fnRevokeSession(self, strToken: str, blnAllSessions: bool = False) -> int:
+        """Logout: revoke this token (or every session of its user). Returns sessions revoked."""
+        strHash = fnHashRefreshToken(strToken)
+        if blnAllSessions:
+            strQuery = """
+                UPDATE tbl_user_session
+                SET tim_revoked_at = CURRENT_TIMESTAMP
+                WHERE tim_revoked_at IS NULL
+                  AND fk_bint_user_id = (
+                      SELECT fk_bint_user_id FROM tbl_user_session
+                      WHERE vchr_token_hash = $1 AND tim_revoked_at IS NULL AND tim_expires_at > CURRENT_TIMESTAMP
+                  )
+            """
+        else:
+            strQuery = """
+                UPDATE tbl_user_session
+                SET tim_revoked_at = CURRENT_TIMESTAMP
+                WHERE vchr_token_hash = $1 AND tim_revoked_at IS NULL
+            """
+        async with self.insPool.acquire() as conn:
+            strStatus = await conn.execute(strQuery, strHash)
+        return int(strStatus.split()[-1])
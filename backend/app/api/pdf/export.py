@@ -0,0 +1,239 @@
+"""
+PDF Bulk Export - All quotations / invoices in a date range as one ZIP
+
+POST /pdf/export loads the matching documents (two queries: headers, then
+all their items), renders them through the PDF render pool (disk cache
+first) and streams a ZIP to the client while the PDFs are still being
+produced. Entries are written in completion order.
+
+Renders go to the pool as bulk jobs: they share the pool's bulk slots
+with every other export and leave a worker free for /pdf/quotation and
+/pdf/invoice (see renderPool).
+
+Memory stays bounded: an export has at most PDF_RENDER_BULK_SLOTS documents
+in flight, and a document's slot is only released after its PDF has been
+written to the ZIP and the compressed bytes handed to the response. A slow client therefore
+pauses rendering instead of letting finished PDFs pile up. zipfile writes
+to a non-seekable buffer (data descriptors), which is drained after every
+entry.
+
+Documents that fail to render are listed in errors.txt at the end of the
+archive instead of aborting the download.
+
+Usage:
+    insExport = ClsPDFExportService(pool, intUserId)
+    lstDocuments = await insExport.fnFetchDocuments(mdlRequest)
+    return StreamingResponse(insExport.fnStreamZip(mdlRequest.strDocumentType, lstDocuments), ...)
+"""
+
+import re
+import shutil
+import asyncio
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from asyncpg import Pool
+
+from app.api.pdf.schema import MdlPDFExportRequest
+from app.api.pdf.pdfCache import ClsPDFFile, fnOpenPdf, fnPdfCacheKey, INT_STREAM_CHUNK_SIZE
+from app.api.pdf.renderPool import ClsPDFRenderPool, PDF_KIND_QUOTATION, PDF_KIND_INVOICE
+from app.core.documentLoader import fnRenderDate, fnRenderItem
+from app.core.logger import getUserLogger
+
+INT_MAX_EXPORT_DOCUMENTS = 500
+INT_ZIP_COMPRESS_LEVEL = 6
+
+# Per kind: header table, item table, number / date / status columns, file prefix
+DCT_EXPORT_SOURCES = {
+    PDF_KIND_QUOTATION: {
+        "table": "tbl_quotation",
+        "pk": "pk_bint_quotation_id",
+        "item_table": "tbl_quotation_item",
+        "item_fk": "fk_bint_quotation_id",
+        "number": "vchr_quotation_number",
+        "date": "dat_quotation_date",
+        "status": "vchr_status",
+        "prefix": "Quotation"
+    },
+    PDF_KIND_INVOICE: {
+        "table": "tbl_invoice",
+        "pk": "pk_bint_invoice_id",
+        "item_table": "tbl_invoice_item",
+        "item_fk": "fk_bint_invoice_id",
+        "number": "vchr_invoice_number",
+        "date": "dat_invoice_date",
+        "status": "vchr_payment_status",
+        "prefix": "Invoice"
+    }
+}
+
+
+class ClsZipStreamBuffer:
+    """Write-only, non-seekable sink for zipfile; drained after every entry"""
+
+    def __init__(self) -> None:
+        self.lstChunks: List[bytes] = []
+
+    def write(self, bytData) -> int:
+        self.lstChunks.append(bytes(bytData))
+        return len(bytData)
+
+    def flush(self) -> None:
+        pass
+
+    def fnDrain(self) -> bytes:
+        bytData = b"".join(self.lstChunks)
+        self.lstChunks = []
+        return bytData
+
+
+def fnEntryName(strPrefix: str, strNumber: Optional[str], intId: int) -> str:
+    strSafe = re.sub(r"[^A-Za-z0-9._-]+", "_", strNumber or "") or str(intId)
+    return f"{strPrefix}_{strSafe}.pdf"
+
+
+def fnCopyToZip(insZip: zipfile.ZipFile, insInfo: zipfile.ZipInfo, insPdf: ClsPDFFile) -> None:
+    """Compress one PDF into the archive straight from its file, chunk by chunk"""
+    with insZip.open(insInfo, mode="w") as fileEntry:
+        shutil.copyfileobj(insPdf.fileIn, fileEntry, INT_STREAM_CHUNK_SIZE)
+
+
+class ClsPDFExportService:
+    def __init__(self, insPool: Pool, intUserId: int):
+        self.insPool = insPool
+        self.intUserId = intUserId
+        self.logger = getUserLogger(intUserId)
+
+    async def fnFetchDocuments(self, mdlRequest: MdlPDFExportRequest) -> List[Dict[str, Any]]:
+        """
+        Matching documents with their render arguments (same shape as the
+        single-document endpoints, so both share the PDF cache)
+        """
+        dctSource = DCT_EXPORT_SOURCES[mdlRequest.strDocumentType]
+        blnInvoice = mdlRequest.strDocumentType == PDF_KIND_INVOICE
+        blnIncludeInfoPage = mdlRequest.blnIncludeInfoPage if mdlRequest.blnIncludeInfoPage is not None else not blnInvoice
+
+        lstConditions = ["fk_bint_user_id = $1", f"{dctSource['date']} >= $2", f"{dctSource['date']} <= $3"]
+        lstValues = [self.intUserId, mdlRequest.datFromDate, mdlRequest.datToDate]
+        if mdlRequest.strStatus:
+            lstConditions.append(f"{dctSource['status']} = $4")
+            lstValues.append(mdlRequest.strStatus)
+
+        async with self.insPool.acquire() as conn:
+            lstRows = await conn.fetch(f"""
+                SELECT
+                    {dctSource['pk']} AS pk_id,
+                    {dctSource['number']} AS vchr_number,
+                    {dctSource['date']} AS dat_document,
+                    {'dat_due_date' if blnInvoice else 'NULL::date'} AS dat_due_date,
+                    vchr_customer_name,
+                    vchr_customer_phone,
+                    txt_customer_address
+                FROM {dctSource['table']}
+                WHERE {' AND '.join(lstConditions)}
+                ORDER BY {dctSource['date']}, {dctSource['pk']}
+                LIMIT {INT_MAX_EXPORT_DOCUMENTS + 1}
+            """, *lstValues)
+
+            if len(lstRows) > INT_MAX_EXPORT_DOCUMENTS:
+                raise ValueError(f"More than {INT_MAX_EXPORT_DOCUMENTS} documents match - narrow the date range")
+            if not lstRows:
+                return []
+
+            lstItemRows = await conn.fetch(f"""
+                SELECT {dctSource['item_fk']} AS fk_id, vchr_item_name, dbl_quantity, dbl_unit_price
+                FROM {dctSource['item_table']}
+                WHERE {dctSource['item_fk']} = ANY($1::bigint[])
+                ORDER BY {dctSource['item_fk']}, int_sort_order
+            """, [row['pk_id'] for row in lstRows])
+
+        dctItems: Dict[int, List[Dict[str, Any]]] = {}
+        for row in lstItemRows:
+            dctItems.setdefault(row['fk_id'], []).append(
+                fnRenderItem(row['vchr_item_name'], row['dbl_quantity'], row['dbl_unit_price'])
+            )
+
+        lstDocuments = []
+        for row in lstRows:
+            strDate = fnRenderDate(row['dat_document'])
+            dctArgs = dict(
+                items=dctItems.get(row['pk_id'], []),
+                customer_name=row['vchr_customer_name'],
+                customer_phone=row['vchr_customer_phone'],
+                customer_address=row['txt_customer_address']
+            )
+            if blnInvoice:
+                dctArgs.update(
+                    invoice_date=strDate,
+                    invoice_number=row['vchr_number'],
+                    due_date=fnRenderDate(row['dat_due_date'])
+                )
+            else:
+                dctArgs.update(quotation_date=strDate, quotation_number=row['vchr_number'])
+            dctArgs['include_info_page'] = blnIncludeInfoPage
+
+            lstDocuments.append({
+                "intId": row['pk_id'],
+                "strEntryName": fnEntryName(dctSource['prefix'], row['vchr_number'], row['pk_id']),
+                "datDocument": row['dat_document'],
+                "dctArgs": dctArgs
+            })
+        return lstDocuments
+
+    async def fnStreamZip(self, strKind: str, lstDocuments: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        """Render in parallel and yield ZIP bytes as each entry is written"""
+        semSlots = asyncio.Semaphore(ClsPDFRenderPool().fnGetBulkSlots())
+
+        async def fnRenderDocument(dctDocument: Dict[str, Any]):
+            # The slot is released by the consumer once the entry is written
+            await semSlots.acquire()
+            try:
+                insPdf = await fnOpenPdf(
+                    strKind,
+                    dctDocument["dctArgs"],
+                    fnPdfCacheKey(strKind, dctDocument["dctArgs"]),
+                    blnBulk=True
+                )
+                return dctDocument, insPdf, None
+            except Exception as e:
+                return dctDocument, None, str(e)
+
+        lstTasks = [asyncio.create_task(fnRenderDocument(dctDocument)) for dctDocument in lstDocuments]
+        insBuffer = ClsZipStreamBuffer()
+        insZip = zipfile.ZipFile(insBuffer, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=INT_ZIP_COMPRESS_LEVEL)
+        lstErrors = []
+        try:
+            for futDone in asyncio.as_completed(lstTasks):
+                dctDocument, insPdf, strError = await futDone
+                try:
+                    if insPdf is None:
+                        lstErrors.append(f"{dctDocument['strEntryName']}: {strError}")
+                        continue
+
+                    datDocument = dctDocument["datDocument"]
+                    insInfo = zipfile.ZipInfo(
+                        dctDocument["strEntryName"],
+                        date_time=(datDocument.year, datDocument.month, datDocument.day, 0, 0, 0)
+                    )
+                    insInfo.compress_type = zipfile.ZIP_DEFLATED
+                    await asyncio.to_thread(fnCopyToZip, insZip, insInfo, insPdf)
+                    yield insBuffer.fnDrain()
+                finally:
+                    if insPdf is not None:
+                        insPdf.fnClose()
+                    semSlots.release()
+
+            if lstErrors:
+                self.logger.warning(f"PDF export: {len(lstErrors)} of {len(lstDocuments)} documents failed")
+                insZip.writestr("errors.txt", "\n".join(lstErrors) + "\n")
+            insZip.close()
+            yield insBuffer.fnDrain()
+            self.logger.info(f"PDF export streamed: {len(lstDocuments) - len(lstErrors)} {strKind} PDFs")
+        finally:
+            # Client went away (or an error) - stop rendering the rest
+            for taskRender in lstTasks:
+                if taskRender.done() and not taskRender.cancelled() and taskRender.exception() is None:
+                    insPdf = taskRender.result()[1]
+                    if insPdf is not None:
+                        insPdf.fnClose()
+                taskRender.cancel()
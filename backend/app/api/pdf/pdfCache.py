@@ -0,0 +1,295 @@
+"""
+PDF Disk Cache - Content-addressed cache for rendered PDFs
+
+A stored quotation / invoice is re-rendered on every download even though
+nothing changed. The cache key is a SHA-256 of the render inputs (document
+kind + every argument passed to the generator + STR_PDF_TEMPLATE_VERSION),
+so an edited document gets a new key automatically and no invalidation is
+needed. The same hash is the ETag: a client sending If-None-Match gets a 304
+without a render or a disk read.
+
+Files live in PDF_CACHE_DIR as <sha256>.pdf. The render worker writes a
+.tmp file in the same directory which is renamed into place (atomic), so
+several app workers can share the directory. PDFs are streamed to the
+client from disk in INT_STREAM_CHUNK_SIZE chunks with a Content-Length,
+cached or not, so the app process never holds a whole PDF in memory.
+Reads bump the file mtime; when the directory grows past PDF_CACHE_MAX_MB
+the least recently used files are deleted down to 90% of the limit.
+Commits are counted locally, but every app worker writes to the same
+directory, so the size is re-read from disk every INT_RESCAN_COMMITS commits
+or FLT_RESCAN_SECONDS. Then all workers' files count toward the limit.
+
+Bump STR_PDF_TEMPLATE_VERSION whenever the layout in service.py changes.
+
+Config (.env, all optional):
+    PDF_CACHE_DIR       (default <system temp>/quotely-pdf-cache)
+    PDF_CACHE_MAX_MB    (default 256; 0 disables the cache)
+
+Usage:
+    from app.api.pdf.pdfCache import fnOpenPdf, fnPdfCacheKey
+
+    strKey = fnPdfCacheKey(PDF_KIND_QUOTATION, dctArgs)
+    insPdf = await fnOpenPdf(PDF_KIND_QUOTATION, dctArgs, strKey)
+    return StreamingResponse(insPdf.fnIterChunks(), headers={"Content-Length": str(insPdf.intSize)})
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import tempfile
+import time
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional, Tuple
+
+from app.api.pdf.renderPool import ClsPDFRenderPool
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+STR_PDF_TEMPLATE_VERSION = "1"
+FLT_EVICT_TARGET = 0.9
+INT_STALE_TMP_SECONDS = 3600
+INT_STREAM_CHUNK_SIZE = 64 * 1024
+INT_RESCAN_COMMITS = 32
+FLT_RESCAN_SECONDS = 30.0
+
+
+def fnPdfCacheKey(strKind: str, dctArgs: Dict[str, Any]) -> str:
+    """SHA-256 of everything that affects the rendered bytes"""
+    strCanonical = json.dumps(
+        {"v": STR_PDF_TEMPLATE_VERSION, "kind": strKind, "args": dctArgs},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(strCanonical.encode("utf-8")).hexdigest()
+
+
+def fnETag(strKey: str) -> str:
+    return f'"{strKey}"'
+
+
+def fnETagMatches(strIfNoneMatch: Optional[str], strKey: str) -> bool:
+    """If-None-Match check (list of tags, weak W/ prefix or *)"""
+    if not strIfNoneMatch:
+        return False
+    for strTag in strIfNoneMatch.split(","):
+        strTag = strTag.strip()
+        if strTag == "*":
+            return True
+        if strTag.startswith("W/"):
+            strTag = strTag[2:]
+        if strTag.strip('"') == strKey:
+            return True
+    return False
+
+
+class ClsPDFDiskCache:
+    """Singleton size-bounded LRU cache of rendered PDFs on local disk"""
+
+    _instance: Optional['ClsPDFDiskCache'] = None
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.fnInit()
+        return cls._instance
+
+    def fnInit(self) -> None:
+        self.strDir = os.getenv("PDF_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "quotely-pdf-cache")
+        self.intMaxBytes = int(float(os.getenv("PDF_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        self.blnEnabled = self.intMaxBytes > 0
+        self.intHits = 0
+        self.intMisses = 0
+        self.intEvictions = 0
+        self._lock = asyncio.Lock()
+        self.intSizeBytes = 0
+        self.intCommitsSinceScan = 0
+        self.fltLastScan = time.monotonic()
+
+        if self.blnEnabled:
+            os.makedirs(self.strDir, exist_ok=True)
+            self.intSizeBytes = self._fnScanSize()
+
+    def _fnPath(self, strKey: str) -> str:
+        return os.path.join(self.strDir, f"{strKey}.pdf")
+
+    def _fnScanSize(self) -> int:
+        intSize = 0
+        for entry in os.scandir(self.strDir):
+            if entry.name.endswith(".pdf"):
+                try:
+                    intSize += entry.stat().st_size
+                except FileNotFoundError:
+                    pass  # evicted by another worker
+        return intSize
+
+    def fnTempPath(self) -> str:
+        """Fresh path for a render worker to write to (cache dir, so the commit is a rename)"""
+        strDir = self.strDir if self.blnEnabled else tempfile.gettempdir()
+        intFd, strTmpPath = tempfile.mkstemp(dir=strDir, prefix="render-", suffix=".tmp")
+        os.close(intFd)
+        return strTmpPath
+
+    def _fnOpen(self, strKey: str) -> Optional[BinaryIO]:
+        strPath = self._fnPath(strKey)
+        try:
+            fileIn = open(strPath, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(strPath)  # LRU: mtime = last use
+        except OSError:
+            pass
+        return fileIn
+
+    def _fnCommit(self, strTmpPath: str, strKey: str) -> Tuple[BinaryIO, bool]:
+        """Returns the open file and whether it added a new entry (False: replaced the same key)"""
+        strPath = self._fnPath(strKey)
+        blnNew = not os.path.exists(strPath)
+        os.replace(strTmpPath, strPath)
+        return open(strPath, "rb"), blnNew
+
+    def _fnRemove(self, strPath: str) -> bool:
+        try:
+            os.remove(strPath)
+            return True
+        except OSError:
+            return False  # already gone, or still open for a download (Windows)
+
+    def _fnEvict(self) -> None:
+        """Delete least recently used files until the directory is under the target size"""
+        lstEntries = []
+        fltStaleBefore = time.time() - INT_STALE_TMP_SECONDS
+        for entry in os.scandir(self.strDir):
+            try:
+                insStat = entry.stat()
+            except FileNotFoundError:
+                continue  # removed by another worker
+            if entry.name.endswith(".pdf"):
+                lstEntries.append((insStat.st_mtime, insStat.st_size, entry.path))
+            elif entry.name.endswith(".tmp") and insStat.st_mtime < fltStaleBefore:
+                self._fnRemove(entry.path)  # left behind by a crashed render
+
+        intSize = sum(tupEntry[1] for tupEntry in lstEntries)
+        intTarget = int(self.intMaxBytes * FLT_EVICT_TARGET)
+        for fltMtime, intFileSize, strPath in sorted(lstEntries):
+            if intSize <= intTarget:
+                break
+            if self._fnRemove(strPath):
+                self.intEvictions += 1
+            intSize -= intFileSize
+        self.intSizeBytes = intSize
+        self.intCommitsSinceScan = 0   # full scan - counts as a re-scan
+        self.fltLastScan = time.monotonic()
+
+    async def fnOpen(self, strKey: str) -> Optional[BinaryIO]:
+        """Open a cached PDF for reading, None on a miss"""
+        if not self.blnEnabled:
+            return None
+        fileIn = await asyncio.to_thread(self._fnOpen, strKey)
+        if fileIn is None:
+            self.intMisses += 1
+        else:
+            self.intHits += 1
+        return fileIn
+
+    async def fnCommit(self, strTmpPath: str, strKey: str, intSize: int) -> BinaryIO:
+        """Move a finished render into the cache and open it for reading"""
+        fileIn, blnNew = await asyncio.to_thread(self._fnCommit, strTmpPath, strKey)
+        if blnNew:
+            self.intSizeBytes += intSize
+        self.intCommitsSinceScan += 1
+
+        blnRescan = (
+            self.intCommitsSinceScan >= INT_RESCAN_COMMITS
+            or time.monotonic() - self.fltLastScan >= FLT_RESCAN_SECONDS
+        )
+        if blnRescan or self.intSizeBytes > self.intMaxBytes:
+            async with self._lock:
+                if blnRescan and self.intCommitsSinceScan:
+                    # Other app workers write here too - use the real directory size
+                    self.intSizeBytes = await asyncio.to_thread(self._fnScanSize)
+                    self.intCommitsSinceScan = 0
+                    self.fltLastScan = time.monotonic()
+                if self.intSizeBytes > self.intMaxBytes:
+                    await asyncio.to_thread(self._fnEvict)
+        return fileIn
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        intTotal = self.intHits + self.intMisses
+        return {
+            "enabled": self.blnEnabled,
+            "size_bytes": self.intSizeBytes,
+            "max_bytes": self.intMaxBytes,
+            "hits": self.intHits,
+            "misses": self.intMisses,
+            "evictions": self.intEvictions,
+            "hit_ratio": round(self.intHits / intTotal, 4) if intTotal else 0.0
+        }
+
+
+class ClsPDFFile:
+    """
+    An open rendered PDF: streamed in chunks, never read whole into memory.
+    Uncached renders are temp files, deleted once the file is closed.
+    """
+
+    def __init__(self, fileIn: BinaryIO, intSize: int, blnFromCache: bool, strDeletePath: Optional[str] = None):
+        self.fileIn = fileIn
+        self.intSize = intSize
+        self.blnFromCache = blnFromCache
+        self.strDeletePath = strDeletePath
+
+    def fnClose(self) -> None:
+        self.fileIn.close()
+        if self.strDeletePath:
+            try:
+                os.remove(self.strDeletePath)
+            except OSError:
+                pass
+            self.strDeletePath = None
+
+    async def fnIterChunks(self, intChunkSize: int = INT_STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Response body: INT_STREAM_CHUNK_SIZE reads off the event loop; closes when done or aborted"""
+        try:
+            while True:
+                bytChunk = await asyncio.to_thread(self.fileIn.read, intChunkSize)
+                if not bytChunk:
+                    break
+                yield bytChunk
+        finally:
+            self.fnClose()
+
+
+async def fnOpenPdf(
+    strKind: str,
+    dctArgs: Dict[str, Any],
+    strKey: Optional[str] = None,
+    blnBulk: bool = False
+) -> ClsPDFFile:
+    """
+    Cached PDF, or a fresh render written to disk by the render worker.
+
+    strKey=None means not cacheable: the render goes to a temp file that is
+    deleted when the returned file is closed.
+    """
+    insCache = ClsPDFDiskCache()
+    blnCacheable = strKey is not None and insCache.blnEnabled
+
+    if blnCacheable:
+        fileIn = await insCache.fnOpen(strKey)
+        if fileIn is not None:
+            return ClsPDFFile(fileIn, os.fstat(fileIn.fileno()).st_size, True)
+
+    strTmpPath = insCache.fnTempPath()
+    try:
+        intSize = await ClsPDFRenderPool().fnRender(strKind, dctArgs, strTmpPath, blnBulk=blnBulk)
+        if blnCacheable:
+            return ClsPDFFile(await insCache.fnCommit(strTmpPath, strKey, intSize), intSize, False)
+        return ClsPDFFile(open(strTmpPath, "rb"), intSize, False, strDeletePath=strTmpPath)
+    except BaseException:
+        if os.path.exists(strTmpPath):
+            os.remove(strTmpPath)
+        raise
@@ -0,0 +1,207 @@
+"""
+PDF Render Pool - Run ReportLab rendering in worker processes
+
+doc.build is pure CPU work; run inside an async handler it blocks the event
+loop, so one large PDF stalls every other request on that worker. Handlers
+build a picklable job (document kind + plain-dict arguments) and await
+ClsPDFRenderPool().fnRender(...), which runs it in a ProcessPoolExecutor
+started and stopped by main.lifespan. Each worker process creates its
+ClsPDFGenerator once (font registration) and reuses it for every job.
+
+At most PDF_RENDER_MAX_QUEUE interactive jobs (/pdf/quotation, /pdf/invoice)
+may be waiting or running per app worker; beyond that fnRender raises
+ClsPDFQueueFullError so the handler can answer 503 instead of piling up
+memory and latency.
+
+Bulk jobs (/pdf/export, blnBulk=True) are never rejected and never count
+toward that limit. Instead they share PDF_RENDER_BULK_SLOTS slots across
+all exports in the app worker (default workers - 1). So with 2+ workers at
+least one process is always free for interactive renders, however many
+exports are running.
+
+Config (.env, all optional):
+    PDF_RENDER_WORKERS      (default min(4, cpu count); 0 = render inline on the event loop)
+    PDF_RENDER_MAX_QUEUE    (default 4 x workers)
+    PDF_RENDER_BULK_SLOTS   (default max(1, workers - 1))
+
+The PDF is written by the worker to a file path chosen by the caller
+(pdfCache.fnOpenPdf), so only the path and size travel between processes.
+
+Usage:
+    from app.api.pdf.renderPool import ClsPDFRenderPool, PDF_KIND_QUOTATION
+
+    intSize = await ClsPDFRenderPool().fnRender(PDF_KIND_QUOTATION, dctArgs, strPath)
+"""
+
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+PDF_KIND_QUOTATION = "quotation"
+PDF_KIND_INVOICE = "invoice"
+
+# Per-process generator, created once by fnInitRenderWorker (or lazily inline)
+_insGenerator = None
+
+
+def fnInitRenderWorker() -> None:
+    """Process pool initializer - build the generator (fonts) once per worker"""
+    global _insGenerator
+    from app.api.pdf.service import ClsPDFGenerator
+    _insGenerator = ClsPDFGenerator()
+
+
+def fnRenderPdf(strKind: str, dctArgs: Dict[str, Any], strPath: str) -> int:
+    """
+    Render one PDF straight to strPath and return its size in bytes.
+
+    Module-level with plain arguments so it can be pickled into a worker
+    process. Only the path crosses the process boundary - the PDF bytes are
+    never pickled back to the app process.
+    """
+    if _insGenerator is None:
+        fnInitRenderWorker()
+
+    if strKind == PDF_KIND_QUOTATION:
+        _insGenerator.generate_quotation_pdf(**dctArgs, output_path=strPath)
+    elif strKind == PDF_KIND_INVOICE:
+        _insGenerator.generate_invoice_pdf(**dctArgs, output_path=strPath)
+    else:
+        raise ValueError(f"Unknown PDF kind: {strKind}")
+    return os.path.getsize(strPath)
+
+
+class ClsPDFQueueFullError(Exception):
+    """Too many PDFs waiting for a render worker"""
+
+
+class ClsPDFRenderPool:
+    """Singleton process pool for PDF rendering - Only ONE pool per app worker"""
+
+    _instance: Optional['ClsPDFRenderPool'] = None
+    _executor: Optional[ProcessPoolExecutor] = None
+    _intWorkers: int = 0
+    _intMaxQueue: int = 0
+    _intPending: int = 0
+    _semBulk: Optional[asyncio.Semaphore] = None
+    _intBulkSlots: int = 0
+    _intBulkPending: int = 0
+    _intRendered: int = 0
+    _intRejected: int = 0
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def fnStart(self) -> None:
+        """Start the worker processes (called from main.lifespan)"""
+        if ClsPDFRenderPool._executor is not None:
+            return
+
+        intWorkers = int(os.getenv("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+        ClsPDFRenderPool._intWorkers = max(0, intWorkers)
+        ClsPDFRenderPool._intMaxQueue = int(os.getenv("PDF_RENDER_MAX_QUEUE", str(max(1, intWorkers) * 4)))
+        ClsPDFRenderPool._intBulkSlots = max(1, int(os.getenv("PDF_RENDER_BULK_SLOTS", str(intWorkers - 1))))
+        ClsPDFRenderPool._semBulk = asyncio.Semaphore(ClsPDFRenderPool._intBulkSlots)
+
+        if ClsPDFRenderPool._intWorkers == 0:
+            logger.info("PDF rendering inline (PDF_RENDER_WORKERS=0)")
+            return
+
+        self.fnCreateExecutor()
+        logger.info(
+            f"PDF render pool started | workers={ClsPDFRenderPool._intWorkers} "
+            f"| max_queue={ClsPDFRenderPool._intMaxQueue} | bulk_slots={ClsPDFRenderPool._intBulkSlots}"
+        )
+
+    def fnCreateExecutor(self) -> None:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        ClsPDFRenderPool._executor = ProcessPoolExecutor(
+            max_workers=ClsPDFRenderPool._intWorkers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=fnInitRenderWorker
+        )
+
+    def fnStop(self) -> None:
+        """Shut the worker processes down (called from main.lifespan shutdown)"""
+        if ClsPDFRenderPool._executor is not None:
+            ClsPDFRenderPool._executor.shutdown(wait=True, cancel_futures=True)
+            ClsPDFRenderPool._executor = None
+            logger.info("PDF render pool stopped")
+
+    async def fnRender(self, strKind: str, dctArgs: Dict[str, Any], strPath: str, blnBulk: bool = False) -> int:
+        """
+        Render to strPath in a worker process and return the file size;
+        raises ClsPDFQueueFullError when the interactive queue is full.
+
+        blnBulk=True (bulk export) waits for one of the shared bulk slots
+        instead - it must not be rejected halfway through an export.
+        """
+        if ClsPDFRenderPool._intMaxQueue == 0:
+            self.fnStart()  # lifespan did not run (scripts)
+
+        if blnBulk:
+            ClsPDFRenderPool._intBulkPending += 1
+            try:
+                async with ClsPDFRenderPool._semBulk:
+                    return await self.fnRunJob(strKind, dctArgs, strPath)
+            finally:
+                ClsPDFRenderPool._intBulkPending -= 1
+
+        if ClsPDFRenderPool._intPending >= ClsPDFRenderPool._intMaxQueue:
+            ClsPDFRenderPool._intRejected += 1
+            raise ClsPDFQueueFullError(
+                f"PDF render queue full ({ClsPDFRenderPool._intMaxQueue} pending) - try again shortly"
+            )
+
+        ClsPDFRenderPool._intPending += 1
+        try:
+            return await self.fnRunJob(strKind, dctArgs, strPath)
+        finally:
+            ClsPDFRenderPool._intPending -= 1
+
+    async def fnRunJob(self, strKind: str, dctArgs: Dict[str, Any], strPath: str) -> int:
+        if ClsPDFRenderPool._executor is None:
+            intSize = fnRenderPdf(strKind, dctArgs, strPath)
+        else:
+            intSize = await self.fnRunInExecutor(strKind, dctArgs, strPath)
+        ClsPDFRenderPool._intRendered += 1
+        return intSize
+
+    async def fnRunInExecutor(self, strKind: str, dctArgs: Dict[str, Any], strPath: str) -> int:
+        loop = asyncio.get_running_loop()
+        insExecutor = ClsPDFRenderPool._executor
+        try:
+            return await loop.run_in_executor(insExecutor, fnRenderPdf, strKind, dctArgs, strPath)
+        except BrokenProcessPool:
+            # A worker died (OOM / crash) - replace the pool once and retry this job
+            if ClsPDFRenderPool._executor is insExecutor:
+                logger.error("PDF render pool broken - restarting workers")
+                insExecutor.shutdown(wait=False, cancel_futures=True)
+                self.fnCreateExecutor()
+            return await loop.run_in_executor(ClsPDFRenderPool._executor, fnRenderPdf, strKind, dctArgs, strPath)
+
+    def fnGetBulkSlots(self) -> int:
+        if ClsPDFRenderPool._intMaxQueue == 0:
+            self.fnStart()
+        return ClsPDFRenderPool._intBulkSlots
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        return {
+            "workers": ClsPDFRenderPool._intWorkers,
+            "max_queue": ClsPDFRenderPool._intMaxQueue,
+            "pending": ClsPDFRenderPool._intPending,
+            "bulk_slots": ClsPDFRenderPool._intBulkSlots,
+            "bulk_pending": ClsPDFRenderPool._intBulkPending,
+            "rendered": ClsPDFRenderPool._intRendered,
+            "rejected": ClsPDFRenderPool._intRejected
+        }
@@ -1,21 +1,60 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from typing import Annotated, Any, Dict, Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import asyncpg
 
-from app.api.pdf.schema import MdlQuotationPDFRequest, MdlInvoicePDFRequest
-from app.api.pdf.service import ClsPDFGenerator
+from app.api.pdf.schema import MdlQuotationPDFRequest, MdlInvoicePDFRequest, MdlPDFExportRequest
+from app.api.pdf.export import ClsPDFExportService
+from app.api.pdf.renderPool import ClsPDFQueueFullError, PDF_KIND_QUOTATION, PDF_KIND_INVOICE
+from app.api.pdf.pdfCache import fnOpenPdf, fnPdfCacheKey, fnETag, fnETagMatches
 from app.core.database import ClsDatabasepool
+from app.core.documentLoader import fnLoadQuotation, fnLoadInvoice, fnQuotationRenderArgs, fnInvoiceRenderArgs
 from app.core.security import fnGetCurrentUser
 from app.core.logger import getUserLogger
 
 router = APIRouter(prefix="/pdf", tags=["PDF"])
 
 
+def fnQueueFullResponse(e: ClsPDFQueueFullError) -> JSONResponse:
+    """Render workers saturated - tell the client to retry instead of queueing forever"""
+    return JSONResponse(status_code=503, content={"error": str(e)}, headers={"Retry-After": "2"})
+
+
+async def fnRenderPdfResponse(
+    strKind: str,
+    dctArgs: Dict[str, Any],
+    strFilename: str,
+    strIfNoneMatch: Optional[str],
+    blnCacheable: bool
+) -> Response:
+    """
+    Serve a PDF: 304 if the client has it, else stream it from disk (cache,
+    or a fresh render written by the render worker) with a Content-Length.
+
+    Only deterministic renders are cacheable - without a date / number the
+    generator stamps the current time.
+    """
+    dctHeaders = {"Content-Disposition": f"inline; filename={strFilename}"}
+    strKey = None
+    if blnCacheable:
+        strKey = fnPdfCacheKey(strKind, dctArgs)
+        dctHeaders["ETag"] = fnETag(strKey)
+        dctHeaders["Cache-Control"] = "private, no-cache"   # revalidate with If-None-Match
+        if fnETagMatches(strIfNoneMatch, strKey):
+            return Response(status_code=304, headers=dctHeaders)
+
+    insPdf = await fnOpenPdf(strKind, dctArgs, strKey)
+    dctHeaders["Content-Length"] = str(insPdf.intSize)
+    if blnCacheable:
+        dctHeaders["X-PDF-Cache"] = "hit" if insPdf.blnFromCache else "miss"
+    return StreamingResponse(insPdf.fnIterChunks(), media_type="application/pdf", headers=dctHeaders)
+
+
 @router.post("/quotation")
 async def fnGenerateQuotationPDF(
     intUserId: Annotated[int, Depends(fnGetCurrentUser)],
-    mdlRequest: MdlQuotationPDFRequest
+    mdlRequest: MdlQuotationPDFRequest,
+    strIfNoneMatch: Annotated[Optional[str], Header(alias="if-none-match")] = None
 ):
     """Generate PDF for quotation"""
     logger = getUserLogger(intUserId)
@@ -27,81 +66,43 @@ async def fnGenerateQuotationPDF(
             pool = await insPool.fnGetPool()
 
             async with pool.acquire() as conn:
-                # Fetch quotation details
-                strQuery = """
-                    SELECT
-                        vchr_quotation_number,
-                        dat_quotation_date,
-                        vchr_customer_name,
-                        vchr_customer_phone,
-                        txt_customer_address
-                    FROM tbl_quotation
-                    WHERE pk_bint_quotation_id = $1 AND fk_bint_user_id = $2
-                """
-                rstQuotation = await conn.fetchrow(strQuery, mdlRequest.intQuotationId, intUserId)
-
-                if not rstQuotation:
-                    logger.warning(f"Quotation not found: ID={mdlRequest.intQuotationId}")
-                    return {"error": "Quotation not found"}
-
-                # Fetch quotation items
-                strItemsQuery = """
-                    SELECT
-                        vchr_item_name,
-                        dbl_quantity,
-                        dbl_unit_price
-                    FROM tbl_quotation_item
-                    WHERE fk_bint_quotation_id = $1
-                    ORDER BY int_sort_order
-                """
-                rstItems = await conn.fetch(strItemsQuery, mdlRequest.intQuotationId)
-
-                items = [
-                    {
-                        'strItemName': row['vchr_item_name'],
-                        'dblQuantity': float(row['dbl_quantity']),
-                        'dblUnitPrice': float(row['dbl_unit_price'])
-                    }
-                    for row in rstItems
-                ]
-
-                customer_name = rstQuotation['vchr_customer_name']
-                customer_phone = rstQuotation['vchr_customer_phone']
-                customer_address = rstQuotation['txt_customer_address']
-                quotation_date = rstQuotation['dat_quotation_date'].strftime('%d/%m/%Y') if rstQuotation['dat_quotation_date'] else None
-                quotation_number = rstQuotation['vchr_quotation_number']
+                # Header + items in one round trip
+                dctQuotation = await fnLoadQuotation(conn, mdlRequest.intQuotationId, intUserId)
+
+            if not dctQuotation:
+                logger.warning(f"Quotation not found: ID={mdlRequest.intQuotationId}")
+                return {"error": "Quotation not found"}
+
+            dct_args = fnQuotationRenderArgs(dctQuotation)
         else:
             # Use data from request
-            items = [item.model_dump() for item in mdlRequest.lstItems] if mdlRequest.lstItems else []
-            customer_name = mdlRequest.strCustomerName
-            customer_phone = mdlRequest.strCustomerPhone
-            customer_address = mdlRequest.strCustomerAddress
-            quotation_date = mdlRequest.strQuotationDate
-            quotation_number = mdlRequest.strQuotationNumber
-
-        # Generate PDF
-        pdf_generator = ClsPDFGenerator()
-        pdf_buffer = pdf_generator.generate_quotation_pdf(
-            items=items,
-            customer_name=customer_name,
-            customer_phone=customer_phone,
-            customer_address=customer_address,
-            quotation_date=quotation_date,
-            quotation_number=quotation_number,
-            include_info_page=mdlRequest.blnIncludeInfoPage
-        )
+            dct_args = dict(
+                items=[item.model_dump() for item in mdlRequest.lstItems] if mdlRequest.lstItems else [],
+                customer_name=mdlRequest.strCustomerName,
+                customer_phone=mdlRequest.strCustomerPhone,
+                customer_address=mdlRequest.strCustomerAddress,
+                quotation_date=mdlRequest.strQuotationDate,
+                quotation_number=mdlRequest.strQuotationNumber
+            )
+
+        # Render in a worker process (or serve from the PDF cache)
+        dct_args['include_info_page'] = mdlRequest.blnIncludeInfoPage
+        quotation_number = dct_args['quotation_number']
 
-        # Return PDF as streaming response
         filename = f"Quotation_{quotation_number or 'draft'}.pdf"
-        logger.info(f"Quotation PDF generated: {filename}")
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"inline; filename={filename}"
-            }
+        insResponse = await fnRenderPdfResponse(
+            PDF_KIND_QUOTATION,
+            dct_args,
+            filename,
+            strIfNoneMatch,
+            blnCacheable=bool(quotation_number and dct_args['quotation_date'])
         )
+        logger.info(f"Quotation PDF served: {filename} ({insResponse.headers.get('X-PDF-Cache', insResponse.status_code)})")
+        return insResponse
 
+    except ClsPDFQueueFullError as e:
+        logger.warning(f"Quotation PDF rejected: {str(e)}")
+        return fnQueueFullResponse(e)
     except asyncpg.PostgresError as e:
         logger.error(f"Database error generating quotation PDF: {str(e)}")
         return {"error": f"Database error: {str(e)}"}
@@ -113,7 +114,8 @@ async def fnGenerateQuotationPDF(
 @router.post("/invoice")
 async def fnGenerateInvoicePDF(
     intUserId: Annotated[int, Depends(fnGetCurrentUser)],
-    mdlRequest: MdlInvoicePDFRequest
+    mdlRequest: MdlInvoicePDFRequest,
+    strIfNoneMatch: Annotated[Optional[str], Header(alias="if-none-match")] = None
 ):
     """Generate PDF for invoice"""
     logger = getUserLogger(intUserId)
@@ -125,88 +127,89 @@ async def fnGenerateInvoicePDF(
             pool = await insPool.fnGetPool()
 
             async with pool.acquire() as conn:
-                # Fetch invoice details
-                strQuery = """
-                    SELECT
-                        vchr_invoice_number,
-                        dat_invoice_date,
-                        dat_due_date,
-                        vchr_customer_name,
-                        vchr_customer_phone,
-                        txt_customer_address
-                    FROM tbl_invoice
-                    WHERE pk_bint_invoice_id = $1 AND fk_bint_user_id = $2
-                """
-                rstInvoice = await conn.fetchrow(strQuery, mdlRequest.intInvoiceId, intUserId)
-
-                if not rstInvoice:
-                    logger.warning(f"Invoice not found: ID={mdlRequest.intInvoiceId}")
-                    return {"error": "Invoice not found"}
-
-                # Fetch invoice items
-                strItemsQuery = """
-                    SELECT
-                        vchr_item_name,
-                        dbl_quantity,
-                        dbl_unit_price
-                    FROM tbl_invoice_item
-                    WHERE fk_bint_invoice_id = $1
-                    ORDER BY int_sort_order
-                """
-                rstItems = await conn.fetch(strItemsQuery, mdlRequest.intInvoiceId)
-
-                items = [
-                    {
-                        'strItemName': row['vchr_item_name'],
-                        'dblQuantity': float(row['dbl_quantity']),
-                        'dblUnitPrice': float(row['dbl_unit_price'])
-                    }
-                    for row in rstItems
-                ]
-
-                customer_name = rstInvoice['vchr_customer_name']
-                customer_phone = rstInvoice['vchr_customer_phone']
-                customer_address = rstInvoice['txt_customer_address']
-                invoice_date = rstInvoice['dat_invoice_date'].strftime('%d/%m/%Y') if rstInvoice['dat_invoice_date'] else None
-                invoice_number = rstInvoice['vchr_invoice_number']
-                due_date = rstInvoice['dat_due_date'].strftime('%d/%m/%Y') if rstInvoice['dat_due_date'] else None
+                # Header + items in one round trip
+                dctInvoice = await fnLoadInvoice(conn, mdlRequest.intInvoiceId, intUserId)
+
+            if not dctInvoice:
+                logger.warning(f"Invoice not found: ID={mdlRequest.intInvoiceId}")
+                return {"error": "Invoice not found"}
+
+            dct_args = fnInvoiceRenderArgs(dctInvoice)
         else:
             # Use data from request
-            items = [item.model_dump() for item in mdlRequest.lstItems] if mdlRequest.lstItems else []
-            customer_name = mdlRequest.strCustomerName
-            customer_phone = mdlRequest.strCustomerPhone
-            customer_address = mdlRequest.strCustomerAddress
-            invoice_date = mdlRequest.strInvoiceDate
-            invoice_number = mdlRequest.strInvoiceNumber
-            due_date = mdlRequest.strDueDate
-
-        # Generate PDF
-        pdf_generator = ClsPDFGenerator()
-        pdf_buffer = pdf_generator.generate_invoice_pdf(
-            items=items,
-            customer_name=customer_name,
-            customer_phone=customer_phone,
-            customer_address=customer_address,
-            invoice_date=invoice_date,
-            invoice_number=invoice_number,
-            due_date=due_date,
-            include_info_page=mdlRequest.blnIncludeInfoPage
-        )
+            dct_args = dict(
+                items=[item.model_dump() for item in mdlRequest.lstItems] if mdlRequest.lstItems else [],
+                customer_name=mdlRequest.strCustomerName,
+                customer_phone=mdlRequest.strCustomerPhone,
+                customer_address=mdlRequest.strCustomerAddress,
+                invoice_date=mdlRequest.strInvoiceDate,
+                invoice_number=mdlRequest.strInvoiceNumber,
+                due_date=mdlRequest.strDueDate
+            )
+
+        # Render in a worker process (or serve from the PDF cache)
+        dct_args['include_info_page'] = mdlRequest.blnIncludeInfoPage
+        invoice_number = dct_args['invoice_number']
 
-        # Return PDF as streaming response
         filename = f"Invoice_{invoice_number or 'draft'}.pdf"
-        logger.info(f"Invoice PDF generated: {filename}")
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"inline; filename={filename}"
-            }
+        insResponse = await fnRenderPdfResponse(
+            PDF_KIND_INVOICE,
+            dct_args,
+            filename,
+            strIfNoneMatch,
+            blnCacheable=bool(invoice_number and dct_args['invoice_date'])
         )
+        logger.info(f"Invoice PDF served: {filename} ({insResponse.headers.get('X-PDF-Cache', insResponse.status_code)})")
+        return insResponse
 
+    except ClsPDFQueueFullError as e:
+        logger.warning(f"Invoice PDF rejected: {str(e)}")
+        return fnQueueFullResponse(e)
     except asyncpg.PostgresError as e:
         logger.error(f"Database error generating invoice PDF: {str(e)}")
         return {"error": f"Database error: {str(e)}"}
     except Exception as e:
         logger.error(f"Error generating invoice PDF: {str(e)}", exc_info=True)
         return {"error": f"Error generating PDF: {str(e)}"}
+
+
+@router.post("/export")
+async def fnExportPDFs(
+    intUserId: Annotated[int, Depends(fnGetCurrentUser)],
+    mdlRequest: MdlPDFExportRequest
+):
+    """Bulk export: all quotations / invoices in a date range as a streamed ZIP"""
+    logger = getUserLogger(intUserId)
+    try:
+        logger.info(
+            f"Exporting {mdlRequest.strDocumentType} PDFs: {mdlRequest.datFromDate} - {mdlRequest.datToDate} "
+            f"status={mdlRequest.strStatus}"
+        )
+        if mdlRequest.datFromDate > mdlRequest.datToDate:
+            return {"error": "datFromDate must be on or before datToDate"}
+
+        insPool = ClsDatabasepool()
+        pool = await insPool.fnGetPool()
+        insExport = ClsPDFExportService(pool, intUserId)
+        lstDocuments = await insExport.fnFetchDocuments(mdlRequest)
+        if not lstDocuments:
+            return {"error": f"No {mdlRequest.strDocumentType}s found for this range"}
+
+        filename = f"{mdlRequest.strDocumentType}s_{mdlRequest.datFromDate}_{mdlRequest.datToDate}.zip"
+        return StreamingResponse(
+            insExport.fnStreamZip(mdlRequest.strDocumentType, lstDocuments),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}"
+            }
+        )
+
+    except ValueError as e:
+        logger.warning(f"PDF export rejected: {str(e)}")
+        return {"error": str(e)}
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database error exporting PDFs: {str(e)}")
+        return {"error": f"Database error: {str(e)}"}
+    except Exception as e:
+        logger.error(f"Error exporting PDFs: {str(e)}", exc_info=True)
+        return {"error": f"Error exporting PDFs: {str(e)}"}
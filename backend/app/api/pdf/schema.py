@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from datetime import date
 
 
 class MdlPDFItem(BaseModel):
@@ -29,3 +30,12 @@ class MdlInvoicePDFRequest(BaseModel):
     strDueDate: Optional[str] = None
     lstItems: Optional[List[MdlPDFItem]] = None
     blnIncludeInfoPage: bool = False
+
+
+class MdlPDFExportRequest(BaseModel):
+    """Bulk export - every matching document as one ZIP of PDFs"""
+    strDocumentType: Literal["quotation", "invoice"] = "invoice"
+    datFromDate: date                              # Document date from (inclusive)
+    datToDate: date                                # Document date to (inclusive)
+    strStatus: Optional[str] = None                # Quotation status / invoice payment status
+    blnIncludeInfoPage: Optional[bool] = None      # Default: quotations yes, invoices no
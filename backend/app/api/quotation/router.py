@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends
 import asyncpg
 
@@ -7,6 +7,7 @@ from app.api.quotation.schema import (
     MdlUpdateQuotationRequest,
     MdlGetQuotationRequest,
     MdlDeleteQuotationRequest,
+    MdlQuotationListRequest,
     MdlQuotationResponse,
     MdlQuotationListResponse,
     MdlDeleteQuotationResponse
@@ -21,14 +22,28 @@ router = APIRouter(prefix="/quotation", tags=["Quotation"])
 
 
 @router.post("/list", response_model=MdlQuotationListResponse)
-async def fnGetQutationList(intUserId: Annotated[int, Depends(fnGetCurrentUser)]):
+async def fnGetQutationList(
+    intUserId: Annotated[int, Depends(fnGetCurrentUser)],
+    mdlListRequest: Optional[MdlQuotationListRequest] = None
+):
     logger = getUserLogger(intUserId)
     try:
         insPool = ClsDatabasepool()
         pool = await insPool.fnGetPool()
 
         insQuotationService = ClsQuotationService(pool, intUserId)
-        return await insQuotationService.fnGetAllQuotationList()
+
+        # Always keyset paginated - no body = first page with the default page size
+        return await insQuotationService.fnGetQuotationPage(mdlListRequest or MdlQuotationListRequest())
+    except ValueError as e:
+        logger.warning(f"Bad quotation list request: {str(e)}")
+        return MdlQuotationListResponse(
+            intStatus=ResponseStatus.ERROR,
+            strStatus=ResponseStatus.ERROR_STR,
+            intStatusCode=ResponseStatus.HTTP_BAD_REQUEST,
+            strMessage=str(e),
+            lstQuotation=[]
+        )
     except asyncpg.PostgresError as e:
         logger.error(f"Database error in quotation list: {str(e)}")
         return MdlQuotationListResponse(
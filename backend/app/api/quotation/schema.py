@@ -182,6 +182,42 @@ class MdlGetQuotationRequest(MdlBaseRequest):
     intQuotationId: int
 
 
+class MdlQuotationListRequest(MdlBaseRequest):
+    """
+    REQUEST: Paginated + filtered quotation list (optional body)
+
+    ENDPOINT: POST /quotation/list
+
+    NOTE: Without a body the first page (default page size) is returned.
+    Pages are keyset based: pass strNextCursor of the previous page
+    as strCursor to get the next one.
+
+    FRONTEND USAGE:
+    quotationService.getList({ intPageSize: 50, strStatus: "sent" })
+
+    EXAMPLE - First page:
+    {
+        "intPageSize": 50,
+        "strStatus": "sent",
+        "datFromDate": "2025-01-01",
+        "datToDate": "2025-03-31",
+        "strCustomer": "ramesh"
+    }
+
+    EXAMPLE - Next page:
+    {
+        "intPageSize": 50,
+        "strCursor": "MjAyNS0wMy0zMVQxMDoxNTowMHw0Mg=="
+    }
+    """
+    intPageSize: Optional[int] = None                 # Default 50, max 200
+    strCursor: Optional[str] = None                   # NULL = first page
+    strStatus: Optional[str] = None                   # draft, sent, accepted, rejected
+    datFromDate: Optional[date] = None                # Quotation date from (inclusive)
+    datToDate: Optional[date] = None                  # Quotation date to (inclusive)
+    strCustomer: Optional[str] = None                 # Matches customer name or phone
+
+
 class MdlDeleteQuotationRequest(MdlBaseRequest):
     """
     REQUEST: Delete quotation
@@ -332,7 +368,7 @@ class MdlQuotationResponse(MdlBaseResponse):
 
 class MdlQuotationListResponse(MdlBaseResponse):
     """
-    RESPONSE: List of all quotations (summary only)
+    RESPONSE: One page of quotations (summary only)
 
     RETURNED BY:
     - POST /quotation/list
@@ -367,6 +403,8 @@ class MdlQuotationListResponse(MdlBaseResponse):
     }
     """
     lstQuotation: List[MdlQuotationListItem] = []
+    strNextCursor: Optional[str] = None               # Paginated mode: cursor for next page
+    blnHasMore: bool = False                          # Paginated mode: more pages available
 
 
 class MdlDeleteQuotationResponse(MdlBaseResponse):
@@ -8,10 +8,21 @@ from app.api.quotation.schema import (
     MdlQuotationItem,
     MdlDeleteQuotationResponse,
     MdlCreateQuotationRequest,
-    MdlUpdateQuotationRequest
+    MdlUpdateQuotationRequest,
+    MdlQuotationListRequest
 )
 from app.core.baseSchema import ResponseStatus
 from app.core.logger import getUserLogger
+from app.core.lineItemWriter import fnInsertLineItems
+from app.core.documentNumber import fnNextDocumentNumber, PREFIX_QUOTATION
+from app.core.documentLoader import fnLoadQuotation
+from app.core.pagination import fnClampPageSize, fnEncodeCursor, fnBuildPageFilter
+from app.api.dashboard.rollup import (
+    fnApplyQuotationCreated,
+    fnApplyQuotationDeleted,
+    fnApplyQuotationDateChange,
+    fnBumpRollupVersion
+)
 
 
 class ClsQuotationService:
@@ -20,29 +31,31 @@ class ClsQuotationService:
         self.intUserId = intUserId
         self.logger = getUserLogger(intUserId)
         
-    async def fnGenerateQuotationNumber(self) -> str:
-        """Generate Qutation Number"""
-        strYear = datetime.datetime.now().strftime("%Y")
-
-        strQuery = """
-            SELECT MAX(CAST(SUBSTRING(vchr_quotation_number FROM 9) AS INTEGER)) as max_num
-            FROM tbl_quotation
-            WHERE fk_bint_user_id = $1
-            AND vchr_quotation_number LIKE $2
-        """
-
-        async with self.insPool.acquire() as conn:
-            rstMax = await conn.fetchrow(strQuery, self.intUserId, f"QT-{strYear}-%")
-
-        intNextNum = (rstMax['max_num'] or 0) + 1
-        return f"QT-{strYear}-{intNextNum:04d}"
+    async def fnGenerateQuotationNumber(self, conn) -> str:
+        """Generate Qutation Number (call inside the insert transaction)"""
+        return await fnNextDocumentNumber(conn, self.intUserId, PREFIX_QUOTATION)
 
     
-    async def fnGetAllQuotationList(self):
-        """Get all quotations for user"""
-        
-        strQuery = """
-            SELECT 
+    async def fnGetQuotationPage(self, mdlRequest: MdlQuotationListRequest):
+        """Get one keyset page of quotations with optional filters"""
+
+        intPageSize = fnClampPageSize(mdlRequest.intPageSize)
+        strWhere, lstValues = fnBuildPageFilter(
+            self.intUserId,
+            "pk_bint_quotation_id",
+            mdlRequest.strCursor,
+            intPageSize,
+            strStatusColumn="vchr_status",
+            strStatus=mdlRequest.strStatus,
+            strDateColumn="dat_quotation_date",
+            datFromDate=mdlRequest.datFromDate,
+            datToDate=mdlRequest.datToDate,
+            strCustomer=mdlRequest.strCustomer
+        )
+
+        # Page is cut first (index scan on user + created_at), items counted only for that page
+        strQuery = f"""
+            SELECT
                 q.pk_bint_quotation_id,
                 q.vchr_quotation_number,
                 q.dat_quotation_date,
@@ -50,15 +63,22 @@ class ClsQuotationService:
                 q.vchr_customer_phone,
                 q.dbl_total_amount,
                 q.vchr_status,
-                COUNT(qi.pk_bint_quotation_item_id) as item_count
-            FROM tbl_quotation q
-            LEFT JOIN tbl_quotation_item qi ON q.pk_bint_quotation_id = qi.fk_bint_quotation_id
-            WHERE q.fk_bint_user_id = $1
-            GROUP BY q.pk_bint_quotation_id
-            ORDER BY q.tim_created_at DESC
+                q.tim_created_at,
+                (SELECT COUNT(*) FROM tbl_quotation_item qi WHERE qi.fk_bint_quotation_id = q.pk_bint_quotation_id) as item_count
+            FROM (
+                SELECT *
+                FROM tbl_quotation
+                WHERE {strWhere}
+                ORDER BY tim_created_at DESC, pk_bint_quotation_id DESC
+                LIMIT ${len(lstValues)}
+            ) q
+            ORDER BY q.tim_created_at DESC, q.pk_bint_quotation_id DESC
         """
         async with self.insPool.acquire() as conn:
-            lstQuotations = await conn.fetch(strQuery, self.intUserId)
+            lstQuotations = await conn.fetch(strQuery, *lstValues)
+
+        blnHasMore = len(lstQuotations) > intPageSize
+        lstQuotations = lstQuotations[:intPageSize]
 
         if not lstQuotations:
             return MdlQuotationListResponse(
@@ -68,7 +88,7 @@ class ClsQuotationService:
                 strMessage="No quotations found",
                 lstQuotation=[]
             )
-        
+
         lstItems = []
         for dctRow in lstQuotations:
             mdlItem = MdlQuotationListItem(
@@ -83,44 +103,29 @@ class ClsQuotationService:
             )
             lstItems.append(mdlItem)
 
+        strNextCursor = None
+        if blnHasMore:
+            dctLast = lstQuotations[-1]
+            strNextCursor = fnEncodeCursor(dctLast['tim_created_at'], dctLast['pk_bint_quotation_id'])
+
         return MdlQuotationListResponse(
             intStatus=ResponseStatus.SUCCESS,
             strStatus=ResponseStatus.SUCCESS_STR,
             intStatusCode=ResponseStatus.HTTP_OK,
             strMessage=f"Found {len(lstItems)} quotations",
-            lstQuotation=lstItems
+            lstQuotation=lstItems,
+            strNextCursor=strNextCursor,
+            blnHasMore=blnHasMore
         )
 
     async def fnGetSingleQuotationDetails(self, intQuotationId: int):
         """Get single quotation with items and linked invoice info"""
 
-        strQuery = """
-            SELECT
-                q.pk_bint_quotation_id,
-                q.fk_bint_ai_response_id,
-                q.vchr_quotation_number,
-                q.dat_quotation_date,
-                q.vchr_customer_name,
-                q.vchr_customer_phone,
-                q.txt_customer_address,
-                q.dbl_subtotal,
-                q.dbl_tax_percent,
-                q.dbl_tax_amount,
-                q.dbl_discount_amount,
-                q.dbl_total_amount,
-                q.txt_notes,
-                q.vchr_status,
-                q.dat_valid_until,
-                i.pk_bint_invoice_id as linked_invoice_id,
-                i.vchr_invoice_number as linked_invoice_number
-            FROM tbl_quotation q
-            LEFT JOIN tbl_invoice i ON i.fk_bint_quotation_id = q.pk_bint_quotation_id
-            WHERE q.pk_bint_quotation_id = $1 AND q.fk_bint_user_id = $2
-        """
         async with self.insPool.acquire() as conn:
-            rstQuotation = await conn.fetchrow(strQuery, intQuotationId, self.intUserId)
+            # Header, linked invoice and items in one round trip
+            dctQuotation = await fnLoadQuotation(conn, intQuotationId, self.intUserId)
         
-        if not rstQuotation:
+        if not dctQuotation:
             return MdlQuotationResponse(
                 intStatus=ResponseStatus.NO_DATA,
                 strStatus=ResponseStatus.NO_DATA_STR,
@@ -129,26 +134,8 @@ class ClsQuotationService:
                 data=None
             )
         
-        strItemsQuery = """
-            SELECT
-                pk_bint_quotation_item_id,
-                fk_bint_inventory_id,
-                vchr_item_code,
-                vchr_item_name,
-                vchr_unit,
-                dbl_quantity,
-                dbl_unit_price,
-                dbl_total_price,
-                int_sort_order
-            FROM tbl_quotation_item
-            WHERE fk_bint_quotation_id = $1
-            ORDER BY int_sort_order
-        """
-        async with self.insPool.acquire() as conn:
-            lstItems = await conn.fetch(strItemsQuery, intQuotationId)
-        
         lstQuotationItems = []
-        for dctItem in lstItems:
+        for dctItem in dctQuotation['lstItems']:
             mdlItem = MdlQuotationItem(
                 intPkQuotationItemId=dctItem['pk_bint_quotation_item_id'],
                 intInventoryId=dctItem['fk_bint_inventory_id'],
@@ -163,24 +150,24 @@ class ClsQuotationService:
             lstQuotationItems.append(mdlItem)
             
         mdlQuotation = MdlQuotation(
-            intPkQuotationId=rstQuotation['pk_bint_quotation_id'],
-            intAiResponseId=rstQuotation['fk_bint_ai_response_id'],
-            strQuotationNumber=rstQuotation['vchr_quotation_number'],
-            datQuotationDate=rstQuotation['dat_quotation_date'],
-            strCustomerName=rstQuotation['vchr_customer_name'],
-            strCustomerPhone=rstQuotation['vchr_customer_phone'],
-            strCustomerAddress=rstQuotation['txt_customer_address'],
-            dblSubtotal=float(rstQuotation['dbl_subtotal'] or 0),
-            dblTaxPercent=float(rstQuotation['dbl_tax_percent'] or 0),
-            dblTaxAmount=float(rstQuotation['dbl_tax_amount'] or 0),
-            dblDiscountAmount=float(rstQuotation['dbl_discount_amount'] or 0),
-            dblTotalAmount=float(rstQuotation['dbl_total_amount'] or 0),
-            strNotes=rstQuotation['txt_notes'],
-            strStatus=rstQuotation['vchr_status'],
-            datValidUntil=rstQuotation['dat_valid_until'],
+            intPkQuotationId=dctQuotation['pk_bint_quotation_id'],
+            intAiResponseId=dctQuotation['fk_bint_ai_response_id'],
+            strQuotationNumber=dctQuotation['vchr_quotation_number'],
+            datQuotationDate=dctQuotation['dat_quotation_date'],
+            strCustomerName=dctQuotation['vchr_customer_name'],
+            strCustomerPhone=dctQuotation['vchr_customer_phone'],
+            strCustomerAddress=dctQuotation['txt_customer_address'],
+            dblSubtotal=float(dctQuotation['dbl_subtotal'] or 0),
+            dblTaxPercent=float(dctQuotation['dbl_tax_percent'] or 0),
+            dblTaxAmount=float(dctQuotation['dbl_tax_amount'] or 0),
+            dblDiscountAmount=float(dctQuotation['dbl_discount_amount'] or 0),
+            dblTotalAmount=float(dctQuotation['dbl_total_amount'] or 0),
+            strNotes=dctQuotation['txt_notes'],
+            strStatus=dctQuotation['vchr_status'],
+            datValidUntil=dctQuotation['dat_valid_until'],
             lstItems=lstQuotationItems,
-            intLinkedInvoiceId=rstQuotation['linked_invoice_id'],
-            strLinkedInvoiceNumber=rstQuotation['linked_invoice_number']
+            intLinkedInvoiceId=dctQuotation['linked_invoice_id'],
+            strLinkedInvoiceNumber=dctQuotation['linked_invoice_number']
         )
         
         return MdlQuotationResponse(
@@ -195,8 +182,6 @@ class ClsQuotationService:
         """Create new quotation with items"""
         self.logger.info(f"Creating quotation for customer: {mdlRequest.strCustomerName}")
 
-        strQuotationNumber = await self.fnGenerateQuotationNumber()
-        
         dblSubtotal = sum(item.dblQuantity * item.dblUnitPrice for item in mdlRequest.lstItems)
         dblTaxAmount = dblSubtotal * (mdlRequest.dblTaxPercent or 0) / 100
         dblTotalAmount = dblSubtotal + dblTaxAmount - (mdlRequest.dblDiscountAmount or 0)
@@ -205,6 +190,8 @@ class ClsQuotationService:
         
         async with self.insPool.acquire() as conn:
             async with conn.transaction():
+                strQuotationNumber = await self.fnGenerateQuotationNumber(conn)
+
                 strInsertQuotation = """
                     INSERT INTO tbl_quotation (
                         fk_bint_user_id,
@@ -249,33 +236,12 @@ class ClsQuotationService:
                 intQuotationId = rstQuotation['pk_bint_quotation_id']
                 self.logger.info(f"Quotation created: {strQuotationNumber} | ID={intQuotationId} | Items={len(mdlRequest.lstItems)}")
 
-                strInsertItem = """
-                    INSERT INTO tbl_quotation_item (
-                        fk_bint_quotation_id,
-                        fk_bint_inventory_id,
-                        vchr_item_code,
-                        vchr_item_name,
-                        vchr_unit,
-                        dbl_quantity,
-                        dbl_unit_price,
-                        dbl_total_price,
-                        int_sort_order
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                """
-                for intIndex, mdlItem in enumerate(mdlRequest.lstItems):
-                    dblItemTotal = mdlItem.dblQuantity * mdlItem.dblUnitPrice
-                    await conn.execute(
-                        strInsertItem,
-                        intQuotationId,
-                        mdlItem.intInventoryId,
-                        mdlItem.strItemCode,
-                        mdlItem.strItemName,
-                        mdlItem.strUnit,
-                        mdlItem.dblQuantity,
-                        mdlItem.dblUnitPrice,
-                        dblItemTotal,
-                        mdlItem.intSortOrder or intIndex
-                    )
+                # All items in one round-trip
+                await fnInsertLineItems(conn, "tbl_quotation_item", intQuotationId, mdlRequest.lstItems)
+
+                # Keep dashboard rollup in step (same transaction)
+                await fnApplyQuotationCreated(conn, self.intUserId, datQuotationDate)
+            fnBumpRollupVersion(self.intUserId)   # after commit
 
         return await self.fnGetSingleQuotationDetails(intQuotationId)
             
@@ -284,7 +250,7 @@ class ClsQuotationService:
         """Update existing quotation"""
         
         strCheckQuery = """
-            SELECT pk_bint_quotation_id FROM tbl_quotation
+            SELECT pk_bint_quotation_id, dat_quotation_date FROM tbl_quotation
             WHERE pk_bint_quotation_id = $1 AND fk_bint_user_id = $2
         """
         
@@ -325,6 +291,15 @@ class ClsQuotationService:
                     lstValues.append(mdlRequest.datQuotationDate)
                     intParamCount += 1
 
+                    # Move the quotation to its new day bucket (timeseries)
+                    await fnApplyQuotationDateChange(
+                        conn,
+                        self.intUserId,
+                        mdlRequest.intPkQuotationId,
+                        rstExist['dat_quotation_date'],
+                        mdlRequest.datQuotationDate
+                    )
+
                 if mdlRequest.datValidUntil is not None:
                     lstFields.append(f"dat_valid_until = ${intParamCount}")
                     lstValues.append(mdlRequest.datValidUntil)
@@ -399,33 +374,9 @@ class ClsQuotationService:
                     strDeleteItems = "DELETE FROM tbl_quotation_item WHERE fk_bint_quotation_id = $1"
                     await conn.execute(strDeleteItems, mdlRequest.intPkQuotationId)
 
-                    strInsertItem = """
-                        INSERT INTO tbl_quotation_item (
-                            fk_bint_quotation_id,
-                            fk_bint_inventory_id,
-                            vchr_item_code,
-                            vchr_item_name,
-                            vchr_unit,
-                            dbl_quantity,
-                            dbl_unit_price,
-                            dbl_total_price,
-                            int_sort_order
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-                    """
-                    for intIndex, mdlItem in enumerate(mdlRequest.lstItems):
-                        dblItemTotal = mdlItem.dblQuantity * mdlItem.dblUnitPrice
-                        await conn.execute(
-                            strInsertItem,
-                            mdlRequest.intPkQuotationId,
-                            mdlItem.intInventoryId,
-                            mdlItem.strItemCode,
-                            mdlItem.strItemName,
-                            mdlItem.strUnit,
-                            mdlItem.dblQuantity,
-                            mdlItem.dblUnitPrice,
-                            dblItemTotal,
-                            mdlItem.intSortOrder or intIndex
-                        )
+                    await fnInsertLineItems(conn, "tbl_quotation_item", mdlRequest.intPkQuotationId, mdlRequest.lstItems)
+            if mdlRequest.datQuotationDate is not None:
+                fnBumpRollupVersion(self.intUserId)   # after commit
 
         return await self.fnGetSingleQuotationDetails(mdlRequest.intPkQuotationId)
     
@@ -433,13 +384,37 @@ class ClsQuotationService:
         """Delete quotation and its items"""
         self.logger.info(f"Deleting quotation: ID={intQuotationId}")
 
+        # The join sees the invoices before ON DELETE SET NULL unlinks them,
+        # so the converted count can be taken off the quotation's day bucket
         strQuery = """
-            DELETE FROM tbl_quotation
-            WHERE pk_bint_quotation_id = $1 AND fk_bint_user_id = $2
-            RETURNING pk_bint_quotation_id
+            WITH deleted AS (
+                DELETE FROM tbl_quotation
+                WHERE pk_bint_quotation_id = $1 AND fk_bint_user_id = $2
+                RETURNING pk_bint_quotation_id, dat_quotation_date
+            )
+            SELECT
+                d.pk_bint_quotation_id,
+                d.dat_quotation_date,
+                COUNT(i.pk_bint_invoice_id) as int_converted_invoices
+            FROM deleted d
+            LEFT JOIN tbl_invoice i
+                ON i.fk_bint_quotation_id = d.pk_bint_quotation_id
+                AND i.fk_bint_user_id = $2
+            GROUP BY d.pk_bint_quotation_id, d.dat_quotation_date
         """
         async with self.insPool.acquire() as conn:
-            rstDeleted = await conn.fetchrow(strQuery, intQuotationId, self.intUserId)
+            async with conn.transaction():
+                rstDeleted = await conn.fetchrow(strQuery, intQuotationId, self.intUserId)
+
+                if rstDeleted:
+                    await fnApplyQuotationDeleted(
+                        conn,
+                        self.intUserId,
+                        rstDeleted['dat_quotation_date'],
+                        rstDeleted['int_converted_invoices']
+                    )
+            if rstDeleted:
+                fnBumpRollupVersion(self.intUserId)   # after commit
 
         if not rstDeleted:
             return MdlDeleteQuotationResponse(
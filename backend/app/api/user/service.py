@@ -1,7 +1,8 @@
 from asyncpg import Pool
 
 from app.core.baseSchema import ResponseStatus
-from app.core.security import fnHashPassword, ADMIN_USER_ID
+from app.core.security import ADMIN_USER_ID
+from app.core.passwordHasher import ClsPasswordHasher, ClsPasswordHasherBusyError
 from app.core.logger import getLogger
 from app.api.user.schema import (
     MdlCreateUserRequest,
@@ -133,8 +134,18 @@ class ClsUserService:
                     data=None
                 )
 
-            # Hash password
-            strHashedPassword = fnHashPassword(mdlRequest.strPassword)
+            # Hash password (thread pool - keeps the event loop free)
+            try:
+                strHashedPassword = await ClsPasswordHasher().fnHash(mdlRequest.strPassword)
+            except ClsPasswordHasherBusyError as e:
+                self.logger.warning(f"Create user rejected, hasher busy: {mdlRequest.strEmail}")
+                return MdlUserResponse(
+                    intStatus=ResponseStatus.ERROR,
+                    strStatus=ResponseStatus.ERROR_STR,
+                    intStatusCode=ResponseStatus.HTTP_SERVICE_UNAVAILABLE,
+                    strMessage=str(e),
+                    data=None
+                )
 
             # Insert new user
             strInsertQuery = """
@@ -22,6 +22,7 @@ class ResponseStatus:
     HTTP_NOT_FOUND = HttpStatus.HTTP_404_NOT_FOUND
     HTTP_CONFLICT = HttpStatus.HTTP_409_CONFLICT
     HTTP_INTERNAL_ERROR = HttpStatus.HTTP_500_INTERNAL_SERVER_ERROR
+    HTTP_SERVICE_UNAVAILABLE = HttpStatus.HTTP_503_SERVICE_UNAVAILABLE
 
 
 # Base Request - All requests should inherit this
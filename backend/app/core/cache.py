@@ -0,0 +1,99 @@
+"""
+In-process LRU Cache with TTL - Shared by services that cache hot reads
+
+Features:
+- Bounded size, least recently used entry evicted first
+- Optional per-entry time-to-live (seconds)
+- Thread-safe (same locking style as the logger singletons)
+- Hit / miss / eviction counters for monitoring
+
+Usage:
+    from app.core.cache import ClsTTLCache
+
+    insCache = ClsTTLCache(intMaxSize=512, fltTtlSeconds=60)
+
+    objValue = insCache.fnGet(tupKey)
+    if objValue is None:
+        objValue = await fnLoad()
+        insCache.fnSet(tupKey, objValue)
+
+NOTE: Cache is per worker process. Keep TTLs short for data that can be
+changed by another worker.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ClsTTLCache:
+    """Bounded LRU cache with optional TTL and hit/miss counters"""
+
+    def __init__(self, intMaxSize: int = 1024, fltTtlSeconds: Optional[float] = None) -> None:
+        self.intMaxSize = intMaxSize
+        self.fltTtlSeconds = fltTtlSeconds
+        self._lock = threading.Lock()
+        self._dctEntries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self.intHits = 0
+        self.intMisses = 0
+        self.intEvictions = 0
+
+    def fnGet(self, key: Hashable, default: Any = None) -> Any:
+        """Get value (marks it recently used). Expired entries count as a miss."""
+        with self._lock:
+            tupEntry = self._dctEntries.get(key)
+            if tupEntry is None:
+                self.intMisses += 1
+                return default
+
+            fltExpiresAt, objValue = tupEntry
+            if fltExpiresAt is not None and fltExpiresAt <= time.monotonic():
+                del self._dctEntries[key]
+                self.intMisses += 1
+                return default
+
+            self._dctEntries.move_to_end(key)
+            self.intHits += 1
+            return objValue
+
+    def fnSet(self, key: Hashable, objValue: Any, fltTtlSeconds: Optional[float] = None) -> None:
+        """Store value, evicting the least recently used entries when full"""
+        fltTtl = fltTtlSeconds if fltTtlSeconds is not None else self.fltTtlSeconds
+        fltExpiresAt = time.monotonic() + fltTtl if fltTtl is not None else None
+
+        with self._lock:
+            self._dctEntries[key] = (fltExpiresAt, objValue)
+            self._dctEntries.move_to_end(key)
+            while len(self._dctEntries) > self.intMaxSize:
+                self._dctEntries.popitem(last=False)
+                self.intEvictions += 1
+
+    def fnDelete(self, key: Hashable) -> None:
+        with self._lock:
+            self._dctEntries.pop(key, None)
+
+    def fnDeleteWhere(self, fnPredicate: Callable[[Hashable], bool]) -> int:
+        """Delete all entries whose key matches. Returns number removed."""
+        with self._lock:
+            lstKeys = [key for key in self._dctEntries if fnPredicate(key)]
+            for key in lstKeys:
+                del self._dctEntries[key]
+            return len(lstKeys)
+
+    def fnClear(self) -> None:
+        with self._lock:
+            self._dctEntries.clear()
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        with self._lock:
+            intLookups = self.intHits + self.intMisses
+            return {
+                "size": len(self._dctEntries),
+                "max_size": self.intMaxSize,
+                "hits": self.intHits,
+                "misses": self.intMisses,
+                "evictions": self.intEvictions,
+                "hit_ratio": round(self.intHits / intLookups, 4) if intLookups else 0.0
+            }
@@ -0,0 +1,173 @@
+"""
+Document Loader - Quotation / invoice header and items in one round trip
+
+The quotation and invoice detail endpoints and both PDF endpoints used to
+run a header query and then an items query. Here the items are aggregated
+with json_agg in a LATERAL subquery, so one statement returns everything.
+
+The SQL text is a module constant: asyncpg keeps a prepared statement per
+connection keyed by the query text (statement cache), so after the first
+call on a pooled connection only Bind/Execute is sent.
+
+Returned dict keeps the column names of the old queries:
+    header columns (vchr_quotation_number, dat_quotation_date, ...)
+    lstItems -> [{pk_bint_quotation_item_id, vchr_item_name, dbl_quantity, ...}, ...]
+
+fnQuotationRenderArgs / fnInvoiceRenderArgs turn it into the compact
+generator arguments used by the PDF endpoints and the bulk export (same
+shape everywhere, so they share PDF cache keys).
+
+Usage:
+    from app.core.documentLoader import fnLoadQuotation, fnLoadInvoice
+
+    async with pool.acquire() as conn:
+        dctQuotation = await fnLoadQuotation(conn, intQuotationId, intUserId)   # None = not found
+    dctArgs = fnQuotationRenderArgs(dctQuotation)
+"""
+
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+SQL_LOAD_QUOTATION = """
+    SELECT
+        q.pk_bint_quotation_id,
+        q.fk_bint_ai_response_id,
+        q.vchr_quotation_number,
+        q.dat_quotation_date,
+        q.vchr_customer_name,
+        q.vchr_customer_phone,
+        q.txt_customer_address,
+        q.dbl_subtotal,
+        q.dbl_tax_percent,
+        q.dbl_tax_amount,
+        q.dbl_discount_amount,
+        q.dbl_total_amount,
+        q.txt_notes,
+        q.vchr_status,
+        q.dat_valid_until,
+        li.linked_invoice_id,
+        li.linked_invoice_number,
+        COALESCE(it.jsn_items, '[]'::json) AS jsn_items
+    FROM tbl_quotation q
+    LEFT JOIN LATERAL (
+        SELECT pk_bint_invoice_id AS linked_invoice_id, vchr_invoice_number AS linked_invoice_number
+        FROM tbl_invoice
+        WHERE fk_bint_quotation_id = q.pk_bint_quotation_id
+        LIMIT 1
+    ) li ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+            'pk_bint_quotation_item_id', pk_bint_quotation_item_id,
+            'fk_bint_inventory_id', fk_bint_inventory_id,
+            'vchr_item_code', vchr_item_code,
+            'vchr_item_name', vchr_item_name,
+            'vchr_unit', vchr_unit,
+            'dbl_quantity', dbl_quantity,
+            'dbl_unit_price', dbl_unit_price,
+            'dbl_total_price', dbl_total_price,
+            'int_sort_order', int_sort_order
+        ) ORDER BY int_sort_order, pk_bint_quotation_item_id) AS jsn_items
+        FROM tbl_quotation_item
+        WHERE fk_bint_quotation_id = q.pk_bint_quotation_id
+    ) it ON TRUE
+    WHERE q.pk_bint_quotation_id = $1 AND q.fk_bint_user_id = $2
+"""
+
+SQL_LOAD_INVOICE = """
+    SELECT
+        i.pk_bint_invoice_id,
+        i.fk_bint_quotation_id,
+        q.vchr_quotation_number,
+        i.vchr_invoice_number,
+        i.dat_invoice_date,
+        i.vchr_customer_name,
+        i.vchr_customer_phone,
+        i.txt_customer_address,
+        i.dbl_subtotal,
+        i.dbl_tax_percent,
+        i.dbl_tax_amount,
+        i.dbl_discount_amount,
+        i.dbl_total_amount,
+        i.txt_notes,
+        i.vchr_payment_status,
+        i.dat_due_date,
+        COALESCE(it.jsn_items, '[]'::json) AS jsn_items
+    FROM tbl_invoice i
+    LEFT JOIN tbl_quotation q ON i.fk_bint_quotation_id = q.pk_bint_quotation_id
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+            'pk_bint_invoice_item_id', pk_bint_invoice_item_id,
+            'fk_bint_inventory_id', fk_bint_inventory_id,
+            'vchr_item_code', vchr_item_code,
+            'vchr_item_name', vchr_item_name,
+            'vchr_unit', vchr_unit,
+            'dbl_quantity', dbl_quantity,
+            'dbl_unit_price', dbl_unit_price,
+            'dbl_total_price', dbl_total_price,
+            'int_sort_order', int_sort_order
+        ) ORDER BY int_sort_order, pk_bint_invoice_item_id) AS jsn_items
+        FROM tbl_invoice_item
+        WHERE fk_bint_invoice_id = i.pk_bint_invoice_id
+    ) it ON TRUE
+    WHERE i.pk_bint_invoice_id = $1 AND i.fk_bint_user_id = $2
+"""
+
+
+def fnRowToDocument(rowDocument) -> Optional[Dict[str, Any]]:
+    if rowDocument is None:
+        return None
+    dctDocument = dict(rowDocument)
+    dctDocument["lstItems"] = json.loads(dctDocument.pop("jsn_items"))
+    return dctDocument
+
+
+async def fnLoadQuotation(conn, intQuotationId: int, intUserId: int) -> Optional[Dict[str, Any]]:
+    """Quotation header + items (tenant scoped); None if not found"""
+    return fnRowToDocument(await conn.fetchrow(SQL_LOAD_QUOTATION, intQuotationId, intUserId))
+
+
+async def fnLoadInvoice(conn, intInvoiceId: int, intUserId: int) -> Optional[Dict[str, Any]]:
+    """Invoice header + items (tenant scoped); None if not found"""
+    return fnRowToDocument(await conn.fetchrow(SQL_LOAD_INVOICE, intInvoiceId, intUserId))
+
+
+def fnRenderDate(datValue: Optional[date]) -> Optional[str]:
+    return datValue.strftime('%d/%m/%Y') if datValue else None
+
+
+def fnRenderItem(strItemName: str, dblQuantity, dblUnitPrice) -> Dict[str, Any]:
+    return {
+        'strItemName': strItemName,
+        'dblQuantity': float(dblQuantity),
+        'dblUnitPrice': float(dblUnitPrice)
+    }
+
+
+def fnRenderItems(lstItems: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [fnRenderItem(item['vchr_item_name'], item['dbl_quantity'], item['dbl_unit_price']) for item in lstItems]
+
+
+def fnQuotationRenderArgs(dctQuotation: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_quotation_pdf arguments (without include_info_page)"""
+    return dict(
+        items=fnRenderItems(dctQuotation['lstItems']),
+        customer_name=dctQuotation['vchr_customer_name'],
+        customer_phone=dctQuotation['vchr_customer_phone'],
+        customer_address=dctQuotation['txt_customer_address'],
+        quotation_date=fnRenderDate(dctQuotation['dat_quotation_date']),
+        quotation_number=dctQuotation['vchr_quotation_number']
+    )
+
+
+def fnInvoiceRenderArgs(dctInvoice: Dict[str, Any]) -> Dict[str, Any]:
+    """generate_invoice_pdf arguments (without include_info_page)"""
+    return dict(
+        items=fnRenderItems(dctInvoice['lstItems']),
+        customer_name=dctInvoice['vchr_customer_name'],
+        customer_phone=dctInvoice['vchr_customer_phone'],
+        customer_address=dctInvoice['txt_customer_address'],
+        invoice_date=fnRenderDate(dctInvoice['dat_invoice_date']),
+        invoice_number=dctInvoice['vchr_invoice_number'],
+        due_date=fnRenderDate(dctInvoice['dat_due_date'])
+    )
@@ -0,0 +1,93 @@
+"""
+Document Number Service - Gap-free per-tenant numbering (QT-YYYY-NNNN / INV-YYYY-NNNN)
+
+Counters live in tbl_document_counter, one row per (user, prefix, year).
+The row is incremented with UPDATE ... RETURNING inside the caller's
+transaction, so:
+- concurrent creates for the same tenant queue on the row lock (no duplicates)
+- a rolled back create also rolls back the counter (no gaps)
+- cost is one indexed row, not a MAX() over the tenant's history
+
+Usage:
+    from app.core.documentNumber import fnNextDocumentNumber, PREFIX_QUOTATION
+
+    async with conn.transaction():
+        strNumber = await fnNextDocumentNumber(conn, intUserId, PREFIX_QUOTATION)
+        ...INSERT using strNumber...
+"""
+
+import datetime
+from typing import Optional
+
+
+PREFIX_QUOTATION = "QT"
+PREFIX_INVOICE = "INV"
+
+# Prefix -> (table, number column) used to seed a counter from existing documents
+DCT_PREFIX_SOURCE = {
+    PREFIX_QUOTATION: ("tbl_quotation", "vchr_quotation_number"),
+    PREFIX_INVOICE: ("tbl_invoice", "vchr_invoice_number"),
+}
+
+STR_INCREMENT_QUERY = """
+    UPDATE tbl_document_counter
+    SET int_last_number = int_last_number + 1
+    WHERE fk_bint_user_id = $1 AND vchr_prefix = $2 AND int_year = $3
+    RETURNING int_last_number
+"""
+
+
+def fnBuildSeedQuery(strPrefix: str) -> str:
+    """Create the counter row starting from the highest number already used"""
+    strTable, strColumn = DCT_PREFIX_SOURCE[strPrefix]
+    intNumberStart = len(strPrefix) + 7  # "QT-2026-" -> number starts at char 9
+
+    return f"""
+        INSERT INTO tbl_document_counter (fk_bint_user_id, vchr_prefix, int_year, int_last_number)
+        SELECT $1::bigint, $2::varchar, $3::integer, COALESCE(MAX(CAST(SUBSTRING({strColumn} FROM {intNumberStart}) AS INTEGER)), 0)
+        FROM {strTable}
+        WHERE fk_bint_user_id = $1
+        AND {strColumn} LIKE $4
+        ON CONFLICT (fk_bint_user_id, vchr_prefix, int_year) DO NOTHING
+    """
+
+
+# Prebuilt seed queries (built once at import)
+DCT_SEED_QUERIES = {strPrefix: fnBuildSeedQuery(strPrefix) for strPrefix in DCT_PREFIX_SOURCE}
+
+
+def fnFormatDocumentNumber(strPrefix: str, intYear: int, intNumber: int) -> str:
+    """QT + 2026 + 42 -> QT-2026-0042"""
+    return f"{strPrefix}-{intYear}-{intNumber:04d}"
+
+
+async def fnNextDocumentNumber(conn, intUserId: int, strPrefix: str, intYear: Optional[int] = None) -> str:
+    """
+    Reserve the next document number for a tenant
+
+    MUST be called inside the transaction that inserts the document,
+    the counter row stays locked until that transaction ends.
+
+    Args:
+        conn: asyncpg connection with an open transaction
+        intUserId: tenant (pk_bint_user_id)
+        strPrefix: PREFIX_QUOTATION or PREFIX_INVOICE
+        intYear: defaults to current year
+
+    Returns:
+        str: formatted number, e.g. INV-2026-0007
+    """
+    if strPrefix not in DCT_SEED_QUERIES:
+        raise ValueError(f"Unknown document prefix: {strPrefix}")
+
+    intYear = intYear or datetime.date.today().year
+
+    intNumber = await conn.fetchval(STR_INCREMENT_QUERY, intUserId, strPrefix, intYear)
+
+    if intNumber is None:
+        # First document of the year for this tenant - seed the counter once.
+        # Concurrent seeders are resolved by ON CONFLICT, the UPDATE below then serializes them.
+        await conn.execute(DCT_SEED_QUERIES[strPrefix], intUserId, strPrefix, intYear, f"{strPrefix}-{intYear}-%")
+        intNumber = await conn.fetchval(STR_INCREMENT_QUERY, intUserId, strPrefix, intYear)
+
+    return fnFormatDocumentNumber(strPrefix, intYear, intNumber)
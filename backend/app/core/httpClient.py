@@ -0,0 +1,159 @@
+"""
+Shared HTTP Client - One pooled httpx.AsyncClient for outbound API calls (Groq)
+
+Opening a client per request costs a new TCP + TLS handshake every time.
+This singleton keeps one client for the app's lifetime (opened and closed
+in main.lifespan) with keep-alive connection pooling, HTTP/2 when the
+optional 'h2' package is installed, and a semaphore that bounds how many
+outbound calls run at once.
+
+Config (.env, all optional):
+    HTTP_MAX_CONNECTIONS      (default 20)
+    HTTP_MAX_KEEPALIVE        (default 10)
+    HTTP_KEEPALIVE_EXPIRY     (default 30 seconds)
+    HTTP_CONNECT_TIMEOUT      (default 5 seconds)
+    HTTP_TIMEOUT              (default 30 seconds - read/write/pool)
+    HTTP_MAX_CONCURRENCY      (default 16 in-flight requests)
+    HTTP_HTTP2                (default true)
+
+Usage:
+    from app.core.httpClient import ClsHttpClient
+
+    insResponse = await ClsHttpClient().fnPost(strUrl, headers=dctHeaders, json=dctPayload)
+
+    async with ClsHttpClient().fnStream("POST", strUrl, json=dctPayload) as insResponse:
+        async for strLine in insResponse.aiter_lines():
+            ...
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+try:
+    import h2  # noqa: F401 - only needed for HTTP/2
+    BLN_HTTP2_AVAILABLE = True
+except ImportError:
+    BLN_HTTP2_AVAILABLE = False
+
+
+def fnEnvBool(strName: str, blnDefault: bool) -> bool:
+    return os.getenv(strName, str(blnDefault)).strip().lower() in ("1", "true", "yes")
+
+
+class ClsHttpClient:
+    """Singleton pooled HTTP client - Only ONE client per process"""
+
+    _instance: Optional['ClsHttpClient'] = None
+    _client: Optional[httpx.AsyncClient] = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _intMaxConcurrency: int = 0
+    _intInFlight: int = 0
+    _intWaiting: int = 0
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def fnStart(self) -> None:
+        """Create the shared client (called from main.lifespan)"""
+        if ClsHttpClient._client is not None:
+            return
+
+        intMaxConnections = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+        intMaxKeepalive = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+        fltKeepaliveExpiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        fltConnectTimeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        fltTimeout = float(os.getenv("HTTP_TIMEOUT", "30"))
+        intMaxConcurrency = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+        blnHttp2 = fnEnvBool("HTTP_HTTP2", True) and BLN_HTTP2_AVAILABLE
+
+        ClsHttpClient._client = httpx.AsyncClient(
+            http2=blnHttp2,
+            limits=httpx.Limits(
+                max_connections=intMaxConnections,
+                max_keepalive_connections=intMaxKeepalive,
+                keepalive_expiry=fltKeepaliveExpiry
+            ),
+            timeout=httpx.Timeout(fltTimeout, connect=fltConnectTimeout)
+        )
+        ClsHttpClient._semaphore = asyncio.Semaphore(intMaxConcurrency)
+        ClsHttpClient._intMaxConcurrency = intMaxConcurrency
+
+        logger.info(
+            f"HTTP client created | http2={blnHttp2} | max_connections={intMaxConnections} "
+            f"| keepalive={intMaxKeepalive} | max_concurrency={intMaxConcurrency}"
+        )
+
+    async def fnClose(self) -> None:
+        """Close the shared client (called from main.lifespan shutdown)"""
+        if ClsHttpClient._client is not None:
+            await ClsHttpClient._client.aclose()
+            ClsHttpClient._client = None
+            ClsHttpClient._semaphore = None
+            logger.info("HTTP client closed")
+
+    async def fnGetClient(self) -> httpx.AsyncClient:
+        """Get shared client (created on first use if lifespan did not run)"""
+        if ClsHttpClient._client is None:
+            await self.fnStart()
+        return ClsHttpClient._client
+
+    @asynccontextmanager
+    async def fnSlot(self) -> AsyncIterator[None]:
+        """Hold one of the HTTP_MAX_CONCURRENCY outbound slots"""
+        if ClsHttpClient._semaphore is None:
+            await self.fnStart()
+        semSlots = ClsHttpClient._semaphore
+
+        ClsHttpClient._intWaiting += 1
+        try:
+            await semSlots.acquire()
+        finally:
+            ClsHttpClient._intWaiting -= 1
+
+        ClsHttpClient._intInFlight += 1
+        try:
+            yield
+        finally:
+            ClsHttpClient._intInFlight -= 1
+            semSlots.release()
+
+    async def fnRequest(self, strMethod: str, strUrl: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the shared client, bounded by the concurrency semaphore"""
+        insClient = await self.fnGetClient()
+        async with self.fnSlot():
+            return await insClient.request(strMethod, strUrl, **kwargs)
+
+    @asynccontextmanager
+    async def fnStream(self, strMethod: str, strUrl: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Streamed request - the slot is held until the body has been read"""
+        insClient = await self.fnGetClient()
+        async with self.fnSlot():
+            async with insClient.stream(strMethod, strUrl, **kwargs) as insResponse:
+                yield insResponse
+
+    async def fnPost(self, strUrl: str, **kwargs: Any) -> httpx.Response:
+        return await self.fnRequest("POST", strUrl, **kwargs)
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        """Current client statistics"""
+        if ClsHttpClient._client is None:
+            return {"status": "not_initialized"}
+
+        return {
+            "status": "active",
+            "http2": BLN_HTTP2_AVAILABLE and fnEnvBool("HTTP_HTTP2", True),
+            "max_concurrency": ClsHttpClient._intMaxConcurrency,
+            "in_flight": ClsHttpClient._intInFlight,
+            "waiting": ClsHttpClient._intWaiting
+        }
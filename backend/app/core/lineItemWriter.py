@@ -0,0 +1,111 @@
+"""
+Line Item Writer - Bulk insert for quotation / invoice items
+
+All items of a document are written with ONE statement (unnest of column
+arrays) instead of one INSERT per item, so a 300 line quotation costs a
+single round-trip to the database.
+
+Usage:
+    from app.core.lineItemWriter import fnInsertLineItems
+
+    async with conn.transaction():
+        ...
+        await fnInsertLineItems(conn, "tbl_quotation_item", intQuotationId, mdlRequest.lstItems)
+"""
+
+from typing import List, Sequence
+
+
+# Item table -> parent FK column (whitelist, table names are never taken from input)
+DCT_ITEM_TABLES = {
+    "tbl_quotation_item": "fk_bint_quotation_id",
+    "tbl_invoice_item": "fk_bint_invoice_id",
+}
+
+
+def fnBuildInsertQuery(strItemTable: str) -> str:
+    """Build the unnest based multi-row INSERT for an item table"""
+    if strItemTable not in DCT_ITEM_TABLES:
+        raise ValueError(f"Unknown item table: {strItemTable}")
+
+    return f"""
+        INSERT INTO {strItemTable} (
+            {DCT_ITEM_TABLES[strItemTable]},
+            fk_bint_inventory_id,
+            vchr_item_code,
+            vchr_item_name,
+            vchr_unit,
+            dbl_quantity,
+            dbl_unit_price,
+            dbl_total_price,
+            int_sort_order
+        )
+        SELECT $1::bigint, *
+        FROM unnest(
+            $2::bigint[],
+            $3::varchar[],
+            $4::varchar[],
+            $5::varchar[],
+            $6::float8[],
+            $7::float8[],
+            $8::float8[],
+            $9::integer[]
+        )
+    """
+
+
+# Prebuilt queries (built once at import)
+DCT_INSERT_QUERIES = {strTable: fnBuildInsertQuery(strTable) for strTable in DCT_ITEM_TABLES}
+
+
+async def fnInsertLineItems(conn, strItemTable: str, intParentId: int, lstItems: Sequence) -> int:
+    """
+    Insert all line items of a quotation / invoice in a single round-trip
+
+    Args:
+        conn: asyncpg connection (call inside the document transaction)
+        strItemTable: tbl_quotation_item or tbl_invoice_item
+        intParentId: pk of the quotation / invoice
+        lstItems: item request models (MdlQuotationItemRequest / MdlInvoiceItemRequest)
+
+    Returns:
+        int: number of items written
+    """
+    if strItemTable not in DCT_INSERT_QUERIES:
+        raise ValueError(f"Unknown item table: {strItemTable}")
+
+    if not lstItems:
+        return 0
+
+    lstInventoryIds: List = []
+    lstItemCodes: List = []
+    lstItemNames: List = []
+    lstUnits: List = []
+    lstQuantities: List = []
+    lstUnitPrices: List = []
+    lstTotalPrices: List = []
+    lstSortOrders: List = []
+
+    for intIndex, mdlItem in enumerate(lstItems):
+        lstInventoryIds.append(mdlItem.intInventoryId)
+        lstItemCodes.append(mdlItem.strItemCode)
+        lstItemNames.append(mdlItem.strItemName)
+        lstUnits.append(mdlItem.strUnit)
+        lstQuantities.append(mdlItem.dblQuantity)
+        lstUnitPrices.append(mdlItem.dblUnitPrice)
+        lstTotalPrices.append(mdlItem.dblQuantity * mdlItem.dblUnitPrice)
+        lstSortOrders.append(mdlItem.intSortOrder or intIndex)
+
+    await conn.execute(
+        DCT_INSERT_QUERIES[strItemTable],
+        intParentId,
+        lstInventoryIds,
+        lstItemCodes,
+        lstItemNames,
+        lstUnits,
+        lstQuantities,
+        lstUnitPrices,
+        lstTotalPrices,
+        lstSortOrders
+    )
+    return len(lstItems)
@@ -7,6 +7,20 @@ Features:
 - Thread-safe singleton pattern
 - Daily rotating log files
 - Structured log format with timestamps
+- Non-blocking: logger.info() only puts the record on a bounded queue; one
+  background thread (QueueListener) does all file / console writes
+
+Queue (ClsLogQueue):
+- All loggers share ONE QueueHandler, ONE bounded queue and ONE writer
+  thread; the writer routes each record to its logger's file handlers by
+  logger name (ClsLogDispatcher)
+- Queue full (disk stalled / log storm): the new record is dropped and
+  counted, never blocking the event loop; the writer logs how many were
+  dropped (at most once a second) once it catches up
+- Flushed on shutdown (main.lifespan -> stopLogging) and at interpreter exit
+
+Config (.env, optional):
+    LOG_QUEUE_SIZE   (default 10000; 0 = write synchronously in the calling thread)
 
 Usage:
     from app.core.logger import getLogger, getUserLogger
@@ -21,12 +35,15 @@ Usage:
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
 import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict
-from logging.handlers import RotatingFileHandler
+from typing import Any, Optional, Dict, List
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 
 # Base path for logs
@@ -42,6 +59,139 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 5  # Keep 5 backup files
 
+# Pending records between the request path and the writer thread (0 = synchronous)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+APP_LOGGER_NAME = "quotely.app"
+FLT_DROP_REPORT_INTERVAL = 1.0  # seconds between "dropped N records" warnings
+
+
+class ClsDropQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: when the queue is full the record is dropped and counted"""
+
+    def __init__(self, insQueue: queue.Queue) -> None:
+        super().__init__(insQueue)
+        self.intDropped = 0
+        self.fnDirect = None   # set while no writer thread runs (after shutdown): write in the caller
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.fnDirect is not None:
+            self.fnDirect(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.intDropped += 1
+
+
+class ClsLogDispatcher(logging.Handler):
+    """Runs in the writer thread - hands each record to the handlers of the logger that created it"""
+
+    def __init__(self, insQueueHandler: ClsDropQueueHandler) -> None:
+        super().__init__()
+        self.insQueueHandler = insQueueHandler
+        self.dctHandlers: Dict[str, List[logging.Handler]] = {}
+        self.intDroppedReported = 0
+        self.fltReportedAt = 0.0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        intDropped = self.insQueueHandler.intDropped
+        if intDropped > self.intDroppedReported and time.monotonic() - self.fltReportedAt >= FLT_DROP_REPORT_INTERVAL:
+            self.fltReportedAt = time.monotonic()
+            self._fnDispatch(logging.makeLogRecord({
+                "name": APP_LOGGER_NAME,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full - dropped {intDropped - self.intDroppedReported} log records"
+            }))
+            self.intDroppedReported = intDropped
+        self._fnDispatch(record)
+        return True
+
+    def _fnDispatch(self, record: logging.LogRecord) -> None:
+        for handler in self.dctHandlers.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class ClsLogQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown - wait for room instead of raising
+        self.queue.put(self._sentinel)
+
+
+class ClsLogQueue:
+    """
+    Singleton queue + writer thread shared by the app logger and every user logger
+    Thread-safe implementation
+    """
+
+    _instance: Optional['ClsLogQueue'] = None
+    _lock: threading.Lock = threading.Lock()
+
+    def __new__(cls):
+        """Thread-safe singleton creation"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance.fnInit()
+        return cls._instance
+
+    def fnInit(self) -> None:
+        self.blnEnabled = LOG_QUEUE_SIZE > 0
+        self.insQueue: queue.Queue = queue.Queue(maxsize=max(0, LOG_QUEUE_SIZE))
+        self.insQueueHandler = ClsDropQueueHandler(self.insQueue)
+        self.insDispatcher = ClsLogDispatcher(self.insQueueHandler)
+        self.insListener: Optional[ClsLogQueueListener] = None
+
+    def fnStart(self) -> None:
+        """Start the writer thread (idempotent)"""
+        with ClsLogQueue._lock:
+            if not self.blnEnabled or self.insListener is not None:
+                return
+            self.insListener = ClsLogQueueListener(self.insQueue, self.insDispatcher)
+            self.insListener.start()
+            self.insQueueHandler.fnDirect = None
+        atexit.register(self.fnStop)
+
+    def fnStop(self) -> None:
+        """Write out everything still queued and stop the writer thread"""
+        with ClsLogQueue._lock:
+            insListener, self.insListener = self.insListener, None
+            if insListener is None:
+                return
+            # Records logged from now on are written directly, so nothing is left in the queue
+            self.insQueueHandler.fnDirect = self.insDispatcher.handle
+        insListener.stop()
+        atexit.unregister(self.fnStop)
+
+    def fnAttach(self, logger: logging.Logger, lstHandlers: List[logging.Handler]) -> None:
+        """Route logger through the queue to lstHandlers (or attach them directly when disabled)"""
+        if not self.blnEnabled:
+            for handler in lstHandlers:
+                logger.addHandler(handler)
+            return
+        self.insDispatcher.dctHandlers[logger.name] = lstHandlers
+        logger.addHandler(self.insQueueHandler)
+        self.fnStart()
+
+    def fnDetach(self, logger: logging.Logger) -> List[logging.Handler]:
+        """Stop routing logger; returns its file handlers for the caller to close"""
+        lstAttached = logger.handlers[:]
+        for handler in lstAttached:
+            logger.removeHandler(handler)
+        if not self.blnEnabled:
+            return lstAttached
+        return self.insDispatcher.dctHandlers.pop(logger.name, [])
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.blnEnabled,
+            "queued": self.insQueue.qsize(),
+            "max_queue": LOG_QUEUE_SIZE,
+            "dropped": self.insQueueHandler.intDropped
+        }
+
 
 class ClsAppLogger:
     """
@@ -76,7 +226,7 @@ class ClsAppLogger:
             LOG_APP_PATH.mkdir(parents=True, exist_ok=True)
 
             # Create logger
-            logger = logging.getLogger("quotely.app")
+            logger = logging.getLogger(APP_LOGGER_NAME)
             logger.setLevel(logging.DEBUG)
 
             # Prevent duplicate handlers
@@ -99,8 +249,8 @@ class ClsAppLogger:
             consoleHandler.setLevel(logging.INFO)
             consoleHandler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
 
-            logger.addHandler(fileHandler)
-            logger.addHandler(consoleHandler)
+            # Written by the background thread (see ClsLogQueue)
+            ClsLogQueue().fnAttach(logger, [fileHandler, consoleHandler])
 
             ClsAppLogger._logger = logger
             logger.info("=== App Logger Initialized ===")
@@ -186,7 +336,8 @@ class ClsUserLoggerManager:
                 fileHandler.setLevel(logging.DEBUG)
                 fileHandler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
 
-                logger.addHandler(fileHandler)
+                # Written by the background thread (see ClsLogQueue)
+                ClsLogQueue().fnAttach(logger, [fileHandler])
 
             # Don't propagate to root logger (avoid duplicate console output)
             logger.propagate = False
@@ -203,9 +354,8 @@ class ClsUserLoggerManager:
             with userLock:
                 if intUserId in ClsUserLoggerManager._user_loggers:
                     logger = ClsUserLoggerManager._user_loggers[intUserId]
-                    for handler in logger.handlers[:]:
+                    for handler in ClsLogQueue().fnDetach(logger):
                         handler.close()
-                        logger.removeHandler(handler)
                     del ClsUserLoggerManager._user_loggers[intUserId]
 
 
@@ -250,6 +400,24 @@ def getUserLogger(intUserId: int) -> logging.Logger:
     return ClsUserLoggerManager().fnGetUserLogger(intUserId)
 
 
+def startLogging() -> None:
+    """Start the background log writer (main.lifespan; also started by the first logger)"""
+    ClsLogQueue().fnStart()
+
+
+def stopLogging() -> None:
+    """
+    Flush queued log records and stop the writer thread (call at shutdown;
+    also registered with atexit)
+    """
+    ClsLogQueue().fnStop()
+
+
+def getLogStats() -> Dict[str, Any]:
+    """Queue depth and dropped-record counter for monitoring"""
+    return ClsLogQueue().fnGetStats()
+
+
 def closeUserLogger(intUserId: int) -> None:
     """
     Close user logger (call when user session ends or for cleanup)
@@ -0,0 +1,107 @@
+"""
+Keyset Pagination Helpers - Shared by list endpoints
+
+Lists are ordered by (tim_created_at DESC, pk DESC). The cursor is the
+(created_at, pk) of the last row of a page, encoded as an opaque string,
+so the next page is an index range scan - constant time no matter how
+much history a tenant has (no OFFSET).
+
+Usage:
+    from app.core.pagination import fnEncodeCursor, fnClampPageSize, fnBuildPageFilter
+
+    intPageSize = fnClampPageSize(mdlRequest.intPageSize)
+    strWhere, lstValues = fnBuildPageFilter(
+        intUserId, "pk_bint_quotation_id", mdlRequest.strCursor, intPageSize,
+        strStatusColumn="vchr_status", strStatus=mdlRequest.strStatus, ...
+    )
+    ... WHERE {strWhere} ORDER BY tim_created_at DESC, pk_... DESC LIMIT ${len(lstValues)}
+    strNextCursor = fnEncodeCursor(row['tim_created_at'], row['pk_...'])
+"""
+
+import base64
+import datetime
+from typing import Any, List, Optional, Tuple
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def fnClampPageSize(intPageSize: Optional[int]) -> int:
+    """Keep page size within 1..MAX_PAGE_SIZE"""
+    if not intPageSize:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(intPageSize, MAX_PAGE_SIZE))
+
+
+def fnEncodeCursor(timCreatedAt: datetime.datetime, intPkId: int) -> str:
+    """(created_at, pk) -> opaque url-safe cursor"""
+    strRaw = f"{timCreatedAt.isoformat()}|{intPkId}"
+    return base64.urlsafe_b64encode(strRaw.encode("utf-8")).decode("ascii")
+
+
+def fnDecodeCursor(strCursor: Optional[str]) -> Optional[Tuple[datetime.datetime, int]]:
+    """
+    Opaque cursor -> (created_at, pk)
+
+    Returns None for first page (no cursor).
+    Raises ValueError for a malformed cursor.
+    """
+    if not strCursor:
+        return None
+
+    try:
+        strRaw = base64.urlsafe_b64decode(strCursor.encode("ascii")).decode("utf-8")
+        strCreatedAt, strPkId = strRaw.rsplit("|", 1)
+        return datetime.datetime.fromisoformat(strCreatedAt), int(strPkId)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def fnBuildPageFilter(
+    intUserId: int,
+    strPkColumn: str,
+    strCursor: Optional[str],
+    intPageSize: int,
+    strStatusColumn: str,
+    strStatus: Optional[str] = None,
+    strDateColumn: Optional[str] = None,
+    datFromDate: Optional[datetime.date] = None,
+    datToDate: Optional[datetime.date] = None,
+    strCustomer: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """
+    WHERE clause + values for one keyset page of a tenant's documents
+    (tbl_quotation / tbl_invoice - same user, created_at and customer columns).
+
+    The last value is the LIMIT (intPageSize + 1 - the extra row tells if
+    there is a next page); reference it as ${len(lstValues)}.
+    Raises ValueError for a malformed cursor.
+    """
+    tupCursor = fnDecodeCursor(strCursor)
+
+    lstConditions = ["fk_bint_user_id = $1"]
+    lstValues: List[Any] = [intUserId]
+
+    def fnAdd(strCondition: str, value: Any) -> None:
+        lstValues.append(value)
+        lstConditions.append(strCondition.format(p=f"${len(lstValues)}"))
+
+    if tupCursor is not None:
+        lstValues.extend(tupCursor)
+        lstConditions.append(f"(tim_created_at, {strPkColumn}) < (${len(lstValues) - 1}, ${len(lstValues)})")
+
+    if strStatus:
+        fnAdd(f"{strStatusColumn} = {{p}}", strStatus)
+
+    if datFromDate:
+        fnAdd(f"{strDateColumn} >= {{p}}", datFromDate)
+
+    if datToDate:
+        fnAdd(f"{strDateColumn} <= {{p}}", datToDate)
+
+    if strCustomer:
+        fnAdd("(vchr_customer_name ILIKE {p} OR vchr_customer_phone ILIKE {p})", f"%{strCustomer.strip()}%")
+
+    lstValues.append(intPageSize + 1)
+    return " AND ".join(lstConditions), lstValues
@@ -0,0 +1,127 @@
+"""
+Password Hasher - bcrypt hash / verify off the event loop
+
+A bcrypt verify is ~250ms of pure CPU. Called directly from an async handler
+it blocks the event loop, so a burst of logins stalls every other request on
+that worker. fnHashPassword / fnVerifyPassword (app.core.security) run here
+in a small thread pool instead: the bcrypt C extension releases the GIL, so
+the event loop keeps serving while hashes are computed, and no pickling or
+extra processes are needed.
+
+PASSWORD_HASH_WORKERS threads bound the CPU that logins can take. At most
+PASSWORD_HASH_MAX_QUEUE hashes may be waiting or running per app worker;
+beyond that ClsPasswordHasherBusyError is raised so the login answers 503
+instead of queueing for tens of seconds.
+
+Config (.env, all optional):
+    PASSWORD_HASH_WORKERS       (default min(4, cpu count); 0 = hash inline on the event loop)
+    PASSWORD_HASH_MAX_QUEUE     (default 64 x workers)
+
+Usage:
+    from app.core.passwordHasher import ClsPasswordHasher
+
+    blnValid = await ClsPasswordHasher().fnVerify(strPlainPassword, strHashedPassword)
+    strHash = await ClsPasswordHasher().fnHash(strPassword)
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.security import fnHashPassword, fnVerifyPassword
+from app.core.logger import getLogger
+
+logger = getLogger()
+
+
+class ClsPasswordHasherBusyError(Exception):
+    """Too many password hashes waiting for a thread"""
+
+
+class ClsPasswordHasher:
+    """Singleton bounded thread pool for bcrypt - Only ONE pool per app worker"""
+
+    _instance: Optional['ClsPasswordHasher'] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _intWorkers: int = 0
+    _intMaxQueue: int = 0
+    _intPending: int = 0
+    _intCompleted: int = 0
+    _intRejected: int = 0
+
+    def __new__(cls):
+        """Create only one instance (Singleton)"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def fnStart(self) -> None:
+        """Start the hashing threads (called from main.lifespan)"""
+        if ClsPasswordHasher._executor is not None:
+            return
+
+        intWorkers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        ClsPasswordHasher._intWorkers = max(0, intWorkers)
+        ClsPasswordHasher._intMaxQueue = int(
+            os.getenv("PASSWORD_HASH_MAX_QUEUE", str(max(1, intWorkers) * 64))
+        )
+
+        if ClsPasswordHasher._intWorkers == 0:
+            logger.info("Password hashing inline (PASSWORD_HASH_WORKERS=0)")
+            return
+
+        ClsPasswordHasher._executor = ThreadPoolExecutor(
+            max_workers=ClsPasswordHasher._intWorkers,
+            thread_name_prefix="bcrypt"
+        )
+        logger.info(
+            f"Password hasher started | workers={ClsPasswordHasher._intWorkers} "
+            f"| max_queue={ClsPasswordHasher._intMaxQueue}"
+        )
+
+    def fnStop(self) -> None:
+        """Shut the hashing threads down (called from main.lifespan shutdown)"""
+        if ClsPasswordHasher._executor is not None:
+            ClsPasswordHasher._executor.shutdown(wait=True, cancel_futures=True)
+            ClsPasswordHasher._executor = None
+            logger.info("Password hasher stopped")
+
+    async def fnRun(self, fnWork: Callable[..., Any], *args) -> Any:
+        if ClsPasswordHasher._intMaxQueue == 0:
+            self.fnStart()  # lifespan did not run (scripts)
+
+        if ClsPasswordHasher._intPending >= ClsPasswordHasher._intMaxQueue:
+            ClsPasswordHasher._intRejected += 1
+            raise ClsPasswordHasherBusyError(
+                f"Password hashing queue full ({ClsPasswordHasher._intMaxQueue} pending) - try again shortly"
+            )
+
+        ClsPasswordHasher._intPending += 1
+        try:
+            if ClsPasswordHasher._executor is None:
+                result = fnWork(*args)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(ClsPasswordHasher._executor, fnWork, *args)
+            ClsPasswordHasher._intCompleted += 1
+            return result
+        finally:
+            ClsPasswordHasher._intPending -= 1
+
+    async def fnHash(self, strPassword: str) -> str:
+        """bcrypt hash in the pool"""
+        return await self.fnRun(fnHashPassword, strPassword)
+
+    async def fnVerify(self, strPlainPassword: str, strHashedPassword: str) -> bool:
+        """bcrypt verify in the pool"""
+        return await self.fnRun(fnVerifyPassword, strPlainPassword, strHashedPassword)
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        return {
+            "workers": ClsPasswordHasher._intWorkers,
+            "max_queue": ClsPasswordHasher._intMaxQueue,
+            "pending": ClsPasswordHasher._intPending,
+            "completed": ClsPasswordHasher._intCompleted,
+            "rejected": ClsPasswordHasher._intRejected
+        }
@@ -0,0 +1,139 @@
+"""
+Sliding Window Rate Limiter - In-memory, per key (IP, email, ...)
+
+Sliding window counter: each key keeps the count of the current and the
+previous fixed window; the rate is estimated as
+
+    previous * (share of the previous window still inside the sliding window) + current
+
+which is O(1) time and memory per key (no timestamp lists) and smooths the
+burst a plain fixed window allows at every boundary.
+
+Memory stays bounded: keys whose windows have both passed are swept once per
+window, and past intMaxKeys the oldest keys are dropped (down to 90%).
+
+Usage:
+    from app.core.rateLimiter import ClsSlidingWindowLimiter
+
+    insLimiter = ClsSlidingWindowLimiter(intLimit=20, fltWindowSeconds=60)
+
+    fltRetryAfter = insLimiter.fnHit(strClientIp)      # counts the attempt
+    if fltRetryAfter:
+        raise HTTPException(429, headers={"Retry-After": str(math.ceil(fltRetryAfter))})
+
+    insLimiter.fnCheck(strEmail)        # check only (e.g. failed attempts)
+    insLimiter.fnRecord(strEmail)       # count without checking
+    insLimiter.fnReset(strEmail)        # e.g. after a successful login
+
+NOTE: Limits are per worker process. Not thread-safe - call from the event loop.
+"""
+
+import time
+from itertools import islice
+from typing import Any, Dict, Hashable, List
+
+FLT_TRIM_TARGET = 0.9
+
+
+class ClsSlidingWindowLimiter:
+    """Sliding window counter per key with periodic eviction and counters"""
+
+    def __init__(self, intLimit: int, fltWindowSeconds: float, intMaxKeys: int = 100_000) -> None:
+        self.intLimit = intLimit
+        self.fltWindowSeconds = fltWindowSeconds
+        self.intMaxKeys = intMaxKeys
+        self._dctWindows: Dict[Hashable, List[int]] = {}   # key -> [window index, previous count, current count]
+        self.fltNextSweepAt = time.monotonic() + fltWindowSeconds
+        self.intAllowed = 0
+        self.intRejected = 0
+        self.intEvictions = 0
+
+    def _fnWindow(self, key: Hashable, intIndex: int) -> List[int]:
+        """Window entry for key, rolled forward to window intIndex"""
+        lstWindow = self._dctWindows.get(key)
+        if lstWindow is None:
+            return [intIndex, 0, 0]
+        if lstWindow[0] == intIndex - 1:
+            lstWindow[:] = [intIndex, lstWindow[2], 0]
+        elif lstWindow[0] < intIndex - 1:
+            lstWindow[:] = [intIndex, 0, 0]
+        return lstWindow
+
+    def _fnSweep(self, fltNow: float) -> None:
+        """Drop keys with no hits in the last two windows (once per window)"""
+        intIndex = int(fltNow // self.fltWindowSeconds)
+        lstStale = [key for key, lstWindow in self._dctWindows.items() if lstWindow[0] < intIndex - 1]
+        for key in lstStale:
+            del self._dctWindows[key]
+        self.fltNextSweepAt = fltNow + self.fltWindowSeconds
+
+    def _fnTrim(self) -> None:
+        """Over intMaxKeys (flood of new keys) - drop the oldest down to 90% in one pass"""
+        intDrop = len(self._dctWindows) - int(self.intMaxKeys * FLT_TRIM_TARGET)
+        for key in list(islice(self._dctWindows, intDrop)):   # oldest first (insertion order)
+            del self._dctWindows[key]
+        self.intEvictions += intDrop
+
+    def fnRetryAfter(self, key: Hashable) -> float:
+        """Seconds until key is under the limit again; 0.0 = allowed (nothing is counted)"""
+        fltNow = time.monotonic()
+        intIndex = int(fltNow // self.fltWindowSeconds)
+        lstWindow = self._dctWindows.get(key)
+        if lstWindow is None:
+            return 0.0
+
+        _, intPrevious, intCurrent = self._fnWindow(key, intIndex)
+        fltElapsed = fltNow - intIndex * self.fltWindowSeconds
+        fltPreviousWeight = 1.0 - fltElapsed / self.fltWindowSeconds
+        if intPrevious * fltPreviousWeight + intCurrent < self.intLimit:
+            return 0.0
+
+        if intCurrent >= self.intLimit:
+            # Over on this window alone - wait for it to become the previous one and decay
+            fltDecay = (intCurrent - self.intLimit) / intCurrent
+            return (self.fltWindowSeconds - fltElapsed) + fltDecay * self.fltWindowSeconds + 0.001
+        # Wait until enough of the previous window has slid out
+        fltNeededWeight = (self.intLimit - intCurrent) / intPrevious
+        return max(0.001, (1.0 - fltNeededWeight) * self.fltWindowSeconds - fltElapsed)
+
+    def fnRecord(self, key: Hashable) -> None:
+        """Count one hit for key without checking the limit"""
+        fltNow = time.monotonic()
+        if fltNow >= self.fltNextSweepAt:
+            self._fnSweep(fltNow)
+        lstWindow = self._fnWindow(key, int(fltNow // self.fltWindowSeconds))
+        lstWindow[2] += 1
+        self._dctWindows[key] = lstWindow
+        if len(self._dctWindows) > self.intMaxKeys:
+            self._fnTrim()
+
+    def fnCheck(self, key: Hashable) -> float:
+        """fnRetryAfter, counted in the allowed / rejected stats (the attempt itself is not recorded)"""
+        fltRetryAfter = self.fnRetryAfter(key)
+        if fltRetryAfter:
+            self.intRejected += 1
+        else:
+            self.intAllowed += 1
+        return fltRetryAfter
+
+    def fnHit(self, key: Hashable) -> float:
+        """Check and count one attempt. Returns 0.0 if allowed, else seconds to wait (not counted)."""
+        fltRetryAfter = self.fnCheck(key)
+        if not fltRetryAfter:
+            self.fnRecord(key)
+        return fltRetryAfter
+
+    def fnReset(self, key: Hashable) -> None:
+        self._dctWindows.pop(key, None)
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "keys": len(self._dctWindows),
+            "max_keys": self.intMaxKeys,
+            "limit": self.intLimit,
+            "window_seconds": self.fltWindowSeconds,
+            "allowed": self.intAllowed,
+            "rejected": self.intRejected,
+            "evictions": self.intEvictions
+        }
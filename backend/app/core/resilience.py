@@ -0,0 +1,202 @@
+"""
+Resilience Primitives - Token bucket, circuit breaker, retry delay
+
+Used to protect calls to external providers (Groq):
+- ClsTokenBucket     : async token bucket (e.g. requests/min, tokens/min)
+- ClsCircuitBreaker  : fail fast while a provider is down
+- fnRetryDelay       : jittered exponential backoff honoring Retry-After
+
+Usage:
+    from app.core.resilience import ClsTokenBucket, ClsCircuitBreaker, ClsCircuitOpenError, fnRetryDelay
+
+    insBucket = ClsTokenBucket(intPerMinute=30)
+    fltWaited = await insBucket.fnAcquire()
+
+    insBreaker = ClsCircuitBreaker(intFailureThreshold=5, fltCooldownSeconds=30)
+    blnTrial = insBreaker.fnCheck()     # raises ClsCircuitOpenError when open
+    insBreaker.fnRecordSuccess() / insBreaker.fnRecordFailure()
+    insBreaker.fnReleaseTrial()         # trial call abandoned (cancelled) before an outcome
+"""
+
+import time
+import random
+import asyncio
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+
+class ClsTokenBucket:
+    """
+    Async token bucket refilled continuously at intPerMinute / 60 per second.
+
+    fnAcquire waits (FIFO) until enough tokens are available. fnPause
+    empties the bucket until a given time (provider said Retry-After).
+    """
+
+    def __init__(self, intPerMinute: int) -> None:
+        self.fltCapacity = float(intPerMinute)
+        self.fltRate = intPerMinute / 60.0
+        self.fltTokens = self.fltCapacity
+        self.fltUpdatedAt = time.monotonic()
+        self.fltPausedUntil = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fnRefill(self) -> None:
+        fltNow = time.monotonic()
+        if fltNow <= self.fltUpdatedAt:
+            return  # paused - refill starts when the pause ends
+        self.fltTokens = min(self.fltCapacity, self.fltTokens + (fltNow - self.fltUpdatedAt) * self.fltRate)
+        self.fltUpdatedAt = fltNow
+
+    async def fnAcquire(self, fltAmount: float = 1.0) -> float:
+        """Take fltAmount tokens (capped at capacity), waiting if needed. Returns seconds waited."""
+        fltAmount = min(fltAmount, self.fltCapacity)
+        fltStart = time.monotonic()
+
+        async with self._lock:
+            while True:
+                fltNow = time.monotonic()
+                if fltNow < self.fltPausedUntil:
+                    await asyncio.sleep(self.fltPausedUntil - fltNow)
+                    continue
+
+                self._fnRefill()
+                if self.fltTokens >= fltAmount:
+                    self.fltTokens -= fltAmount
+                    return time.monotonic() - fltStart
+
+                await asyncio.sleep((fltAmount - self.fltTokens) / self.fltRate)
+
+    def fnAdjust(self, fltDelta: float) -> None:
+        """Correct an estimate afterwards (+ refund, - extra charge; may go negative)"""
+        self._fnRefill()
+        self.fltTokens = min(self.fltCapacity, self.fltTokens + fltDelta)
+
+    def fnPause(self, fltSeconds: float) -> None:
+        """Stop handing out tokens for fltSeconds and start refilling from empty"""
+        self.fltPausedUntil = max(self.fltPausedUntil, time.monotonic() + fltSeconds)
+        self.fltTokens = 0.0
+        self.fltUpdatedAt = self.fltPausedUntil
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        self._fnRefill()
+        return {
+            "capacity": self.fltCapacity,
+            "available": round(max(self.fltTokens, 0.0), 2),
+            "paused_for_seconds": round(max(0.0, self.fltPausedUntil - time.monotonic()), 2)
+        }
+
+
+class ClsCircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+    def __init__(self, fltRetryInSeconds: float) -> None:
+        self.fltRetryInSeconds = fltRetryInSeconds
+        super().__init__(f"Circuit open - provider unavailable, retry in {fltRetryInSeconds:.0f}s")
+
+
+class ClsCircuitBreaker:
+    """
+    closed    -> calls pass; intFailureThreshold consecutive failures open it
+    open      -> calls fail fast with ClsCircuitOpenError for fltCooldownSeconds
+    half_open -> one trial call; success closes, failure re-opens
+
+    A trial that ends without an outcome must be handed back with
+    fnReleaseTrial; one still in flight after fltCooldownSeconds is treated
+    as lost, so a leaked trial can never block the provider for good.
+    """
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+
+    def __init__(self, intFailureThreshold: int = 5, fltCooldownSeconds: float = 30.0) -> None:
+        self.intFailureThreshold = intFailureThreshold
+        self.fltCooldownSeconds = fltCooldownSeconds
+        self.strState = self.STATE_CLOSED
+        self.intFailures = 0
+        self.fltOpenedAt = 0.0
+        self.blnTrialInFlight = False
+        self.fltTrialStartedAt = 0.0
+        self.intRejected = 0
+
+    def fnCheck(self) -> bool:
+        """
+        Call before each attempt. Raises ClsCircuitOpenError when the call must not go out.
+
+        Returns True when this call is the half-open trial.
+        """
+        if self.strState == self.STATE_OPEN:
+            fltRemaining = self.fltOpenedAt + self.fltCooldownSeconds - time.monotonic()
+            if fltRemaining > 0:
+                self.intRejected += 1
+                raise ClsCircuitOpenError(fltRemaining)
+            self.strState = self.STATE_HALF_OPEN
+            self.blnTrialInFlight = False
+
+        if self.strState == self.STATE_HALF_OPEN:
+            fltNow = time.monotonic()
+            if self.blnTrialInFlight and fltNow - self.fltTrialStartedAt < self.fltCooldownSeconds:
+                self.intRejected += 1
+                raise ClsCircuitOpenError(self.fltTrialStartedAt + self.fltCooldownSeconds - fltNow)
+            self.blnTrialInFlight = True
+            self.fltTrialStartedAt = fltNow
+            return True
+        return False
+
+    def fnReleaseTrial(self) -> None:
+        """The trial call ended without an outcome - let the next call be the trial"""
+        self.blnTrialInFlight = False
+
+    def fnRecordSuccess(self) -> None:
+        self.strState = self.STATE_CLOSED
+        self.intFailures = 0
+        self.blnTrialInFlight = False
+
+    def fnRecordFailure(self) -> None:
+        self.intFailures += 1
+        self.blnTrialInFlight = False
+        if self.strState == self.STATE_HALF_OPEN or self.intFailures >= self.intFailureThreshold:
+            self.strState = self.STATE_OPEN
+            self.fltOpenedAt = time.monotonic()
+
+    def fnGetStats(self) -> Dict[str, Any]:
+        return {
+            "state": self.strState,
+            "consecutive_failures": self.intFailures,
+            "rejected": self.intRejected
+        }
+
+
+def fnParseRetryAfter(strRetryAfter: Optional[str]) -> Optional[float]:
+    """Retry-After header (seconds or HTTP date) -> seconds, None if absent/invalid"""
+    if not strRetryAfter:
+        return None
+    try:
+        return max(0.0, float(strRetryAfter))
+    except ValueError:
+        pass
+    try:
+        datRetry = parsedate_to_datetime(strRetryAfter)
+        return max(0.0, (datRetry - datetime.datetime.now(datRetry.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def fnRetryDelay(
+    intAttempt: int,
+    strRetryAfter: Optional[str] = None,
+    fltBaseSeconds: float = 0.5,
+    fltMaxSeconds: float = 30.0
+) -> float:
+    """
+    Seconds to wait before retry number intAttempt (1-based).
+
+    Full-jitter exponential backoff; a Retry-After header sets the minimum.
+    """
+    fltBackoff = random.uniform(0, min(fltMaxSeconds, fltBaseSeconds * (2 ** intAttempt)))
+    fltRetryAfter = fnParseRetryAfter(strRetryAfter)
+    if fltRetryAfter is not None:
+        return min(fltMaxSeconds, max(fltRetryAfter, fltBackoff))
+    return fltBackoff
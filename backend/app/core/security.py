@@ -1,14 +1,24 @@
+import os
+import time
+import hashlib
 from typing import Optional, Dict, Annotated
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from fastapi import Header, HTTPException, status, Depends
 from passlib.context import CryptContext
 
+from app.core.cache import ClsTTLCache
+
 # Hardcoded for now (later use config.py)
 JWT_SECRET_KEY = "QUTATION_SAAS_SECURE_VISION_25"
 JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Verified tokens -> decoded claims, kept until the token expires.
+# A repeat request costs one SHA-256 + dict lookup instead of an HMAC verify + JSON parse.
+JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", "4096"))
+insTokenCache = ClsTTLCache(intMaxSize=JWT_CACHE_MAX_SIZE)
+
 # Admin user ID (always pk_bint_user_id = 1)
 ADMIN_USER_ID = 1
 
@@ -36,12 +46,28 @@ def fnCreateAccesToken(data: dict, expires_delta: Optional[timedelta] = None) ->
     return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 def fnDecodeAccessToken(token: str) -> Optional[Dict]:
-    """Decode JWT token"""
+    """
+    Decode JWT token (cached per token until its exp).
+
+    Only successfully verified tokens are cached, keyed by their SHA-256, so
+    a forged token can never be served from the cache. The returned claims
+    are shared between requests - do not modify them.
+    """
+    bytKey = hashlib.sha256(token.encode("utf-8")).digest()
+    dctPayload = insTokenCache.fnGet(bytKey)
+    if dctPayload is not None:
+        return dctPayload
+
     try:
-        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        dctPayload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
 
+    fltTtl = dctPayload["exp"] - time.time() if "exp" in dctPayload else JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    if fltTtl > 0:
+        insTokenCache.fnSet(bytKey, dctPayload, fltTtlSeconds=fltTtl)
+    return dctPayload
+
 
 async def fnGetCurrentUser(
     authorization: Annotated[Optional[str], Header(description="Bearer token")] = None,
@@ -16,7 +16,13 @@ import asyncio
 import os
 
 from app.core.database import ClsDatabasepool
-from app.core.logger import getLogger
+from app.core.httpClient import ClsHttpClient
+from app.core.logger import getLogger, startLogging, stopLogging
+from app.api.ai.promptCache import fnLoadSystemPrompt
+from app.api.ai.batchQueue import ClsAIBatchQueue
+from app.api.ai.responseCache import ClsCacheHitRecorder
+from app.api.pdf.renderPool import ClsPDFRenderPool
+from app.core.passwordHasher import ClsPasswordHasher
 
 # Initialize app logger
 logger = getLogger()
@@ -46,19 +52,46 @@ async def fnConnectDbBackground():
 @asynccontextmanager
 async def lifespan(app:FastAPI):
     """Application life span - Start server first, connect DB in background"""
+    startLogging()
     logger.info("Starting Quotely API Server...")
 
     # Start DB connection in background (non-blocking)
     # Server starts immediately, DB connects while server is running
     asyncio.create_task(fnConnectDbBackground())
 
+    # Load AI system prompt once (reloaded later only if the file changes)
+    fnLoadSystemPrompt()
+
+    # Shared pooled HTTP client for Groq (keep-alive, HTTP/2)
+    await ClsHttpClient().fnStart()
+
+    # Background workers for /ai/batch (recovers queued items once DB is up)
+    await ClsAIBatchQueue().fnStart()
+
+    # AI response cache hit counters, written to the DB in batches
+    await ClsCacheHitRecorder().fnStart()
+
+    # Worker processes for CPU-bound PDF rendering
+    ClsPDFRenderPool().fnStart()
+
+    # Bounded thread pool for bcrypt (login / create user)
+    ClsPasswordHasher().fnStart()
+
     yield
 
     # Shutdown
+    await ClsAIBatchQueue().fnStop()
+    await ClsCacheHitRecorder().fnStop()
+    ClsPDFRenderPool().fnStop()
+    ClsPasswordHasher().fnStop()
+    await ClsHttpClient().fnClose()
     insDb = ClsDatabasepool()
     await insDb.fnDisconnectPool()
     logger.info("Shutting down Quotely API Server...")
 
+    # Write out queued log records last
+    stopLogging()
+
 
 
 def fnCreateApp() -> FastAPI:
@@ -0,0 +1,112 @@
+"""
+Benchmark - Groq calls: new httpx.AsyncClient per request vs shared pooled client
+
+Starts misc/benchmark/stubGroq.py (unless BENCH_URL points elsewhere), then
+sends the same chat completion request INT_REQUESTS times at
+INT_CONCURRENCY, once opening a client per request (old behaviour) and once
+through ClsHttpClient, and prints p50/p99 latency for each.
+
+Against the local stub only TCP setup is saved; point BENCH_URL at a real
+HTTPS endpoint to include the TLS handshake.
+
+Usage (from backend/):
+    python misc/benchmark/benchAiHttpClient.py
+    BENCH_URL=https://api.groq.com/openai/v1/chat/completions BENCH_KEY=... python misc/benchmark/benchAiHttpClient.py
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import subprocess
+import statistics
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.core.httpClient import ClsHttpClient
+
+INT_REQUESTS = 400
+INT_CONCURRENCY = 8
+INT_STUB_PORT = 8089
+STR_URL = os.getenv("BENCH_URL", f"http://127.0.0.1:{INT_STUB_PORT}/openai/v1/chat/completions")
+DCT_HEADERS = {"Authorization": f"Bearer {os.getenv('BENCH_KEY', 'stub')}", "Content-Type": "application/json"}
+DCT_PAYLOAD = {
+    "model": "llama-3.3-70b-versatile",
+    "messages": [{"role": "user", "content": "4 cameras with NVR for a shop"}],
+    "max_tokens": 16
+}
+
+
+def fnWaitForPort(intPort: int, fltTimeout: float = 10.0) -> None:
+    fltDeadline = time.monotonic() + fltTimeout
+    while time.monotonic() < fltDeadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", intPort)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError("Stub server did not start")
+
+
+def fnPercentile(lstValues, fltPct: float) -> float:
+    lstSorted = sorted(lstValues)
+    return lstSorted[min(len(lstSorted) - 1, int(round(fltPct / 100 * (len(lstSorted) - 1))))]
+
+
+async def fnPerRequestClient() -> None:
+    async with httpx.AsyncClient(timeout=30.0) as insClient:
+        insResponse = await insClient.post(STR_URL, headers=DCT_HEADERS, json=DCT_PAYLOAD)
+        insResponse.raise_for_status()
+
+
+async def fnSharedClient() -> None:
+    insResponse = await ClsHttpClient().fnPost(STR_URL, headers=DCT_HEADERS, json=DCT_PAYLOAD)
+    insResponse.raise_for_status()
+
+
+async def fnRun(strLabel: str, fnCall) -> None:
+    lstLatency = []
+    semLimit = asyncio.Semaphore(INT_CONCURRENCY)
+
+    async def fnOne():
+        async with semLimit:
+            fltStart = time.perf_counter()
+            await fnCall()
+            lstLatency.append((time.perf_counter() - fltStart) * 1000)
+
+    fltStart = time.perf_counter()
+    await asyncio.gather(*[fnOne() for _ in range(INT_REQUESTS)])
+    fltTotal = time.perf_counter() - fltStart
+
+    print(
+        f"{strLabel:<22} p50 {statistics.median(lstLatency):7.2f} ms | "
+        f"p99 {fnPercentile(lstLatency, 99):7.2f} ms | {INT_REQUESTS / fltTotal:7.1f} req/s"
+    )
+
+
+async def main():
+    await ClsHttpClient().fnStart()
+    try:
+        await fnRun("Client per request", fnPerRequestClient)
+        await fnRun("Shared pooled client", fnSharedClient)
+    finally:
+        await ClsHttpClient().fnClose()
+
+
+if __name__ == "__main__":
+    procStub = None
+    if "BENCH_URL" not in os.environ:
+        procStub = subprocess.Popen(
+            [sys.executable, str(Path(__file__).with_name("stubGroq.py"))],
+            env={**os.environ, "STUB_PORT": str(INT_STUB_PORT)}
+        )
+        fnWaitForPort(INT_STUB_PORT)
+    try:
+        asyncio.run(main())
+    finally:
+        if procStub:
+            procStub.terminate()
+            procStub.wait()
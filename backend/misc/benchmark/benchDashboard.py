@@ -0,0 +1,119 @@
+"""
+Benchmark - Dashboard summary: live aggregates vs materialized rollup
+
+Creates a throwaway tenant with 100k invoices (generate_series), builds
+the rollup, then times the old three aggregate queries against the
+single-row rollup read. The tenant is deleted at the end (CASCADE).
+
+Usage (from backend/):
+    python misc/benchmark/benchDashboard.py
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import statistics
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+load_dotenv(Path(__file__).resolve().parents[2] / "app" / ".env")
+
+from app.core.database import ClsDatabasepool
+from app.api.dashboard.rollup import fnReconcileDashboard
+from app.api.dashboard.service import ClsDashboardService
+
+INT_INVOICES = 100_000
+INT_ROUNDS = 20
+
+
+async def fnOldSummary(conn, intUserId: int) -> None:
+    """The three queries the dashboard used to run on every load"""
+    await conn.fetchrow("""
+        SELECT
+            COALESCE(SUM(dbl_total_amount), 0) as total_collected,
+            COUNT(*) as total_invoices,
+            COUNT(CASE WHEN vchr_payment_status = 'paid' THEN 1 END) as paid_invoices,
+            COUNT(CASE WHEN vchr_payment_status != 'paid' THEN 1 END) as pending_invoices
+        FROM tbl_invoice
+        WHERE fk_bint_user_id = $1
+    """, intUserId)
+    await conn.fetchrow("""
+        SELECT
+            COALESCE(SUM(dbl_total_amount), 0) as today_earnings,
+            COUNT(*) as today_invoices
+        FROM tbl_invoice
+        WHERE fk_bint_user_id = $1
+        AND DATE(dat_invoice_date) = CURRENT_DATE
+    """, intUserId)
+    await conn.fetchrow("SELECT COUNT(*) as total_quotations FROM tbl_quotation WHERE fk_bint_user_id = $1", intUserId)
+
+
+async def main():
+    insDb = ClsDatabasepool()
+    pool = await insDb.fnGetPool()
+
+    async with pool.acquire() as conn:
+        intUserId = await conn.fetchval(
+            """
+            INSERT INTO tbl_user (vchr_email, vchr_username, vchr_password_hash)
+            VALUES ($1, 'bench', 'x')
+            RETURNING pk_bint_user_id
+            """,
+            f"bench-{uuid.uuid4().hex[:12]}@quotely.test"
+        )
+
+    try:
+        print(f"Seeding {INT_INVOICES} invoices...")
+        async with pool.acquire() as conn:
+            await conn.execute("""
+                INSERT INTO tbl_invoice (
+                    fk_bint_user_id, vchr_invoice_number, dat_invoice_date,
+                    vchr_customer_name, dbl_total_amount, vchr_payment_status
+                )
+                SELECT
+                    $1,
+                    'BENCH-' || g,
+                    CURRENT_DATE - (g % 1095),
+                    'Customer ' || g,
+                    1000 + (g % 500),
+                    CASE WHEN g % 3 = 0 THEN 'pending' ELSE 'paid' END
+                FROM generate_series(1, $2) g
+            """, intUserId, INT_INVOICES)
+            await conn.execute("ANALYZE tbl_invoice")
+            await fnReconcileDashboard(conn, intUserId)
+
+        insService = ClsDashboardService(pool, intUserId)
+
+        lstOld = []
+        lstNew = []
+        for _ in range(INT_ROUNDS):
+            async with pool.acquire() as conn:
+                fltStart = time.perf_counter()
+                await fnOldSummary(conn, intUserId)
+                lstOld.append((time.perf_counter() - fltStart) * 1000)
+
+            fltStart = time.perf_counter()
+            await insService.fnGetDashboardSummary()
+            lstNew.append((time.perf_counter() - fltStart) * 1000)
+
+        fltOld = statistics.median(lstOld)
+        fltNew = statistics.median(lstNew)
+        print(f"Live aggregates : {fltOld:8.2f} ms (median of {INT_ROUNDS})")
+        print(f"Rollup row      : {fltNew:8.2f} ms (median of {INT_ROUNDS})")
+        print(f"Speedup         : {fltOld / fltNew:8.1f}x")
+
+        async with pool.acquire() as conn:
+            fltStart = time.perf_counter()
+            await fnReconcileDashboard(conn, intUserId)
+            print(f"Reconcile (full rebuild of tenant): {(time.perf_counter() - fltStart) * 1000:.2f} ms")
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM tbl_user WHERE pk_bint_user_id = $1", intUserId)
+        await insDb.fnDisconnectPool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark - Line item insert: per-item INSERT vs single bulk INSERT
+
+Measures the time to write the items of ONE quotation at 10 / 100 / 1000
+items, old path (one awaited execute per item) vs fnInsertLineItems.
+Runs against the database in app/.env using TEMP tables (nothing is kept).
+
+Usage (from backend/):
+    python misc/benchmark/benchLineItems.py
+"""
+
+import os
+import sys
+import time
+import asyncio
+import statistics
+from pathlib import Path
+
+import asyncpg
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+load_dotenv(Path(__file__).resolve().parents[2] / "app" / ".env")
+
+from app.api.quotation.schema import MdlQuotationItemRequest
+from app.core.lineItemWriter import fnInsertLineItems
+
+LST_ITEM_COUNTS = [10, 100, 1000]
+INT_ROUNDS = 5
+
+STR_SINGLE_INSERT = """
+    INSERT INTO tbl_quotation_item (
+        fk_bint_quotation_id,
+        fk_bint_inventory_id,
+        vchr_item_code,
+        vchr_item_name,
+        vchr_unit,
+        dbl_quantity,
+        dbl_unit_price,
+        dbl_total_price,
+        int_sort_order
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+"""
+
+
+def fnMakeItems(intCount: int):
+    return [
+        MdlQuotationItemRequest(
+            strItemCode=f"CAM-{intIndex:04d}",
+            strItemName=f"Hikvision 2MP Camera {intIndex}",
+            dblQuantity=4,
+            dblUnitPrice=2500.0,
+            intSortOrder=intIndex
+        )
+        for intIndex in range(intCount)
+    ]
+
+
+async def fnInsertPerItem(conn, intParentId: int, lstItems) -> None:
+    """Old path - one round-trip per item"""
+    for intIndex, mdlItem in enumerate(lstItems):
+        await conn.execute(
+            STR_SINGLE_INSERT,
+            intParentId,
+            mdlItem.intInventoryId,
+            mdlItem.strItemCode,
+            mdlItem.strItemName,
+            mdlItem.strUnit,
+            mdlItem.dblQuantity,
+            mdlItem.dblUnitPrice,
+            mdlItem.dblQuantity * mdlItem.dblUnitPrice,
+            mdlItem.intSortOrder or intIndex
+        )
+
+
+async def fnTime(conn, fnWriter, lstItems) -> float:
+    """Median ms for writing one document inside a transaction"""
+    lstTimes = []
+    for intRound in range(INT_ROUNDS):
+        fltStart = time.perf_counter()
+        async with conn.transaction():
+            await fnWriter(conn, intRound + 1, lstItems)
+        lstTimes.append((time.perf_counter() - fltStart) * 1000)
+        await conn.execute("TRUNCATE tbl_quotation_item")
+    return statistics.median(lstTimes)
+
+
+async def main():
+    conn = await asyncpg.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "5432")),
+        database=os.getenv("DB_NAME", "postgres"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", ""),
+        ssl="require" if os.getenv("DB_HOST", "localhost") != "localhost" else None,
+    )
+    try:
+        # TEMP table shadows the real one for this session (no FK, nothing kept)
+        await conn.execute("""
+            CREATE TEMP TABLE tbl_quotation_item (
+                pk_bint_quotation_item_id BIGSERIAL PRIMARY KEY,
+                fk_bint_quotation_id BIGINT NOT NULL,
+                fk_bint_inventory_id BIGINT NULL,
+                vchr_item_code VARCHAR(50),
+                vchr_item_name VARCHAR(200) NOT NULL,
+                vchr_unit VARCHAR(20),
+                dbl_quantity DECIMAL(10,2) NOT NULL,
+                dbl_unit_price DECIMAL(12,2) NOT NULL,
+                dbl_total_price DECIMAL(12,2) NOT NULL,
+                int_sort_order INTEGER DEFAULT 0
+            )
+        """)
+
+        async def fnBulk(conn, intParentId, lstItems):
+            await fnInsertLineItems(conn, "tbl_quotation_item", intParentId, lstItems)
+
+        print(f"{'items':>6} | {'per-item ms':>12} | {'bulk ms':>9} | {'speedup':>7}")
+        print("-" * 44)
+        for intCount in LST_ITEM_COUNTS:
+            lstItems = fnMakeItems(intCount)
+            fltOld = await fnTime(conn, fnInsertPerItem, lstItems)
+            fltNew = await fnTime(conn, fnBulk, lstItems)
+            print(f"{intCount:>6} | {fltOld:>12.2f} | {fltNew:>9.2f} | {fltOld / fltNew:>6.1f}x")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""
+Benchmark - request latency with file logging off / synchronous / queued
+
+Sends INT_REQUESTS requests at INT_CONCURRENCY through the ASGI app
+in-process to a route that logs like the services do (INT_LINES_PER_REQUEST
+user-logger lines per request). Each mode runs in its own interpreter:
+
+    off     logging disabled (lower bound)
+    sync    LOG_QUEUE_SIZE=0: RotatingFileHandler writes on the event loop (old behaviour)
+    queued  QueueHandler -> bounded queue -> writer thread (default)
+
+Every mode runs twice: on the local disk as is, and with FLT_SLOW_DISK_MS
+added to each file write. The delay simulates a busy or network disk, which
+is when synchronous logging stalls every request on the worker.
+
+Usage (from backend/):
+    python misc/benchmark/benchLogging.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import subprocess
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+INT_REQUESTS = 2000
+INT_CONCURRENCY = 20
+INT_LINES_PER_REQUEST = 3
+FLT_SLOW_DISK_MS = 2.0
+INT_BENCH_USER_ID = 900001
+
+
+def fnPercentile(lstValues, fltPct: float) -> float:
+    lstSorted = sorted(lstValues)
+    return lstSorted[min(len(lstSorted) - 1, int(round(fltPct / 100 * (len(lstSorted) - 1))))]
+
+
+async def fnRunMode() -> dict:
+    """One mode, in this interpreter (LOG_QUEUE_SIZE / BENCH_* already set)"""
+    from logging.handlers import RotatingFileHandler
+    from app.main import app
+    from app.core.logger import getUserLogger, getLogStats, stopLogging, closeUserLogger, LOG_USER_PATH
+
+    fltDiskDelay = float(os.getenv("BENCH_DISK_MS", "0")) / 1000
+    if fltDiskDelay:
+        fnEmit = RotatingFileHandler.emit
+
+        def fnSlowEmit(self, record):
+            time.sleep(fltDiskDelay)
+            fnEmit(self, record)
+        RotatingFileHandler.emit = fnSlowEmit
+
+    @app.get("/bench/log")
+    async def fnBenchLog():
+        logger = getUserLogger(INT_BENCH_USER_ID)
+        for intLine in range(INT_LINES_PER_REQUEST):
+            logger.info(f"Benchmark request line {intLine}: listing quotations page=1 size=20")
+        return {"ok": True}
+
+    if os.getenv("BENCH_MODE") == "off":
+        logging.disable(logging.CRITICAL)
+
+    lstMs = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as insClient:
+        await insClient.get("/bench/log")  # warm up (creates the user logger)
+        semSlots = asyncio.Semaphore(INT_CONCURRENCY)
+
+        async def fnOne() -> None:
+            async with semSlots:
+                fltStart = time.perf_counter()
+                await insClient.get("/bench/log")
+                lstMs.append((time.perf_counter() - fltStart) * 1000)
+
+        fltStart = time.perf_counter()
+        await asyncio.gather(*(fnOne() for _ in range(INT_REQUESTS)))
+        fltTotal = time.perf_counter() - fltStart
+
+    dctLogStats = getLogStats()
+    fltFlushStart = time.perf_counter()
+    stopLogging()
+    fltFlush = time.perf_counter() - fltFlushStart
+    closeUserLogger(INT_BENCH_USER_ID)
+    for strFile in (LOG_USER_PATH / str(INT_BENCH_USER_ID)).glob("*"):
+        strFile.unlink()
+    (LOG_USER_PATH / str(INT_BENCH_USER_ID)).rmdir()
+
+    return {
+        "rps": round(INT_REQUESTS / fltTotal),
+        "p50": round(fnPercentile(lstMs, 50), 2),
+        "p99": round(fnPercentile(lstMs, 99), 2),
+        "max": round(max(lstMs), 2),
+        "dropped": dctLogStats["dropped"],
+        "flush_s": round(fltFlush, 2)
+    }
+
+
+def fnRunChild(strMode: str, fltDiskMs: float) -> dict:
+    dctEnv = {
+        **os.environ,
+        "BENCH_MODE": strMode,
+        "BENCH_DISK_MS": str(fltDiskMs),
+        "LOG_QUEUE_SIZE": "0" if strMode == "sync" else "10000",
+        "BENCH_CHILD": "1"
+    }
+    strOut = subprocess.run(
+        [sys.executable, __file__], env=dctEnv, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(strOut.strip().splitlines()[-1])
+
+
+def main() -> None:
+    if os.getenv("BENCH_CHILD"):
+        print(json.dumps(asyncio.run(fnRunMode())))
+        return
+
+    print(f"{INT_REQUESTS} requests, concurrency {INT_CONCURRENCY}, {INT_LINES_PER_REQUEST} log lines per request")
+    for fltDiskMs in (0.0, FLT_SLOW_DISK_MS):
+        print(f"-- disk write delay {fltDiskMs} ms")
+        for strMode in ("off", "sync", "queued"):
+            dctResult = fnRunChild(strMode, fltDiskMs)
+            print(
+                f"{strMode:7s} {dctResult['rps']:6d} req/s | p50 {dctResult['p50']:8.2f} ms "
+                f"p99 {dctResult['p99']:8.2f} ms max {dctResult['max']:8.2f} ms "
+                f"| dropped {dctResult['dropped']:5d} | flush at shutdown {dctResult['flush_s']:5.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark - login burst: bcrypt inline on the event loop vs the hasher pool
+
+Fires INT_LOGINS /auth/login requests at once (a morning login rush) while a
+probe hits GET / every FLT_PROBE_INTERVAL seconds, all through the ASGI app
+in-process. Runs once with PASSWORD_HASH_WORKERS=0 (old behaviour) and once
+with the thread pool, each in its own interpreter, and prints login and
+probe latency. The probe latency is what every non-login request on the
+worker sees during the burst.
+
+The user row is served from an in-memory pool (no database needed), so the
+only real work in a login is the bcrypt verify (cost 12, same as passlib's
+default) and the JWT.
+
+Usage (from backend/):
+    python misc/benchmark/benchLoginBurst.py
+    BENCH_WORKERS=4 python misc/benchmark/benchLoginBurst.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import subprocess
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+INT_LOGINS = 200
+FLT_PROBE_INTERVAL = 0.05
+STR_EMAIL = "bench@example.com"
+STR_PASSWORD = "benchmark-password"
+
+
+class ClsMemoryConnection:
+    def __init__(self, dctUser: dict):
+        self.dctUser = dctUser
+
+    async def fetchrow(self, strQuery: str, *args):
+        return self.dctUser if args and args[0] == self.dctUser["vchr_email"] else None
+
+    async def execute(self, strQuery: str, *args):
+        return "INSERT 0 1"   # refresh token session
+
+
+class ClsMemoryPool:
+    """Just enough of asyncpg.Pool for ClsLoginService"""
+
+    def __init__(self, dctUser: dict):
+        self.conn = ClsMemoryConnection(dctUser)
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *args):
+        return False
+
+
+def fnPercentile(lstValues, fltPct: float) -> float:
+    lstSorted = sorted(lstValues)
+    return lstSorted[min(len(lstSorted) - 1, int(round(fltPct / 100 * (len(lstSorted) - 1))))]
+
+
+async def fnRunMode() -> dict:
+    """One mode, in this interpreter (PASSWORD_HASH_WORKERS already set)"""
+    from app.main import app
+    from app.core.database import ClsDatabasepool
+    from app.core.security import fnHashPassword
+    from app.core.passwordHasher import ClsPasswordHasher
+
+    ClsDatabasepool._pool = ClsMemoryPool({
+        "pk_bint_user_id": 1,
+        "vchr_email": STR_EMAIL,
+        "vchr_password_hash": fnHashPassword(STR_PASSWORD),
+        "vchr_username": "Benchmark",
+        "vchr_business_name": "Benchmark"
+    })
+    ClsPasswordHasher().fnStart()
+    lstLoginMs, lstProbeMs = [], []
+    dctStatus = {}
+    blnDone = False
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=600) as insClient:
+        async def fnOneLogin() -> None:
+            fltStart = time.perf_counter()
+            insResponse = await insClient.post("/auth/login", json={"email": STR_EMAIL, "password": STR_PASSWORD})
+            lstLoginMs.append((time.perf_counter() - fltStart) * 1000)
+            dctStatus[insResponse.status_code] = dctStatus.get(insResponse.status_code, 0) + 1
+
+        async def fnProbe() -> None:
+            # Latency is measured from when the probe was due, so time spent
+            # waiting for a blocked event loop is counted
+            fltDue = time.perf_counter()
+            while not blnDone:
+                await asyncio.sleep(max(0.0, fltDue - time.perf_counter()))
+                await insClient.get("/")
+                lstProbeMs.append((time.perf_counter() - fltDue) * 1000)
+                fltDue = max(fltDue + FLT_PROBE_INTERVAL, time.perf_counter())
+
+        await fnOneLogin()  # warm up
+        lstLoginMs.clear()
+        dctStatus.clear()
+
+        taskProbe = asyncio.create_task(fnProbe())
+        await asyncio.sleep(0.5)  # baseline probes before the burst
+        fltStart = time.perf_counter()
+        await asyncio.gather(*(fnOneLogin() for _ in range(INT_LOGINS)))
+        fltTotal = time.perf_counter() - fltStart
+        blnDone = True
+        await taskProbe
+
+    ClsPasswordHasher().fnStop()
+    return {
+        "total_s": round(fltTotal, 2),
+        "status": dctStatus,
+        "login_p50": round(fnPercentile(lstLoginMs, 50), 1),
+        "login_p99": round(fnPercentile(lstLoginMs, 99), 1),
+        "probe_p50": round(fnPercentile(lstProbeMs, 50), 1),
+        "probe_p99": round(fnPercentile(lstProbeMs, 99), 1),
+        "probe_max": round(max(lstProbeMs), 1)
+    }
+
+
+def fnRunChild(intWorkers: int) -> dict:
+    dctEnv = {
+        **os.environ,
+        "PASSWORD_HASH_WORKERS": str(intWorkers),
+        "PASSWORD_HASH_MAX_QUEUE": str(INT_LOGINS),
+        "LOGIN_IP_LIMIT": str(INT_LOGINS * 2),   # all requests come from one client
+        "BENCH_CHILD": "1"
+    }
+    strOut = subprocess.run(
+        [sys.executable, __file__], env=dctEnv, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(strOut.strip().splitlines()[-1])
+
+
+def main() -> None:
+    if os.getenv("BENCH_CHILD"):
+        print(json.dumps(asyncio.run(fnRunMode())))
+        return
+
+    intWorkers = int(os.getenv("BENCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    print(f"{INT_LOGINS} concurrent logins, GET / probe every {FLT_PROBE_INTERVAL}s")
+    for strLabel, intModeWorkers in (("inline (event loop)", 0), (f"thread pool ({intWorkers})", intWorkers)):
+        dctResult = fnRunChild(intModeWorkers)
+        print(
+            f"{strLabel:20s} total {dctResult['total_s']:6.2f}s | status {dctResult['status']} "
+            f"| login p50 {dctResult['login_p50']:8.1f} ms p99 {dctResult['login_p99']:8.1f} ms "
+            f"| probe p50 {dctResult['probe_p50']:7.1f} ms p99 {dctResult['probe_p99']:7.1f} ms "
+            f"max {dctResult['probe_max']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
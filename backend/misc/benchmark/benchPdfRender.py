@@ -0,0 +1,123 @@
+"""
+Benchmark - PDF rendering inline on the event loop vs in the render process pool
+
+Sends INT_PDF_REQUESTS large /pdf/quotation requests (INT_ITEMS line items,
+no DB needed) at INT_PDF_CONCURRENCY while a probe hits GET /health every
+FLT_PROBE_INTERVAL seconds, all through the ASGI app in-process. Runs once
+with PDF_RENDER_WORKERS=0 (old behaviour) and once with the pool, each in its
+own interpreter, and prints PDF and probe latency. The probe latency is
+what every other request on the worker sees while PDFs render.
+
+Usage (from backend/):
+    python misc/benchmark/benchPdfRender.py
+    BENCH_WORKERS=4 python misc/benchmark/benchPdfRender.py
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import subprocess
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+INT_PDF_REQUESTS = 16
+INT_PDF_CONCURRENCY = 4
+INT_ITEMS = 400
+FLT_PROBE_INTERVAL = 0.05
+DCT_HEADERS = {"x-user-id": "1"}
+DCT_PAYLOAD = {
+    "strCustomerName": "Benchmark Customer",
+    "strQuotationNumber": "QT-BENCH",
+    "lstItems": [
+        {"strItemName": f"4MP IP Dome Camera with audio - unit {intIdx}", "dblQuantity": 2, "dblUnitPrice": 3450}
+        for intIdx in range(INT_ITEMS)
+    ]
+}
+
+
+def fnPercentile(lstValues, fltPct: float) -> float:
+    lstSorted = sorted(lstValues)
+    return lstSorted[min(len(lstSorted) - 1, int(round(fltPct / 100 * (len(lstSorted) - 1))))]
+
+
+async def fnRunMode() -> dict:
+    """One mode, in this interpreter (PDF_RENDER_WORKERS already set)"""
+    from app.main import app
+    from app.api.pdf.renderPool import ClsPDFRenderPool
+
+    ClsPDFRenderPool().fnStart()
+    lstPdfMs, lstProbeMs = [], []
+    blnDone = False
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300) as insClient:
+        # Warm up (spawns / initialises the workers)
+        await insClient.post("/pdf/quotation", json={**DCT_PAYLOAD, "lstItems": DCT_PAYLOAD["lstItems"][:5]}, headers=DCT_HEADERS)
+
+        semSlots = asyncio.Semaphore(INT_PDF_CONCURRENCY)
+
+        async def fnOnePdf() -> None:
+            async with semSlots:
+                fltStart = time.perf_counter()
+                insResponse = await insClient.post("/pdf/quotation", json=DCT_PAYLOAD, headers=DCT_HEADERS)
+                lstPdfMs.append((time.perf_counter() - fltStart) * 1000)
+                assert insResponse.headers["content-type"] == "application/pdf", insResponse.text
+
+        async def fnProbe() -> None:
+            # Latency is measured from when the probe was due, so time spent
+            # waiting for a blocked event loop is counted
+            fltDue = time.perf_counter()
+            while not blnDone:
+                await asyncio.sleep(max(0.0, fltDue - time.perf_counter()))
+                await insClient.get("/health")
+                lstProbeMs.append((time.perf_counter() - fltDue) * 1000)
+                fltDue = max(fltDue + FLT_PROBE_INTERVAL, time.perf_counter())
+
+        taskProbe = asyncio.create_task(fnProbe())
+        fltStart = time.perf_counter()
+        await asyncio.gather(*(fnOnePdf() for _ in range(INT_PDF_REQUESTS)))
+        fltTotal = time.perf_counter() - fltStart
+        blnDone = True
+        await taskProbe
+
+    ClsPDFRenderPool().fnStop()
+    return {
+        "total_s": round(fltTotal, 2),
+        "pdf_p50": round(fnPercentile(lstPdfMs, 50), 1),
+        "pdf_p99": round(fnPercentile(lstPdfMs, 99), 1),
+        "probe_p50": round(fnPercentile(lstProbeMs, 50), 1),
+        "probe_p99": round(fnPercentile(lstProbeMs, 99), 1),
+        "probe_max": round(max(lstProbeMs), 1)
+    }
+
+
+def fnRunChild(intWorkers: int) -> dict:
+    dctEnv = {**os.environ, "PDF_RENDER_WORKERS": str(intWorkers), "PDF_RENDER_MAX_QUEUE": "64", "BENCH_CHILD": "1"}
+    strOut = subprocess.run(
+        [sys.executable, __file__], env=dctEnv, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(strOut.strip().splitlines()[-1])
+
+
+def main() -> None:
+    if os.getenv("BENCH_CHILD"):
+        print(json.dumps(asyncio.run(fnRunMode())))
+        return
+
+    intWorkers = int(os.getenv("BENCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    print(f"{INT_PDF_REQUESTS} PDFs x {INT_ITEMS} items, concurrency {INT_PDF_CONCURRENCY}, /health probe every {FLT_PROBE_INTERVAL}s")
+    for strLabel, intModeWorkers in (("inline (event loop)", 0), (f"process pool ({intWorkers})", intWorkers)):
+        dctResult = fnRunChild(intModeWorkers)
+        print(
+            f"{strLabel:24s} total {dctResult['total_s']:6.2f}s | pdf p50 {dctResult['pdf_p50']:8.1f} ms "
+            f"p99 {dctResult['pdf_p99']:8.1f} ms | probe p50 {dctResult['probe_p50']:7.1f} ms "
+            f"p99 {dctResult['probe_p99']:7.1f} ms max {dctResult['probe_max']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Microbenchmark - per-PDF CPU time with and without the template registry
+
+"cold" resets ClsPDFTemplates before every document, which is what every
+request paid before (font probing / TTF registration, getSampleStyleSheet,
+all ParagraphStyle / TableStyle objects, info page parsing). "warm" reuses
+the registry, so only the data-dependent flowables are built.
+
+CPU time (time.process_time) per PDF, best of INT_ROUNDS rounds.
+
+Usage (from backend/):
+    python misc/benchmark/benchPdfTemplates.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.api.pdf.service import ClsPDFGenerator, ClsPDFTemplates
+
+INT_DOCS = 100
+INT_ROUNDS = 5
+LST_ITEM_COUNTS = [5, 20, 100]
+
+
+def fnItems(intCount: int) -> list:
+    return [
+        {"strItemName": f"4MP IP Dome Camera with audio - unit {intIdx}", "dblQuantity": 2, "dblUnitPrice": 3450}
+        for intIdx in range(intCount)
+    ]
+
+
+def fnRenderOne(lstItems: list, blnCold: bool) -> None:
+    if blnCold:
+        ClsPDFTemplates._instance = None
+    ClsPDFGenerator().generate_quotation_pdf(
+        items=lstItems,
+        customer_name="Benchmark Customer",
+        quotation_number="QT-BENCH",
+        quotation_date="01/01/2026",
+        include_info_page=True
+    )
+
+
+def fnCpuMsPerPdf(lstItems: list, blnCold: bool) -> float:
+    fltBest = float("inf")
+    for _ in range(INT_ROUNDS):
+        fltStart = time.process_time()
+        for _ in range(INT_DOCS):
+            fnRenderOne(lstItems, blnCold)
+        fltBest = min(fltBest, (time.process_time() - fltStart) / INT_DOCS * 1000)
+    return fltBest
+
+
+def main() -> None:
+    fnRenderOne(fnItems(5), blnCold=False)  # import / first-use warm up
+    print(f"font: {ClsPDFTemplates().malayalam_font} | {INT_DOCS} docs x best of {INT_ROUNDS}")
+    for intCount in LST_ITEM_COUNTS:
+        lstItems = fnItems(intCount)
+        fltCold = fnCpuMsPerPdf(lstItems, blnCold=True)
+        fltWarm = fnCpuMsPerPdf(lstItems, blnCold=False)
+        print(
+            f"{intCount:4d} items | cold {fltCold:7.2f} ms/pdf | warm {fltWarm:7.2f} ms/pdf "
+            f"| saved {fltCold - fltWarm:6.2f} ms ({(1 - fltWarm / fltCold) * 100:4.1f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
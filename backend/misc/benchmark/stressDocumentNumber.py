@@ -0,0 +1,104 @@
+"""
+Stress test - Concurrent quotation / invoice creates must never share a number
+
+Creates a throwaway tenant, fires 500 simultaneous quotation creates and
+500 simultaneous invoice creates through the real services, then asserts
+the numbers are unique and gap-free (0001..0500). The tenant is deleted
+at the end (CASCADE removes its documents and counters).
+
+Usage (from backend/):
+    python misc/benchmark/stressDocumentNumber.py
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+load_dotenv(Path(__file__).resolve().parents[2] / "app" / ".env")
+
+from app.core.database import ClsDatabasepool
+from app.core.baseSchema import ResponseStatus
+from app.api.quotation.service import ClsQuotationService
+from app.api.quotation.schema import MdlCreateQuotationRequest, MdlQuotationItemRequest
+from app.api.invoice.service import ClsInvoiceService
+from app.api.invoice.schema import MdlCreateInvoiceRequest, MdlInvoiceItemRequest
+
+INT_CONCURRENT_CREATES = 500
+
+
+async def fnCreateTenant(pool) -> int:
+    strEmail = f"stress-{uuid.uuid4().hex[:12]}@quotely.test"
+    async with pool.acquire() as conn:
+        return await conn.fetchval(
+            """
+            INSERT INTO tbl_user (vchr_email, vchr_username, vchr_password_hash)
+            VALUES ($1, 'stress', 'x')
+            RETURNING pk_bint_user_id
+            """,
+            strEmail
+        )
+
+
+def fnCheckNumbers(strLabel: str, lstNumbers, strPrefix: str) -> None:
+    intYear = datetime.date.today().year
+    setExpected = {f"{strPrefix}-{intYear}-{intNum:04d}" for intNum in range(1, INT_CONCURRENT_CREATES + 1)}
+
+    assert len(lstNumbers) == INT_CONCURRENT_CREATES, f"{strLabel}: only {len(lstNumbers)} creates succeeded"
+    assert len(set(lstNumbers)) == len(lstNumbers), f"{strLabel}: duplicate numbers issued"
+    assert set(lstNumbers) == setExpected, f"{strLabel}: numbers are not gap-free"
+    print(f"{strLabel}: {len(lstNumbers)} unique, gap-free numbers")
+
+
+async def main():
+    insDb = ClsDatabasepool()
+    pool = await insDb.fnGetPool()
+    intUserId = await fnCreateTenant(pool)
+
+    try:
+        insQuotationService = ClsQuotationService(pool, intUserId)
+        mdlQuotation = MdlCreateQuotationRequest(
+            strCustomerName="Stress Customer",
+            lstItems=[MdlQuotationItemRequest(strItemName="Camera", dblQuantity=1, dblUnitPrice=2500)]
+        )
+
+        fltStart = time.perf_counter()
+        lstResults = await asyncio.gather(*[
+            insQuotationService.fnAddQuotationService(mdlQuotation) for _ in range(INT_CONCURRENT_CREATES)
+        ])
+        print(f"Quotations: {INT_CONCURRENT_CREATES} creates in {time.perf_counter() - fltStart:.2f}s")
+        fnCheckNumbers(
+            "Quotations",
+            [res.data.strQuotationNumber for res in lstResults if res.intStatus == ResponseStatus.SUCCESS],
+            "QT"
+        )
+
+        insInvoiceService = ClsInvoiceService(pool, intUserId)
+        mdlInvoice = MdlCreateInvoiceRequest(
+            strCustomerName="Stress Customer",
+            lstItems=[MdlInvoiceItemRequest(strItemName="Camera", dblQuantity=1, dblUnitPrice=2500)]
+        )
+
+        fltStart = time.perf_counter()
+        lstResults = await asyncio.gather(*[
+            insInvoiceService.fnAddInvoiceService(mdlInvoice) for _ in range(INT_CONCURRENT_CREATES)
+        ])
+        print(f"Invoices: {INT_CONCURRENT_CREATES} creates in {time.perf_counter() - fltStart:.2f}s")
+        fnCheckNumbers(
+            "Invoices",
+            [res.data.strInvoiceNumber for res in lstResults if res.intStatus == ResponseStatus.SUCCESS],
+            "INV"
+        )
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM tbl_user WHERE pk_bint_user_id = $1", intUserId)
+        await insDb.fnDisconnectPool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Stub Groq server - Stands in for api.groq.com in local tests and benchmarks
+
+Serves POST /openai/v1/chat/completions with a canned OpenAI-style
+completion (a small CCTV quotation) after an optional artificial delay.
+With "stream": true the same content is sent as SSE chunks
+(STUB_CHUNK_CHARS characters every STUB_CHUNK_DELAY_MS).
+
+Usage (from backend/):
+    python misc/benchmark/stubGroq.py                       # http://127.0.0.1:8089
+    STUB_DELAY_MS=300 python misc/benchmark/stubGroq.py
+
+Point the app at it with:
+    GROQ_BASE_URL=http://127.0.0.1:8089/openai/v1
+    GROQ_API_KEY=stub
+"""
+
+import os
+import json
+import asyncio
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+INT_PORT = int(os.getenv("STUB_PORT", "8089"))
+FLT_DELAY_SECONDS = int(os.getenv("STUB_DELAY_MS", "0")) / 1000
+INT_CHUNK_CHARS = int(os.getenv("STUB_CHUNK_CHARS", "12"))
+FLT_CHUNK_DELAY_SECONDS = int(os.getenv("STUB_CHUNK_DELAY_MS", "5")) / 1000
+DCT_USAGE = {"prompt_tokens": 1200, "completion_tokens": 180, "total_tokens": 1380}
+
+DCT_CANNED_QUOTATION = {
+    "customer_name": "Stub Customer",
+    "customer_phone": "9876543210",
+    "notes": "Generated by stub server",
+    "items": [
+        {"item_name": "IP Camera 2MP", "item_code": "CAM-2MP", "inventory_id": None, "quantity": 4, "unit_price": 2500, "unit": "piece"},
+        {"item_name": "NVR 8 Channel", "item_code": "NVR-8", "inventory_id": None, "quantity": 1, "unit_price": 6500, "unit": "piece"},
+        {"item_name": "CAT 6 Cable", "item_code": "CAT6", "inventory_id": None, "quantity": 150, "unit_price": 22, "unit": "meter"}
+    ]
+}
+
+app = FastAPI(title="Stub Groq")
+
+
+@app.post("/openai/v1/chat/completions")
+async def fnChatCompletions(dctPayload: dict):
+    if FLT_DELAY_SECONDS:
+        await asyncio.sleep(FLT_DELAY_SECONDS)
+
+    if dctPayload.get("stream"):
+        return StreamingResponse(fnStreamChunks(dctPayload), media_type="text/event-stream")
+
+    return {
+        "id": "stub-completion",
+        "object": "chat.completion",
+        "model": dctPayload.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": json.dumps(DCT_CANNED_QUOTATION)},
+            "finish_reason": "stop"
+        }],
+        "usage": DCT_USAGE
+    }
+
+
+async def fnStreamChunks(dctPayload: dict):
+    strContent = json.dumps(DCT_CANNED_QUOTATION)
+    for intStart in range(0, len(strContent), INT_CHUNK_CHARS):
+        dctChunk = {
+            "id": "stub-completion",
+            "object": "chat.completion.chunk",
+            "model": dctPayload.get("model", "stub"),
+            "choices": [{"index": 0, "delta": {"content": strContent[intStart:intStart + INT_CHUNK_CHARS]}}]
+        }
+        yield f"data: {json.dumps(dctChunk)}\n\n"
+        await asyncio.sleep(FLT_CHUNK_DELAY_SECONDS)
+
+    dctLast = {"id": "stub-completion", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": DCT_USAGE}}
+    yield f"data: {json.dumps(dctLast)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=INT_PORT, log_level="warning")
@@ -0,0 +1,61 @@
+import asyncio
+
+from app.api.ai import responseCache
+from app.api.ai.responseCache import (
+    fnFingerprint,
+    fnLookupResponse,
+    insResponseCache,
+    ClsCacheHitRecorder,
+    STR_FINGERPRINT_VERSION
+)
+
+
+def test_fingerprint_ignores_case_punctuation_fillers_and_plurals():
+    assert fnFingerprint("4 cameras with DVR for a shop") == fnFingerprint("4 Camera, DVR - shop")
+
+
+def test_fingerprint_keeps_quantity_with_its_item():
+    assert fnFingerprint("4 cameras with 8 channel NVR") != fnFingerprint("8 cameras with 4 channel NVR")
+
+
+def test_fingerprint_keeps_repeated_tokens():
+    assert fnFingerprint("2 dome cameras and 2 bullet cameras") != fnFingerprint("2 dome and bullet cameras")
+
+
+def test_fingerprint_is_versioned():
+    assert fnFingerprint("4 cameras").startswith(f"{STR_FINGERPRINT_VERSION}:")
+    assert len(fnFingerprint("4 cameras")) <= 64   # vchr_fingerprint VARCHAR(64)
+
+
+class ClsNoPool:
+    def acquire(self):
+        raise AssertionError("LRU hit must not touch the database")
+
+
+def test_lru_hit_records_in_memory_without_db():
+    tupKey = (1, fnFingerprint("4 cameras"), "ctx", "model")
+    insResponseCache.fnSet(tupKey, {
+        "intAiResponseId": 7, "dctJsonResponse": {}, "intTokensInput": 100, "intTokensOutput": 20
+    })
+    insRecorder = ClsCacheHitRecorder()
+    insRecorder.dctPending.clear()
+
+    for _ in range(2):
+        dctCached = asyncio.run(fnLookupResponse(ClsNoPool(), *tupKey))
+        assert dctCached["intAiResponseId"] == 7
+    assert insRecorder.dctPending[tupKey] == [2, 240]
+
+
+def test_failed_flush_keeps_counts(monkeypatch):
+    class ClsBrokenDb:
+        async def fnGetPool(self):
+            raise OSError("db down")
+
+    monkeypatch.setattr(responseCache, "ClsDatabasepool", ClsBrokenDb)
+    insRecorder = ClsCacheHitRecorder()
+    insRecorder.dctPending.clear()
+    insRecorder.fnRecord((1, "fp", "ctx", "model"), 50)
+
+    asyncio.run(insRecorder.fnFlush())
+    assert insRecorder.dctPending == {(1, "fp", "ctx", "model"): [1, 50]}
+    insRecorder.dctPending.clear()
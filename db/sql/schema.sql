@@ -5,6 +5,13 @@
 -- =====================================================
 
 -- Drop existing tables if they exist (in reverse order of dependencies)
+DROP TABLE IF EXISTS tbl_user_session CASCADE;
+DROP TABLE IF EXISTS tbl_ai_batch_item CASCADE;
+DROP TABLE IF EXISTS tbl_ai_batch_job CASCADE;
+DROP TABLE IF EXISTS tbl_ai_response_cache CASCADE;
+DROP TABLE IF EXISTS tbl_dashboard_daily CASCADE;
+DROP TABLE IF EXISTS tbl_dashboard_summary CASCADE;
+DROP TABLE IF EXISTS tbl_document_counter CASCADE;
 DROP TABLE IF EXISTS tbl_invoice_item CASCADE;
 DROP TABLE IF EXISTS tbl_invoice CASCADE;
 DROP TABLE IF EXISTS tbl_quotation_item CASCADE;
@@ -107,6 +114,9 @@ CREATE TABLE tbl_ai_response (
     int_tokens_input INTEGER DEFAULT 0,
     int_tokens_output INTEGER DEFAULT 0,
     dbl_cost_inr DECIMAL(10,6) DEFAULT 0.00,
+    int_inventory_items_total INTEGER DEFAULT 0,   -- Tenant catalog size at request time
+    int_inventory_items_sent INTEGER DEFAULT 0,    -- Items sent to the LLM after retrieval
+    int_tokens_saved INTEGER DEFAULT 0,            -- Estimated prompt tokens saved by retrieval
     tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
     FOREIGN KEY (fk_bint_raw_input_id) REFERENCES tbl_raw_input(pk_bint_raw_input_id) ON DELETE CASCADE,
@@ -124,7 +134,7 @@ CREATE TABLE tbl_quotation (
     pk_bint_quotation_id BIGSERIAL PRIMARY KEY,
     fk_bint_user_id BIGINT NOT NULL,
     fk_bint_ai_response_id BIGINT NULL,
-    vchr_quotation_number VARCHAR(50) UNIQUE NOT NULL,
+    vchr_quotation_number VARCHAR(50) NOT NULL,
     dat_quotation_date DATE NOT NULL,
     vchr_customer_name VARCHAR(200) NOT NULL,
     vchr_customer_phone VARCHAR(20),
@@ -140,6 +150,8 @@ CREATE TABLE tbl_quotation (
     tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     tim_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
+    -- Numbers are per tenant (every tenant has its own QT-2026-0001)
+    UNIQUE (fk_bint_user_id, vchr_quotation_number),
     FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE,
     FOREIGN KEY (fk_bint_ai_response_id) REFERENCES tbl_ai_response(pk_bint_ai_response_id) ON DELETE SET NULL
 );
@@ -147,6 +159,8 @@ CREATE TABLE tbl_quotation (
 CREATE INDEX idx_quotation_number ON tbl_quotation(vchr_quotation_number);
 CREATE INDEX idx_quotation_status ON tbl_quotation(vchr_status);
 CREATE INDEX idx_quotation_created_at ON tbl_quotation(tim_created_at);
+-- Keyset pagination for /quotation/list (tenant's newest first)
+CREATE INDEX idx_quotation_user_created ON tbl_quotation(fk_bint_user_id, tim_created_at DESC, pk_bint_quotation_id DESC);
 
 CREATE TRIGGER trg_quotation_updated_at
 BEFORE UPDATE ON tbl_quotation
@@ -181,7 +195,7 @@ CREATE TABLE tbl_invoice (
     pk_bint_invoice_id BIGSERIAL PRIMARY KEY,
     fk_bint_user_id BIGINT NOT NULL,
     fk_bint_quotation_id BIGINT NULL,
-    vchr_invoice_number VARCHAR(50) UNIQUE NOT NULL,
+    vchr_invoice_number VARCHAR(50) NOT NULL,
     dat_invoice_date DATE NOT NULL,
     vchr_customer_name VARCHAR(200) NOT NULL,
     vchr_customer_phone VARCHAR(20),
@@ -197,6 +211,8 @@ CREATE TABLE tbl_invoice (
     tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     tim_updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
+    -- Numbers are per tenant (every tenant has its own INV-2026-0001)
+    UNIQUE (fk_bint_user_id, vchr_invoice_number),
     FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE,
     FOREIGN KEY (fk_bint_quotation_id) REFERENCES tbl_quotation(pk_bint_quotation_id) ON DELETE SET NULL
 );
@@ -204,6 +220,10 @@ CREATE TABLE tbl_invoice (
 CREATE INDEX idx_invoice_number ON tbl_invoice(vchr_invoice_number);
 CREATE INDEX idx_invoice_payment_status ON tbl_invoice(vchr_payment_status);
 CREATE INDEX idx_invoice_created_at ON tbl_invoice(tim_created_at);
+-- Conversions per quotation (rollup counts, duplicate-invoice check, ON DELETE SET NULL)
+CREATE INDEX idx_invoice_quotation_id ON tbl_invoice(fk_bint_quotation_id);
+-- Keyset pagination for /invoice/list (tenant's newest first)
+CREATE INDEX idx_invoice_user_created ON tbl_invoice(fk_bint_user_id, tim_created_at DESC, pk_bint_invoice_id DESC);
 
 CREATE TRIGGER trg_invoice_updated_at
 BEFORE UPDATE ON tbl_invoice
@@ -231,6 +251,154 @@ CREATE TABLE tbl_invoice_item (
 
 CREATE INDEX idx_invoice_item_invoice_id ON tbl_invoice_item(fk_bint_invoice_id);
 
+-- =====================================================
+-- Table 9: tbl_document_counter
+-- Per-tenant, per-year document number counter (QT / INV)
+-- Incremented with UPDATE ... RETURNING inside the create transaction
+-- =====================================================
+CREATE TABLE tbl_document_counter (
+    fk_bint_user_id BIGINT NOT NULL,
+    vchr_prefix VARCHAR(10) NOT NULL,
+    int_year INTEGER NOT NULL,
+    int_last_number INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (fk_bint_user_id, vchr_prefix, int_year),
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE
+);
+
+-- =====================================================
+-- Table 10: tbl_dashboard_summary
+-- Materialized per-tenant dashboard totals (one row per tenant)
+-- Updated incrementally by invoice / quotation writes,
+-- rebuilt from source by POST /dashboard/reconcile.
+-- The row doubles as the per-tenant rollup lock (writers and rebuilds
+-- lock it before touching the rollup).
+-- =====================================================
+CREATE TABLE tbl_dashboard_summary (
+    fk_bint_user_id BIGINT PRIMARY KEY,
+    dbl_total_collected DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    int_total_invoices INTEGER NOT NULL DEFAULT 0,
+    int_paid_invoices INTEGER NOT NULL DEFAULT 0,
+    int_pending_invoices INTEGER NOT NULL DEFAULT 0,
+    int_total_quotations INTEGER NOT NULL DEFAULT 0,
+    tim_refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,   -- NULL = placeholder, only inside the transaction building it
+
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE
+);
+
+-- =====================================================
+-- Table 11: tbl_dashboard_daily
+-- Per-tenant per-day buckets: earnings / invoices (by invoice date),
+-- quotations (by quotation date), invoices converted from a quotation
+-- (by the SOURCE quotation's date, so converted / quotations is a rate).
+-- Feeds dashboard "today" numbers and /dashboard/timeseries
+-- =====================================================
+CREATE TABLE tbl_dashboard_daily (
+    fk_bint_user_id BIGINT NOT NULL,
+    dat_day DATE NOT NULL,
+    dbl_earnings DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    int_invoices INTEGER NOT NULL DEFAULT 0,
+    int_quotations INTEGER NOT NULL DEFAULT 0,
+    int_converted_invoices INTEGER NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (fk_bint_user_id, dat_day),
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE
+);
+
+-- =====================================================
+-- Table 12: tbl_ai_response_cache
+-- AI quotation response cache. Key = tenant + token fingerprint of the
+-- normalized request + context version (hash of inventory block and
+-- system prompt) + model. Hit counters measure Groq calls / tokens saved.
+-- =====================================================
+CREATE TABLE tbl_ai_response_cache (
+    pk_bint_cache_id BIGSERIAL PRIMARY KEY,
+    fk_bint_user_id BIGINT NOT NULL,
+    vchr_fingerprint VARCHAR(64) NOT NULL,
+    vchr_context_version VARCHAR(64) NOT NULL,
+    vchr_model_used VARCHAR(50) NOT NULL,
+    fk_bint_ai_response_id BIGINT NOT NULL,
+    int_hit_count INTEGER NOT NULL DEFAULT 0,
+    int_tokens_saved BIGINT NOT NULL DEFAULT 0,
+    tim_last_hit_at TIMESTAMP DEFAULT NULL,
+    tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE (fk_bint_user_id, vchr_fingerprint, vchr_context_version, vchr_model_used),
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE,
+    FOREIGN KEY (fk_bint_ai_response_id) REFERENCES tbl_ai_response(pk_bint_ai_response_id) ON DELETE CASCADE
+);
+
+-- =====================================================
+-- Table 13: tbl_ai_batch_job
+-- One batch of raw inputs submitted via POST /ai/batch
+-- vchr_status: queued -> running -> completed
+-- =====================================================
+CREATE TABLE tbl_ai_batch_job (
+    pk_bint_batch_job_id BIGSERIAL PRIMARY KEY,
+    fk_bint_user_id BIGINT NOT NULL,
+    vchr_status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    int_total INTEGER NOT NULL DEFAULT 0,
+    int_completed INTEGER NOT NULL DEFAULT 0,
+    int_failed INTEGER NOT NULL DEFAULT 0,
+    tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    tim_finished_at TIMESTAMP DEFAULT NULL,
+
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_ai_batch_job_user_id ON tbl_ai_batch_job(fk_bint_user_id);
+
+-- =====================================================
+-- Table 14: tbl_ai_batch_item
+-- One raw input of a batch (tbl_raw_input stays immutable; status lives here)
+-- vchr_status: queued -> processing -> done / failed
+-- =====================================================
+CREATE TABLE tbl_ai_batch_item (
+    pk_bint_batch_item_id BIGSERIAL PRIMARY KEY,
+    fk_bint_batch_job_id BIGINT NOT NULL,
+    fk_bint_user_id BIGINT NOT NULL,
+    fk_bint_raw_input_id BIGINT NOT NULL,
+    fk_bint_ai_response_id BIGINT DEFAULT NULL,
+    int_position INTEGER NOT NULL,
+    vchr_status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    txt_error TEXT DEFAULT NULL,
+    tim_started_at TIMESTAMP DEFAULT NULL,
+    tim_finished_at TIMESTAMP DEFAULT NULL,
+
+    FOREIGN KEY (fk_bint_batch_job_id) REFERENCES tbl_ai_batch_job(pk_bint_batch_job_id) ON DELETE CASCADE,
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE,
+    FOREIGN KEY (fk_bint_raw_input_id) REFERENCES tbl_raw_input(pk_bint_raw_input_id) ON DELETE CASCADE,
+    FOREIGN KEY (fk_bint_ai_response_id) REFERENCES tbl_ai_response(pk_bint_ai_response_id) ON DELETE SET NULL
+);
+
+CREATE INDEX idx_ai_batch_item_job ON tbl_ai_batch_item(fk_bint_batch_job_id, int_position);
+CREATE INDEX idx_ai_batch_item_pending ON tbl_ai_batch_item(vchr_status) WHERE vchr_status IN ('queued', 'processing');
+
+-- =====================================================
+-- Table 15: tbl_user_session
+-- Refresh tokens (opaque, only the SHA-256 is stored)
+-- Rotated on every /auth/refresh: the old row is revoked and a new row in the
+-- same vchr_family_id is inserted; vchr_replaced_by_hash points at it. A
+-- revoked token presented again means it was stolen -> the whole family is
+-- revoked, except within the grace period right after rotation while its
+-- successor is still active (two tabs / a lost response).
+-- =====================================================
+CREATE TABLE tbl_user_session (
+    pk_bint_session_id BIGSERIAL PRIMARY KEY,
+    fk_bint_user_id BIGINT NOT NULL,
+    vchr_token_hash CHAR(64) UNIQUE NOT NULL,
+    vchr_family_id VARCHAR(32) NOT NULL,
+    tim_expires_at TIMESTAMP NOT NULL,
+    tim_revoked_at TIMESTAMP DEFAULT NULL,
+    vchr_replaced_by_hash CHAR(64) DEFAULT NULL,   -- set on rotation only (NULL after logout)
+    tim_created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (fk_bint_user_id) REFERENCES tbl_user(pk_bint_user_id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_user_session_user_id ON tbl_user_session(fk_bint_user_id);
+CREATE INDEX idx_user_session_family ON tbl_user_session(vchr_family_id);
+
 -- =====================================================
 -- End of Schema
 -- =====================================================
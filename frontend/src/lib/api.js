@@ -27,22 +27,70 @@ api.interceptors.request.use(
     }
 );
 
+// Clear local auth state and go to the login page
+const fnRedirectToLogin = () => {
+    localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
+    localStorage.removeItem('userInfo');
+    localStorage.removeItem('user'); // Clean up legacy key
+    window.location.href = '/login';
+};
+
+// One refresh at a time: parallel 401s share it (a refresh token is single-use -
+// presenting it twice counts as reuse and revokes the session). Other tabs share
+// localStorage: if one of them rotated the token meanwhile, use its result.
+let promRefresh = null;
+
+const fnRefreshAccessToken = () => {
+    if (!promRefresh) {
+        const strSentRefreshToken = localStorage.getItem('refresh_token');
+        promRefresh = api.post('/auth/refresh', {
+            "strRefreshToken": strSentRefreshToken
+        }).then((response) => {
+            localStorage.setItem('access_token', response.data.strAccessToken);
+            localStorage.setItem('refresh_token', response.data.strRefreshToken);
+            return response.data.strAccessToken;
+        }).catch((error) => {
+            const strStoredRefreshToken = localStorage.getItem('refresh_token');
+            if (strStoredRefreshToken && strStoredRefreshToken !== strSentRefreshToken) {
+                return localStorage.getItem('access_token');   // another tab refreshed first
+            }
+            throw error;
+        }).finally(() => {
+            promRefresh = null;
+        });
+    }
+    return promRefresh;
+};
+
 // Response Interseptor - Run After every APi Call
 api.interceptors.response.use(
     (response) => {
         // success - just return data
         return response
     },
-    (error) => {
-        // if 401 (UnAuthorized) clear token and redirect to login
-        // BUT skip redirect for login endpoint (let it show error message)
-        const isLoginEndpoint = error.config?.url?.includes('/auth/login');
-
-        if (error.response?.status === 401 && !isLoginEndpoint) {
-            localStorage.removeItem('access_token');
-            localStorage.removeItem('userInfo');
-            localStorage.removeItem('user'); // Clean up legacy key
-            window.location.href = '/login';
+    async (error) => {
+        // if 401 (UnAuthorized): try the refresh token once, else clear token and redirect to login
+        // BUT skip for auth endpoints (let login show its error message)
+        const isAuthEndpoint = error.config?.url?.includes('/auth/');
+
+        if (error.response?.status === 401 && !isAuthEndpoint) {
+            if (localStorage.getItem('refresh_token') && !error.config._blnRetried) {
+                try {
+                    // Another tab may already have stored a newer access token - no refresh needed
+                    const strSentToken = (error.config.headers?.Authorization || '').replace('Bearer ', '');
+                    const strStoredToken = localStorage.getItem('access_token');
+                    const strToken = strStoredToken && strStoredToken !== strSentToken
+                        ? strStoredToken
+                        : await fnRefreshAccessToken();
+                    error.config._blnRetried = true;
+                    error.config.headers.Authorization = `Bearer ${strToken}`;
+                    return api(error.config);
+                } catch {
+                    // refresh token expired / revoked - fall through to login
+                }
+            }
+            fnRedirectToLogin();
         }
         return Promise.reject(error)
     }
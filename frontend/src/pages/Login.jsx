@@ -38,6 +38,7 @@ export default function Login() {
       const response = await authService.login(email, password);
 
       localStorage.setItem('access_token', response.strAccessToken);
+      localStorage.setItem('refresh_token', response.strRefreshToken);
       localStorage.setItem('userInfo', JSON.stringify(response.dctUserInfo));
 
       // Navigate to dashboard
@@ -5,8 +5,8 @@ import authService from "@/services/authServices";
 export default function Profile() {
   const user = authService.getCurrentUser();
 
-  const handleLogout = () => {
-    authService.logout();
+  const handleLogout = async () => {
+    await authService.logout();
     window.location.href = "/";
   };
 
@@ -6,6 +6,8 @@ import { Button } from "@/components/ui/button";
 import quotationService from "@/services/quotationService";
 import invoiceService from "@/services/invoiceService";
 
+const PAGE_SIZE = 50;
+
 export default function Reports() {
   const navigate = useNavigate();
   const [activeTab, setActiveTab] = useState("quotations");
@@ -30,28 +32,41 @@ export default function Reports() {
   const [quotations, setQuotations] = useState([]);
   const [isLoadingQuotations, setIsLoadingQuotations] = useState(true);
   const [quotationError, setQuotationError] = useState(null);
+  const [quotationCursor, setQuotationCursor] = useState(null);
+  const [isLoadingMoreQuotations, setIsLoadingMoreQuotations] = useState(false);
 
   // Invoices state
   const [invoices, setInvoices] = useState([]);
   const [isLoadingInvoices, setIsLoadingInvoices] = useState(true);
   const [invoiceError, setInvoiceError] = useState(null);
+  const [invoiceCursor, setInvoiceCursor] = useState(null);
+  const [isLoadingMoreInvoices, setIsLoadingMoreInvoices] = useState(false);
 
   // Delete confirmation state
   const [deleteId, setDeleteId] = useState(null);
   const [deleteType, setDeleteType] = useState(null); // "quotation" or "invoice"
   const [isDeleting, setIsDeleting] = useState(false);
 
-  // Fetch quotations from API
+  // Date range is filtered on the server; pages are loaded with the keyset cursor
+  const getListFilters = () => ({
+    intPageSize: PAGE_SIZE,
+    datFromDate: fromDate || null,
+    datToDate: toDate || null
+  });
+
+  // Fetch first page of quotations from API
   const fetchQuotations = async () => {
     setIsLoadingQuotations(true);
     setQuotationError(null);
     try {
-      const response = await quotationService.getList();
+      const response = await quotationService.getList(getListFilters());
       if (response.intStatus === 1) {
         setQuotations(response.lstQuotation || []);
+        setQuotationCursor(response.strNextCursor || null);
       } else if (response.intStatus === -1) {
         // No data found
         setQuotations([]);
+        setQuotationCursor(null);
       } else {
         setQuotationError(response.strMessage || "Failed to load quotations");
       }
@@ -63,17 +78,39 @@ export default function Reports() {
     }
   };
 
-  // Fetch invoices from API
+  // Append the next page of quotations
+  const loadMoreQuotations = async () => {
+    if (!quotationCursor) return;
+    setIsLoadingMoreQuotations(true);
+    try {
+      const response = await quotationService.getList({ ...getListFilters(), strCursor: quotationCursor });
+      if (response.intStatus === 1) {
+        setQuotations(prev => [...prev, ...(response.lstQuotation || [])]);
+        setQuotationCursor(response.strNextCursor || null);
+      } else {
+        setQuotationCursor(null);
+      }
+    } catch (error) {
+      console.error("Failed to load more quotations:", error);
+      alert(error.message || "Failed to load more quotations");
+    } finally {
+      setIsLoadingMoreQuotations(false);
+    }
+  };
+
+  // Fetch first page of invoices from API
   const fetchInvoices = async () => {
     setIsLoadingInvoices(true);
     setInvoiceError(null);
     try {
-      const response = await invoiceService.getList();
+      const response = await invoiceService.getList(getListFilters());
       if (response.intStatus === 1) {
         setInvoices(response.lstInvoice || []);
+        setInvoiceCursor(response.strNextCursor || null);
       } else if (response.intStatus === -1) {
         // No data found
         setInvoices([]);
+        setInvoiceCursor(null);
       } else {
         setInvoiceError(response.strMessage || "Failed to load invoices");
       }
@@ -85,10 +122,30 @@ export default function Reports() {
     }
   };
 
+  // Append the next page of invoices
+  const loadMoreInvoices = async () => {
+    if (!invoiceCursor) return;
+    setIsLoadingMoreInvoices(true);
+    try {
+      const response = await invoiceService.getList({ ...getListFilters(), strCursor: invoiceCursor });
+      if (response.intStatus === 1) {
+        setInvoices(prev => [...prev, ...(response.lstInvoice || [])]);
+        setInvoiceCursor(response.strNextCursor || null);
+      } else {
+        setInvoiceCursor(null);
+      }
+    } catch (error) {
+      console.error("Failed to load more invoices:", error);
+      alert(error.message || "Failed to load more invoices");
+    } finally {
+      setIsLoadingMoreInvoices(false);
+    }
+  };
+
   useEffect(() => {
     fetchQuotations();
     fetchInvoices();
-  }, []);
+  }, [fromDate, toDate]);
 
   const formatCurrency = (amount) => {
     return new Intl.NumberFormat("en-IN", {
@@ -434,6 +491,14 @@ export default function Reports() {
               Showing {filteredQuotations.length} quotation{filteredQuotations.length !== 1 ? "s" : ""}
             </p>
           )}
+
+          {!isLoadingQuotations && !quotationError && quotationCursor && (
+            <div className="mt-3 text-center">
+              <Button variant="outline" onClick={loadMoreQuotations} disabled={isLoadingMoreQuotations}>
+                {isLoadingMoreQuotations ? <Loader2 className="w-4 h-4 animate-spin" /> : "Load more"}
+              </Button>
+            </div>
+          )}
         </>
       )}
 
@@ -542,6 +607,14 @@ export default function Reports() {
               Showing {filteredInvoices.length} invoice{filteredInvoices.length !== 1 ? "s" : ""}
             </p>
           )}
+
+          {!isLoadingInvoices && !invoiceError && invoiceCursor && (
+            <div className="mt-3 text-center">
+              <Button variant="outline" onClick={loadMoreInvoices} disabled={isLoadingMoreInvoices}>
+                {isLoadingMoreInvoices ? <Loader2 className="w-4 h-4 animate-spin" /> : "Load more"}
+              </Button>
+            </div>
+          )}
         </>
       )}
     </div>
@@ -13,7 +13,9 @@ const authService = {
             // {
             //   strAccessToken: "...",
             //   strTokentype: "bearer",
-            //   dctUserInfo: {...}
+            //   dctUserInfo: {...},
+            //   strRefreshToken: "...",   (exchange at /auth/refresh when the access token expires)
+            //   intExpiresIn: 3600
             // 
             return response.data
         } catch (error) {
@@ -24,9 +26,18 @@ const authService = {
         }
     },
 
-    // Logout function
-    logout: () => {
+    // Logout function - revoke the refresh token on the server, then clear local state
+    logout: async () => {
+        const strRefreshToken = localStorage.getItem('refresh_token');
+        if (strRefreshToken) {
+            try {
+                await api.post('/auth/logout', { "strRefreshToken": strRefreshToken });
+            } catch {
+                // Already expired / server unreachable - still log out locally
+            }
+        }
         localStorage.removeItem('access_token');
+        localStorage.removeItem('refresh_token');
         localStorage.removeItem('userInfo');
         localStorage.removeItem('user'); // Clean up legacy key
     },
@@ -2,21 +2,26 @@ import api from "@/lib/api";
 
 const invoiceService = {
     /**
-     * Get all invoices (list view - summary only)
+     * Get one page of invoices (list view - summary only)
      *
      * ENDPOINT: POST /invoice/list
      *
+     * PARAMS (all optional): { intPageSize, strCursor, strPaymentStatus, datFromDate, datToDate, strCustomer }
+     * Pass strNextCursor of the previous page as strCursor to get the next page.
+     *
      * RESPONSE:
      * {
      *   intStatus: 1,
      *   lstInvoice: [
      *     { intPkInvoiceId, strInvoiceNumber, datInvoiceDate, strCustomerName, dblTotalAmount, strPaymentStatus, intItemCount, strQuotationNumber }
-     *   ]
+     *   ],
+     *   strNextCursor: "..." | null,
+     *   blnHasMore: true | false
      * }
      */
-    getList: async () => {
+    getList: async (dctParams = {}) => {
         try {
-            const response = await api.post('/invoice/list');
+            const response = await api.post('/invoice/list', dctParams);
             return response.data;
         } catch (error) {
             const strMessage = error.response?.data?.detail || 'Failed to fetch invoices';
@@ -2,21 +2,26 @@ import api from "@/lib/api";
 
 const quotationService = {
     /**
-     * Get all quotations (list view - summary only)
+     * Get one page of quotations (list view - summary only)
      *
      * ENDPOINT: POST /quotation/list
      *
+     * PARAMS (all optional): { intPageSize, strCursor, strStatus, datFromDate, datToDate, strCustomer }
+     * Pass strNextCursor of the previous page as strCursor to get the next page.
+     *
      * RESPONSE:
      * {
      *   intStatus: 1,
      *   lstQuotation: [
      *     { intPkQuotationId, strQuotationNumber, datQuotationDate, strCustomerName, dblTotalAmount, strStatus, intItemCount }
-     *   ]
+     *   ],
+     *   strNextCursor: "..." | null,
+     *   blnHasMore: true | false
      * }
      */
-    getList: async () => {
+    getList: async (dctParams = {}) => {
         try {
-            const response = await api.post('/quotation/list');
+            const response = await api.post('/quotation/list', dctParams);
             return response.data;
         } catch (error) {
             const strMessage = error.response?.data?.detail || 'Failed to fetch quotations';